@@ -0,0 +1,6 @@
+"""
+PostgreSQL backend that keeps connections in a pool of every process.
+
+Set ENGINE of a database to 'restaurant.db_pool' and configure the pool
+with POOL: {'MIN_SIZE', 'MAX_SIZE', 'TIMEOUT', 'MAX_IDLE', 'CHECK_AFTER'}.
+"""
@@ -0,0 +1,126 @@
+import os
+import threading
+
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+from psycopg2 import extensions
+
+from .pool import ConnectionPool
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def check_connection(connection):
+    """Check that the connection still works with a trivial query."""
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        # End the transaction opened when autocommit is off.
+        connection.rollback()
+    except base.Database.Error:
+        return False
+    return True
+
+
+def reset_connection(connection):
+    """Roll back the transaction left open, if the connection is usable."""
+    if connection.closed:
+        return False
+    status = connection.info.transaction_status
+    if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+        return False
+    if status != extensions.TRANSACTION_STATUS_IDLE:
+        connection.rollback()
+    return True
+
+
+def get_pool(alias, conn_params, options, connect):
+    """
+    Get pool of the database in this process, replacing the pool made for
+    other connection parameters, e.g. before test database was created.
+    """
+    key = (os.getpid(), sorted(conn_params.items()))
+    with pools_lock:
+        current = pools.get(alias)
+        if current is not None and current[0] == key:
+            return current[1]
+        if current is not None and current[0][0] == key[0]:
+            current[1].close()
+        pool = ConnectionPool(
+            connect, check=check_connection, reset=reset_connection,
+            min_size=options.get('MIN_SIZE', 0),
+            max_size=options.get('MAX_SIZE', 10),
+            timeout=options.get('TIMEOUT', 30),
+            max_idle=options.get('MAX_IDLE', 600),
+            check_after=options.get('CHECK_AFTER', 0),
+        )
+        pools[alias] = (key, pool)
+    pool.open()
+    return pool
+
+
+def close_pool(alias):
+    with pools_lock:
+        current = pools.pop(alias, None)
+    if current is not None and current[0][0] == os.getpid():
+        current[1].close()
+
+
+def get_pool_stats():
+    """Get stats of pools of this process by database alias."""
+    with pools_lock:
+        current = dict(pools)
+    return {
+        alias: pool.stats()
+        for alias, (key, pool) in sorted(current.items())
+        if key[0] == os.getpid()
+    }
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Idle connections of the pool would prevent dropping the database.
+        close_pool(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL database wrapper that checks out connections from the pool
+    of the process and returns them on close instead of disconnecting.
+
+    Pools are made per process, so a server with several worker processes
+    opens up to MAX_SIZE connections per worker.
+    """
+    creation_class = DatabaseCreation
+
+    def get_pool(self, conn_params):
+        settings_dict, alias = self.settings_dict, self.alias
+
+        def connect():
+            # Pool connects in any thread, so use a wrapper of its own.
+            wrapper = base.DatabaseWrapper(settings_dict, alias)
+            return wrapper.get_new_connection(conn_params)
+
+        return get_pool(alias, conn_params, settings_dict.get('POOL', {}),
+                        connect)
+
+    def get_new_connection(self, conn_params):
+        if self.alias == NO_DB_ALIAS:
+            return super().get_new_connection(conn_params)
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.getconn()
+        self.isolation_level = self.settings_dict['OPTIONS'].get(
+            'isolation_level', connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None or self.alias == NO_DB_ALIAS:
+            return super()._close()
+        with self.wrap_database_errors:
+            self.pool.putconn(self.connection)
@@ -0,0 +1,193 @@
+import threading
+import time
+from collections import deque
+
+from django.db.utils import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    """No connection of the pool became free in time."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of up to max_size connections made by connect.
+
+    Connections are checked out with getconn and returned with putconn.
+    An idle connection is checked with check before checkout when it was
+    idle for check_after seconds or more, and broken ones are replaced.
+    Returned connections are cleaned with reset, idle connections above
+    min_size are closed after max_idle seconds. Checkouts wait for a free
+    connection up to timeout seconds and then raise PoolTimeout.
+    """
+
+    def __init__(self, connect, check=None, reset=None, min_size=0,
+                 max_size=10, timeout=30, max_idle=600, check_after=0):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError('Pool sizes should be 0 <= min_size <= '
+                             'max_size and max_size >= 1.')
+        self.connect = connect
+        self.check = check
+        self.reset = reset
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self.condition = threading.Condition()
+        # Idle connections with the time of return, the latest are last.
+        self.idle = deque()
+        self.size = 0
+        self.in_use = 0
+        self.closed = False
+        self.checkouts = 0
+        self.waits = 0
+        self.wait_time = 0
+        self.max_wait_time = 0
+        self.timeouts = 0
+        self.failed_checks = 0
+        self.max_in_use = 0
+
+    def open(self):
+        """Open connections up to min_size."""
+        while True:
+            with self.condition:
+                if self.closed or self.size >= self.min_size:
+                    return
+                self.size += 1
+            self.add_idle(self.make_connection())
+
+    def make_connection(self):
+        try:
+            return self.connect()
+        except BaseException:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+
+    def add_idle(self, connection):
+        with self.condition:
+            self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+
+    def reserve(self, deadline):
+        """
+        Take an idle connection or a place for a new one, which is returned
+        as None, waiting until the deadline.
+        """
+        waiting = False
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise OperationalError('Connection pool is closed.')
+                if self.idle:
+                    return self.idle.pop()
+                if self.size < self.max_size:
+                    self.size += 1
+                    return None, None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.timeouts += 1
+                    raise PoolTimeout(
+                        'No connection became free in {} seconds, all {} '
+                        'connections are in use.'.format(self.timeout,
+                                                         self.max_size)
+                    )
+                if not waiting:
+                    waiting = True
+                    self.waits += 1
+                self.condition.wait(remaining)
+
+    def getconn(self):
+        """Check out a connection."""
+        started = time.monotonic()
+        while True:
+            connection, returned_at = self.reserve(started + self.timeout)
+            if connection is None:
+                connection = self.make_connection()
+                break
+            if (self.check is None
+                    or started - returned_at < self.check_after
+                    or self.check(connection)):
+                break
+            with self.condition:
+                self.failed_checks += 1
+            self.discard(connection)
+
+        waited = time.monotonic() - started
+        with self.condition:
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.checkouts += 1
+            self.wait_time += waited
+            self.max_wait_time = max(self.max_wait_time, waited)
+        return connection
+
+    def putconn(self, connection, discard=False):
+        """Return a checked out connection, closing it when discarded."""
+        if not discard and self.reset is not None:
+            try:
+                discard = not self.reset(connection)
+            except Exception:
+                discard = True
+        with self.condition:
+            self.in_use -= 1
+            if not discard and not self.closed:
+                self.idle.append((connection, time.monotonic()))
+                self.condition.notify()
+                connection = None
+            expired = self.pop_expired()
+        if connection is not None:
+            self.discard(connection)
+        for connection in expired:
+            self.discard(connection)
+
+    def pop_expired(self):
+        # Called with the lock held, the oldest idle connections are first.
+        expired = []
+        now = time.monotonic()
+        while (self.idle and self.size - len(expired) > self.min_size
+               and now - self.idle[0][1] >= self.max_idle):
+            expired.append(self.idle.popleft()[0])
+        return expired
+
+    def discard(self, connection):
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
+        close_quietly(connection)
+
+    def close(self):
+        """Close idle connections, checked out ones are closed on return."""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, deque()
+            self.condition.notify_all()
+        for connection, _ in idle:
+            self.discard(connection)
+
+    def stats(self):
+        with self.condition:
+            return {
+                'size': self.size,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'in_use': self.in_use,
+                'max_in_use': self.max_in_use,
+                'idle': len(self.idle),
+                'saturation': self.in_use / self.max_size,
+                'checkouts': self.checkouts,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'max_wait_time': self.max_wait_time,
+                'timeouts': self.timeouts,
+                'failed_checks': self.failed_checks,
+            }
+
+
+def close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
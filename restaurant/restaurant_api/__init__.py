@@ -0,0 +1 @@
+default_app_config = 'restaurant.restaurant_api.apps.RestaurantApiConfig'
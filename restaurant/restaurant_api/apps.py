@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 
 class RestaurantApiConfig(AppConfig):
-    name = 'restaurant_api'
+    name = 'restaurant.restaurant_api'
+    label = 'restaurant_api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
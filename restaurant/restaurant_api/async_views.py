@@ -0,0 +1,94 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.urls import re_path
+
+from .middleware import track_queries
+
+# Actions of viewsets served by offloaded views, by route.
+LIST_ACTIONS = {'get': 'list', 'post': 'create'}
+DETAIL_ACTIONS = {'get': 'retrieve'}
+
+
+def close_old_connections():
+    """Close obsolete connections of this thread outside of transactions."""
+    for connection in connections.all():
+        if not connection.in_atomic_block:
+            connection.close_if_unusable_or_obsolete()
+
+
+def as_offloaded_view(viewset, actions, **initkwargs):
+    """
+    Get async view that adapts actions of the sync viewset to ASGI.
+
+    This is not a native async view: Django 3.1 has no async database
+    access, so the whole viewset (authentication, queries, serializers and
+    rendering) runs in a thread of the executor of the event loop, and
+    every request holds a thread while its view runs, as under WSGI. The
+    adapter only lets requests run concurrently in the executor instead
+    of one by one in the single thread sync views get under ASGI. Bodies
+    of requests are read and responses are sent by the event loop outside
+    of the thread. Connections of executor threads are closed like
+    connections of requests when they get obsolete.
+    """
+    view = viewset.as_view(actions, **initkwargs)
+
+    def handle(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            with track_queries() as tracker:
+                response = view(request, *args, **kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+            # Query budget middleware checks queries of this thread.
+            request._query_tracker = tracker
+            return response
+        finally:
+            close_old_connections()
+
+    async def async_view(request, *args, **kwargs):
+        return await sync_to_async(
+            handle, thread_sensitive=settings.ASYNC_VIEWS_THREAD_SENSITIVE
+        )(request, *args, **kwargs)
+
+    # Viewsets check CSRF of session authenticated requests themselves.
+    async_view.csrf_exempt = True
+    async_view.cls = viewset
+    async_view.actions = actions
+    async_view.initkwargs = initkwargs
+    return async_view
+
+
+def get_async_urlpatterns(registry):
+    """
+    Get patterns of offloaded views of list, create and retrieve actions
+    of viewsets registered in router, and of the random restaurant action.
+    """
+    urlpatterns = []
+    for prefix, viewset, basename in registry:
+        lookup = viewset.lookup_url_kwarg or viewset.lookup_field
+        urlpatterns += [
+            re_path(
+                r'^{}/$'.format(prefix),
+                as_offloaded_view(viewset, LIST_ACTIONS,
+                                  basename=basename, detail=False),
+                name='async-{}-list'.format(basename),
+            ),
+            re_path(
+                r'^{}/(?P<{}>[^/.]+)/$'.format(prefix, lookup),
+                as_offloaded_view(viewset, DETAIL_ACTIONS,
+                                  basename=basename, detail=True),
+                name='async-{}-detail'.format(basename),
+            ),
+        ]
+        if hasattr(viewset, 'get_random_restaurant'):
+            # Goes before the detail pattern, which matches it too.
+            urlpatterns.insert(len(urlpatterns) - 1, re_path(
+                r'^{}/get_random_restaurant/$'.format(prefix),
+                as_offloaded_view(
+                    viewset, {'get': 'get_random_restaurant'},
+                    basename=basename, detail=False,
+                ),
+                name='async-{}-get-random-restaurant'.format(basename),
+            ))
+    return urlpatterns
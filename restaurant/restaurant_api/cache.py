@@ -0,0 +1,157 @@
+import threading
+from collections import Counter
+from hashlib import md5
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import get_language
+from rest_framework import status
+from rest_framework.response import Response
+
+from .conditional import etag_matches
+from .replicas import read_database
+
+
+class ResponseCache:
+    """
+    Cache of response data split into namespaces.
+
+    Keys of entries include the current generation of every namespace the
+    entry depends on. Invalidation of a namespace replaces its generation,
+    so stale entries are never read again and just expire. Hits and misses
+    are counted per namespace in the current process.
+    """
+    key_prefix = 'api-response'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @property
+    def cache(self):
+        return caches[settings.API_RESPONSE_CACHE]
+
+    def get_generation_key(self, namespace):
+        # Namespaces contain lookup values, which are not safe in keys.
+        return '{}:generation:{}'.format(
+            self.key_prefix, md5(namespace.encode()).hexdigest()
+        )
+
+    def get_key(self, namespaces, url):
+        keys = [self.get_generation_key(namespace)
+                for namespace in namespaces]
+        generations = self.cache.get_many(keys)
+        for key in keys:
+            if key not in generations:
+                self.cache.add(key, uuid4().hex, timeout=None)
+                generations[key] = self.cache.get(key)
+        return '{}:{}:{}'.format(
+            self.key_prefix,
+            ':'.join(str(generations[key]) for key in keys),
+            md5(url.encode()).hexdigest(),
+        )
+
+    def get(self, key, namespace):
+        data = self.cache.get(key)
+        with self.lock:
+            if data is None:
+                self.misses[namespace] += 1
+            else:
+                self.hits[namespace] += 1
+        return data
+
+    def set(self, key, data, timeout=None):
+        if timeout is None:
+            timeout = settings.API_RESPONSE_CACHE_TIMEOUT
+        self.cache.set(key, data, timeout=timeout)
+
+    def invalidate(self, *namespaces):
+        """
+        Invalidate namespaces now and once again on commit.
+
+        Repeated invalidation on commit drops entries cached by concurrent
+        requests that read data before the transaction was committed.
+        """
+        def replace_generations():
+            self.cache.set_many({
+                self.get_generation_key(namespace): uuid4().hex
+                for namespace in namespaces
+            }, timeout=None)
+
+        replace_generations()
+        transaction.on_commit(replace_generations)
+
+    def stats(self):
+        with self.lock:
+            return {
+                namespace: {
+                    'hits': self.hits[namespace],
+                    'misses': self.misses[namespace],
+                }
+                for namespace in sorted(set(self.hits) | set(self.misses))
+            }
+
+
+response_cache = ResponseCache()
+
+
+class CachedResponseMixin:
+    """
+    Cache data of list and retrieve responses of a viewset.
+
+    List responses depend on the '<basename>-list' namespace, retrieve
+    responses on '<basename>-detail' and '<basename>-detail:<lookup>'
+    namespaces, receivers of model signals invalidate them. Streaming
+    and not successful responses are not cached, responses read from a
+    replica are cached for REPLICA_MAX_LAG only. Entity tags are cached
+    with data, so hits answer conditional requests without queries.
+    """
+    cached_headers = ('ETag',)
+
+    def list(self, request, *args, **kwargs):
+        namespace = '{}-list'.format(self.basename)
+        return self.get_cached_response(
+            [namespace], super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        namespace = '{}-detail'.format(self.basename)
+        lookup = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return self.get_cached_response(
+            [namespace, '{}:{}'.format(namespace, lookup)],
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_cached_response(self, namespaces, view, request, *args,
+                            **kwargs):
+        # Responses hold texts in the active language.
+        key = response_cache.get_key(namespaces, '{} {}'.format(
+            get_language(), request.build_absolute_uri()
+        ))
+        cached = response_cache.get(key, namespaces[0])
+        if cached is not None:
+            data, headers = cached
+            if_none_match = request.headers.get('If-None-Match')
+            if (if_none_match is not None and 'ETag' in headers
+                    and etag_matches(headers['ETag'], if_none_match,
+                                     weak=True)):
+                return Response(status=status.HTTP_304_NOT_MODIFIED,
+                                headers=dict(headers, **{'X-Cache': 'HIT'}))
+            return Response(data, headers=dict(headers, **{'X-Cache': 'HIT'}))
+
+        response = view(request, *args, **kwargs)
+        if isinstance(response, Response) and response.status_code == 200:
+            headers = {
+                name: response[name] for name in self.cached_headers
+                if response.has_header(name)
+            }
+            # Data of a replica may miss the latest writes, which already
+            # invalidated the cache, so keep it only while a lag is allowed.
+            timeout = settings.REPLICA_MAX_LAG \
+                if read_database.get() is not None else None
+            response_cache.set(key, (response.data, headers), timeout)
+            response['X-Cache'] = 'MISS'
+        return response
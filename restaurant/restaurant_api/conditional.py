@@ -0,0 +1,151 @@
+from hashlib import md5
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.http import parse_etags, quote_etag
+from django.utils.translation import get_language
+from rest_framework import status
+from rest_framework.response import Response
+
+# Prefix of annotations that hold versions of rows.
+VERSION_ANNOTATION = '_version_{}'
+
+
+def get_etag(*parts):
+    """Get strong entity tag hashed from the representation of parts."""
+    return quote_etag(md5(repr(parts).encode()).hexdigest())
+
+
+def etag_matches(etag, header, weak=False):
+    """Check whether the entity tag matches value of If-(None-)Match."""
+    etags = parse_etags(header)
+    if '*' in etags:
+        return True
+    if weak:
+        etags = [value[2:] if value.startswith('W/') else value
+                 for value in etags]
+    return etag in etags
+
+
+class ConditionalMixin:
+    """
+    Conditional requests of a viewset by versions of rows.
+
+    Validators are hashed from the version fields of rows without
+    serializing them: of the requested object for detail actions and of
+    the objects of the requested page for lists. Version fields of related
+    rows, e.g. 'address__updated_at', and versions added by get_versions
+    make validators change together with the related rows shown in
+    responses. GET answers 304 on matching If-None-Match, PUT and PATCH
+    answer 412 on not matching If-Match.
+    """
+    version_fields = ('updated_at',)
+    list_version_fields = None
+    list_actions = ('list',)
+
+    def list(self, request, *args, **kwargs):
+        stream_param = getattr(self, 'stream_query_param', None)
+        if stream_param and stream_param in request.query_params:
+            return super().list(request, *args, **kwargs)
+        return self.get_conditional_response(
+            self.get_list_etag(), super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            self.get_object_etag(), super().retrieve, request, *args,
+            **kwargs
+        )
+
+    def update(self, request, *args, **kwargs):
+        if_match = request.headers.get('If-Match')
+        with transaction.atomic():
+            if if_match is not None:
+                etag = self.get_object_etag(lock=True)
+                if etag is not None and not etag_matches(etag, if_match):
+                    return Response(
+                        status=status.HTTP_412_PRECONDITION_FAILED
+                    )
+            response = super().update(request, *args, **kwargs)
+        etag = self.get_object_etag()
+        if response.status_code == status.HTTP_200_OK and etag is not None:
+            response['ETag'] = etag
+        return response
+
+    def get_conditional_response(self, etag, view, request, *args,
+                                 **kwargs):
+        if etag is None:
+            return view(request, *args, **kwargs)
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None and etag_matches(etag, if_none_match,
+                                                      weak=True):
+            return Response(status=status.HTTP_304_NOT_MODIFIED,
+                            headers={'ETag': etag})
+        response = view(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+
+    def get_version_fields(self):
+        if (self.action in self.list_actions
+                and self.list_version_fields is not None):
+            return self.list_version_fields
+        return self.version_fields
+
+    def get_version_queryset(self):
+        """Get queryset of the view that fetches only versions of rows."""
+        return self.filter_queryset(self.get_queryset()).select_related(
+            None
+        ).prefetch_related(None).annotate(**{
+            VERSION_ANNOTATION.format(number): F(name)
+            for number, name in enumerate(self.get_version_fields())
+        })
+
+    def get_versions(self, objs):
+        """Get tuples of primary key and versions of objs."""
+        names = [VERSION_ANNOTATION.format(number)
+                 for number in range(len(self.get_version_fields()))]
+        return [
+            (obj.pk,) + tuple(getattr(obj, name) for name in names)
+            for obj in objs
+        ]
+
+    def get_object_etag(self, lock=False):
+        """Get validator of the requested object or None if not found."""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_version_queryset().filter(**{
+            self.lookup_field: self.kwargs[lookup_url_kwarg]
+        }).only('pk')
+        if lock:
+            queryset = queryset.select_for_update(of=('self',))
+        obj = queryset.first()
+        if obj is None:
+            return None
+        self.check_object_permissions(self.request, obj)
+        return get_etag(get_language(), self.request.accepted_renderer.format,
+                        self.get_versions([obj]))
+
+    def get_list_etag(self):
+        """Get validator of the requested page of the list."""
+        queryset = self.get_version_queryset()
+        if self.pagination_class is None:
+            return get_etag(self.request.build_absolute_uri(), get_language(),
+                            self.request.accepted_renderer.format,
+                            self.get_versions(queryset.only('pk')))
+
+        # Paginator of its own keeps state of the page of the response.
+        paginator = self.pagination_class()
+        ordering = paginator.get_ordering(self.request, queryset, self)
+        fields = [name.lstrip('-') for name in ordering
+                  if name.lstrip('-') not in queryset.query.annotations]
+        page = paginator.paginate_queryset(
+            queryset.only('pk', *fields), self.request, view=self,
+        )
+        if page is None:
+            page = queryset.only('pk')
+            links = ()
+        else:
+            links = (paginator.has_previous, paginator.has_next)
+        return get_etag(self.request.build_absolute_uri(), get_language(),
+                        self.request.accepted_renderer.format, links,
+                        self.get_versions(page))
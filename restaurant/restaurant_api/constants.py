@@ -1 +1,9 @@
 RATING_MAX_VALUE = 100
+BULK_BATCH_SIZE = 1000
+# Radius in meters and number of nearby restaurants by default and at most
+NEARBY_DEFAULT_RADIUS = 5000
+NEARBY_MAX_RADIUS = 50000
+NEARBY_DEFAULT_LIMIT = 10
+NEARBY_MAX_LIMIT = 100
+# Number of restaurants kept in every leaderboard
+LEADERBOARD_SIZE = 20
@@ -0,0 +1,169 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def get_select_related_paths(select_related, prefix=''):
+    """Get lookups of a select_related dict of a query."""
+    paths = []
+    for name, nested in select_related.items():
+        path = prefix + name
+        paths.extend(get_select_related_paths(nested, path + '__')
+                     or [path])
+    return paths
+
+
+def get_prefetch_path(lookup):
+    if isinstance(lookup, Prefetch):
+        return lookup.prefetch_through
+    return lookup
+
+
+def get_field_sources(serializer_fields, names):
+    """
+    Get names of attributes of objects the serializer fields of names read
+    or None when a field reads the whole object.
+    """
+    sources = set()
+    for name in names:
+        source = serializer_fields[name].source
+        if source == '*':
+            return None
+        sources.add(source.split('.')[0])
+    return sources
+
+
+def trim_queryset(queryset, serializer_fields, names):
+    """
+    Get queryset that loads only what the serializer fields of names need:
+    their columns, relations they follow and prefetches they read.
+
+    Fields of the whole object or of properties, which may read anything,
+    keep the queryset as is.
+    """
+    model = queryset.model
+    sources = get_field_sources(serializer_fields, names)
+    if sources is None:
+        return queryset
+
+    columns = {model._meta.pk.name}
+    for source in sources:
+        try:
+            field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return queryset
+        if field.concrete and not field.many_to_many:
+            columns.add(field.name)
+    # Keyset pagination reads the ordering fields of objects.
+    for name in queryset.query.order_by:
+        try:
+            columns.add(model._meta.get_field(name.lstrip('-')).name)
+        except FieldDoesNotExist:
+            pass
+
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        queryset = queryset.select_related(None).select_related(*(
+            path for path in get_select_related_paths(select_related)
+            if path.split('__')[0] in sources
+        ))
+    lookups = queryset._prefetch_related_lookups
+    if lookups:
+        queryset = queryset.prefetch_related(None).prefetch_related(*(
+            lookup for lookup in lookups
+            if get_prefetch_path(lookup).split('__')[0] in sources
+        ))
+    return queryset.only(*columns)
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets of a viewset by the fields query parameter.
+
+    GET requests with e.g. ?fields=name,rating get only these fields of
+    objects. Fields are removed from the serializer, and the queryset
+    loads only their columns and drops relations and prefetches they do
+    not need; projections read only the lookups of the fields and
+    validators skip versions of relations that are not shown. Unknown
+    fields are answered with 400.
+    """
+    fields_query_param = 'fields'
+
+    def get_fields_serializer_class(self):
+        """Get serializer class the fields of the request are taken from."""
+        return self.get_serializer_class()
+
+    def get_requested_fields(self):
+        """Get names of the requested fields or None for all fields."""
+        if not hasattr(self, '_requested_fields'):
+            self._requested_fields = self.parse_requested_fields()
+        return self._requested_fields
+
+    def includes_field(self, name):
+        """Check whether the field is requested."""
+        names = self.get_requested_fields()
+        return names is None or name in names
+
+    def parse_requested_fields(self):
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        value = request.query_params.get(self.fields_query_param)
+        if value is None:
+            return None
+        names = tuple(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        available = self.get_fields_serializer_class()().fields
+        unknown = [name for name in names if name not in available]
+        if not names or unknown:
+            raise ValidationError({self.fields_query_param: (
+                'Unknown fields: {}.'.format(', '.join(unknown)) if unknown
+                else 'At least one field is required.'
+            )})
+        return names
+
+    def get_queryset(self):
+        return self.get_trimmed_queryset(super().get_queryset())
+
+    def get_trimmed_queryset(self, queryset):
+        """Get queryset that loads only what the requested fields need."""
+        names = self.get_requested_fields()
+        if names is None:
+            return queryset
+        return trim_queryset(
+            queryset, self.get_fields_serializer_class()().fields, names
+        )
+
+    def get_version_fields(self):
+        fields = super().get_version_fields()
+        names = self.get_requested_fields()
+        if names is None:
+            return fields
+        sources = get_field_sources(
+            self.get_fields_serializer_class()().fields, names
+        )
+        if sources is None:
+            return fields
+        return tuple(name for name in fields
+                     if '__' not in name or name.split('__')[0] in sources)
+
+    def get_serializer(self, *args, **kwargs):
+        return self.trim_serializer(super().get_serializer(*args, **kwargs))
+
+    def trim_serializer(self, serializer):
+        """Remove fields that are not requested from the serializer."""
+        names = self.get_requested_fields()
+        if names is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in list(fields):
+                if name not in names:
+                    fields.pop(name)
+        return serializer
+
+    def get_projection(self):
+        projection = super().get_projection()
+        if projection is not None:
+            projection.fields = self.get_requested_fields()
+        return projection
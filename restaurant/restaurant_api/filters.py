@@ -0,0 +1,25 @@
+from rest_framework.filters import BaseFilterBackend
+
+
+class QueryParamsFilterBackend(BaseFilterBackend):
+    """
+    Filter lists by query parameters.
+
+    Views set filter_serializer_class, a serializer that validates the
+    parameters, its Meta.lookups maps every field to the lookup it filters
+    by. Only list actions are filtered, invalid parameters are answered
+    with 400. Every lookup should be backed by an index.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer_class = getattr(view, 'filter_serializer_class', None)
+        if (serializer_class is None or getattr(view, 'action', None)
+                not in getattr(view, 'list_actions', ('list',))):
+            return queryset
+        serializer = serializer_class(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        lookups = serializer_class.Meta.lookups
+        return queryset.filter(**{
+            lookups[name]: value
+            for name, value in serializer.validated_data.items()
+        })
@@ -0,0 +1,91 @@
+import math
+from functools import reduce
+from operator import or_
+
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS = 6371008.8
+
+# Size in degrees of cells of the grid addresses are indexed by. Cells of
+# a circle are read with a range of cells per row of the grid, so a cell
+# should be about the size of typical search radius.
+GEO_CELL_SIZE = 0.1
+GEO_GRID_COLUMNS = round(360 / GEO_CELL_SIZE)
+
+
+def get_cell_row(latitude):
+    return math.floor((latitude + 90) / GEO_CELL_SIZE)
+
+
+def get_cell_column(longitude):
+    return math.floor((longitude + 180) / GEO_CELL_SIZE) % GEO_GRID_COLUMNS
+
+
+def get_geo_cell(latitude, longitude):
+    """Get number of the grid cell of the point or None without a point."""
+    if latitude is None or longitude is None:
+        return None
+    return (get_cell_row(latitude) * GEO_GRID_COLUMNS
+            + get_cell_column(longitude))
+
+
+def get_cell_ranges(latitude, longitude, radius):
+    """
+    Get ranges of numbers of the cells that cover the circle, one or two
+    per row of the grid inside the bounding box of the circle.
+    """
+    angle = radius / EARTH_RADIUS
+    south = latitude - math.degrees(angle)
+    north = latitude + math.degrees(angle)
+    columns = [(0, GEO_GRID_COLUMNS - 1)]
+    if -90 < south and north < 90 and angle < math.pi / 2:
+        delta = math.degrees(math.asin(
+            min(1, math.sin(angle) / math.cos(math.radians(latitude)))
+        ))
+        west = get_cell_column(longitude - delta)
+        east = get_cell_column(longitude + delta)
+        if west <= east:
+            columns = [(west, east)]
+        else:
+            # The circle crosses the antimeridian.
+            columns = [(west, GEO_GRID_COLUMNS - 1), (0, east)]
+
+    return [
+        (row * GEO_GRID_COLUMNS + west, row * GEO_GRID_COLUMNS + east)
+        for row in range(get_cell_row(max(-90, south)),
+                         get_cell_row(min(90, north)) + 1)
+        for west, east in columns
+    ]
+
+
+def get_distance(latitude_field, longitude_field, latitude, longitude):
+    """Get haversine distance expression in meters from the point."""
+    latitude_delta = Radians(F(latitude_field) - Value(latitude))
+    longitude_delta = Radians(F(longitude_field) - Value(longitude))
+    haversine = (
+        Power(Sin(latitude_delta / 2), 2)
+        + Value(math.cos(math.radians(latitude)))
+        * Cos(Radians(F(latitude_field)))
+        * Power(Sin(longitude_delta / 2), 2)
+    )
+    return Value(2 * EARTH_RADIUS) * ASin(Sqrt(haversine),
+                                          output_field=FloatField())
+
+
+def get_nearby(queryset, latitude, longitude, radius, prefix=''):
+    """
+    Get rows of queryset with point fields within radius meters from the
+    point annotated with distance and ordered by it.
+
+    Fields latitude, longitude and geo_cell are looked up with the prefix,
+    e.g. 'address__'. Only rows of the cells covering the circle are read
+    with index ranges of geo_cell, distance is computed just for them.
+    """
+    cells = reduce(or_, (
+        Q(**{prefix + 'geo_cell__range': cell_range})
+        for cell_range in get_cell_ranges(latitude, longitude, radius)
+    ))
+    return queryset.filter(cells).annotate(distance=get_distance(
+        prefix + 'latitude', prefix + 'longitude', latitude, longitude
+    )).filter(distance__lte=radius).order_by('distance', 'pk')
@@ -0,0 +1,148 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from .constants import BULK_BATCH_SIZE, LEADERBOARD_SIZE
+from .models import Leaderboard, Restaurant
+
+# Fields of restaurants kept in entries of leaderboards.
+ENTRY_FIELDS = ('id', 'name', 'rating')
+
+
+def get_board_keys(cuisine, country):
+    """
+    Get keys of leaderboards of a restaurant with the cuisine and country:
+    of the cuisine, of the country and of the cuisine in the country.
+    """
+    cuisine, country = cuisine or '', country or ''
+    keys = set()
+    if cuisine:
+        keys.add((cuisine, ''))
+    if country:
+        keys.add(('', country))
+    if cuisine and country:
+        keys.add((cuisine, country))
+    return keys
+
+
+def get_leaderboard_keys(queryset):
+    """Get keys of leaderboards of rated restaurants of queryset."""
+    keys = set()
+    for cuisine, country in queryset.filter(rating__isnull=False).order_by(
+    ).values_list('cuisine', 'address__country').distinct():
+        keys |= get_board_keys(cuisine, country)
+    return keys
+
+
+def get_entry(row):
+    return {name: row[name] for name in ENTRY_FIELDS}
+
+
+def get_entry_order(entry):
+    return -entry['rating'], entry['name']
+
+
+def get_ranked_rows(queryset):
+    """Get rows of rated restaurants of queryset, the best first."""
+    return queryset.filter(rating__isnull=False).order_by(
+        '-rating', 'name'
+    ).values(*ENTRY_FIELDS, 'cuisine', country=F('address__country'))
+
+
+def build_leaderboards(rows, size=None):
+    """Get entries of leaderboards by key from ranked rows."""
+    if size is None:
+        size = LEADERBOARD_SIZE
+    boards = defaultdict(list)
+    for row in rows:
+        for key in get_board_keys(row['cuisine'], row['country']):
+            if len(boards[key]) < size:
+                boards[key].append(get_entry(row))
+    return boards
+
+
+def rebuild_leaderboards():
+    """Rebuild all leaderboards with one pass over ranked restaurants."""
+    boards = build_leaderboards(
+        get_ranked_rows(Restaurant.objects.all()).iterator()
+    )
+    with transaction.atomic():
+        Leaderboard.objects.all().delete()
+        Leaderboard.objects.bulk_create((
+            Leaderboard(cuisine=cuisine, country=country, entries=entries)
+            for (cuisine, country), entries in boards.items()
+        ), batch_size=BULK_BATCH_SIZE)
+    return len(boards)
+
+
+def rebuild_leaderboard(key, exclude=None):
+    cuisine, country = key
+    queryset = Restaurant.objects.exclude(pk=exclude)
+    if cuisine:
+        queryset = queryset.filter(cuisine=cuisine)
+    if country:
+        queryset = queryset.filter(address__country=country)
+    save_leaderboard(key, [
+        get_entry(row)
+        for row in get_ranked_rows(queryset)[:LEADERBOARD_SIZE]
+    ])
+
+
+def save_leaderboard(key, entries):
+    cuisine, country = key
+    if entries:
+        Leaderboard.objects.update_or_create(
+            cuisine=cuisine, country=country, defaults={'entries': entries}
+        )
+    else:
+        Leaderboard.objects.filter(cuisine=cuisine, country=country).delete()
+
+
+def move_entry(entry, old_keys, new_keys):
+    """
+    Move entry of a changed restaurant from leaderboards of old_keys to
+    leaderboards of new_keys, which are empty for deleted or not rated
+    restaurants.
+
+    Entries are reordered in place. A leaderboard is rebuilt from the
+    database only when the restaurant was in it, the leaderboard was full
+    and the restaurant left it or fell to its end: a restaurant out of the
+    leaderboard may deserve its place.
+    """
+    keys = set(old_keys) | set(new_keys)
+    if not keys:
+        return
+    with transaction.atomic():
+        boards = {
+            (board.cuisine, board.country): board.entries
+            for board in Leaderboard.objects.select_for_update().filter(
+                reduce(or_, (Q(cuisine=cuisine, country=country)
+                             for cuisine, country in keys))
+            )
+        }
+        for key in keys:
+            entries = boards.get(key, [])
+            updated = [item for item in entries if item['id'] != entry['id']]
+            was_listed = len(updated) < len(entries)
+            if key in new_keys:
+                updated.append(entry)
+                updated.sort(key=get_entry_order)
+            if (was_listed and len(entries) >= LEADERBOARD_SIZE
+                    and (key not in new_keys
+                         or updated[LEADERBOARD_SIZE - 1] is entry)):
+                # Deleted restaurants are still in the database.
+                rebuild_leaderboard(
+                    key, exclude=None if key in new_keys else entry['id']
+                )
+            elif updated[:LEADERBOARD_SIZE] != entries:
+                save_leaderboard(key, updated[:LEADERBOARD_SIZE])
+
+
+def get_leaderboard(cuisine='', country=''):
+    """Get entries of the leaderboard with one lookup by its key."""
+    return Leaderboard.objects.filter(
+        cuisine=cuisine, country=country
+    ).values_list('entries', flat=True).first() or []
@@ -0,0 +1,203 @@
+import asyncio
+import ssl
+import time
+from base64 import b64encode
+from urllib.parse import urlencode, urlsplit
+
+
+class LoadResult:
+    """Latencies and errors of requests of a load run."""
+
+    def __init__(self):
+        self.latencies = []
+        self.statuses = {}
+        self.errors = 0
+        self.elapsed = 0
+
+    @property
+    def requests(self):
+        return len(self.latencies)
+
+    @property
+    def rate(self):
+        return self.requests / self.elapsed if self.elapsed else 0
+
+    def percentile(self, percent):
+        """Get latency in seconds that percent of requests did not exceed."""
+        if not self.latencies:
+            return 0
+        latencies = sorted(self.latencies)
+        index = min(len(latencies) - 1,
+                    max(0, round(percent / 100 * len(latencies)) - 1))
+        return latencies[index]
+
+    def add(self, status, latency):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+
+def get_basic_auth_header(credentials):
+    """Get Authorization header value of 'username:password'."""
+    return 'Basic ' + b64encode(credentials.encode()).decode('ascii')
+
+
+class HttpConnection:
+    """
+    Minimal keep-alive HTTP/1.1 client connection built on asyncio streams.
+
+    It is enough to load the API: request bodies are sent whole, responses
+    have either Content-Length, chunked body or end with the connection.
+    Cookies set by responses are sent with the next requests.
+    """
+
+    def __init__(self, url, cookies=None):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.netloc = parts.netloc.rpartition('@')[2]
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() \
+            if parts.scheme == 'https' else None
+        self.cookies = dict(cookies or {})
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=(), body=None):
+        """Send request and get status, headers and body of response."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.ssl
+            )
+        lines = ['{} {} HTTP/1.1'.format(method, path),
+                 'Host: {}'.format(self.netloc)]
+        if self.cookies:
+            lines.append('Cookie: {}'.format('; '.join(
+                '{}={}'.format(name, value)
+                for name, value in self.cookies.items()
+            )))
+        if body is not None:
+            lines.append('Content-Length: {}'.format(len(body)))
+        lines.extend('{}: {}'.format(name, value) for name, value in headers)
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin1'))
+        if body is not None:
+            self.writer.write(body)
+        await self.writer.drain()
+        try:
+            return await self.read_response()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            await self.close()
+            raise
+
+    async def read_response(self):
+        status_line = await self.reader.readuntil(b'\r\n')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin1').partition(':')
+            name, value = name.strip().lower(), value.strip()
+            headers[name] = value
+            if name == 'set-cookie':
+                self.set_cookie(value)
+
+        if 'content-length' in headers:
+            body = await self.reader.readexactly(
+                int(headers['content-length'])
+            )
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            body = await self.read_chunked()
+        elif status in (204, 304):
+            body = b''
+        else:
+            body = await self.reader.read()
+            headers['connection'] = 'close'
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, headers, body
+
+    def set_cookie(self, value):
+        cookie, _, attributes = value.partition(';')
+        name, _, cookie_value = cookie.partition('=')
+        if 'max-age=0' in attributes.lower().replace(' ', ''):
+            self.cookies.pop(name.strip(), None)
+        else:
+            self.cookies[name.strip()] = cookie_value.strip()
+
+    async def read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0],
+                       16)
+            chunk = await self.reader.readexactly(size + 2)
+            if not size:
+                return b''.join(chunks)
+            chunks.append(chunk[:-2])
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+        self.reader = self.writer = None
+
+
+async def run_load(urls, total, concurrency, headers=(), timeout=30):
+    """
+    Make total GET requests to urls in turn from concurrency clients.
+
+    Every client keeps its own connection open between requests.
+    """
+    result = LoadResult()
+    counter = iter(range(total))
+
+    async def client():
+        connection = HttpConnection(urls[0])
+        try:
+            for number in counter:
+                url = urlsplit(urls[number % len(urls)])
+                path = url.path + ('?' + url.query if url.query else '')
+                started = time.perf_counter()
+                try:
+                    status, _, _ = await asyncio.wait_for(
+                        connection.request('GET', path, headers), timeout
+                    )
+                except (OSError, asyncio.TimeoutError,
+                        asyncio.IncompleteReadError, ValueError):
+                    result.errors += 1
+                    await connection.close()
+                    continue
+                result.add(status, time.perf_counter() - started)
+        finally:
+            await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+async def login(url, path, username, password, timeout=30):
+    """
+    Log in through the login form of Django at path and get cookies of the
+    session, with the CSRF token for unsafe requests.
+    """
+    connection = HttpConnection(url)
+    try:
+        await asyncio.wait_for(connection.request('GET', path), timeout)
+        body = urlencode({
+            'username': username,
+            'password': password,
+            'csrfmiddlewaretoken': connection.cookies.get('csrftoken', ''),
+        }).encode()
+        status, _, _ = await asyncio.wait_for(connection.request(
+            'POST', path,
+            [('Content-Type', 'application/x-www-form-urlencoded')], body,
+        ), timeout)
+    finally:
+        await connection.close()
+    # The form redirects after successful login and is shown again else.
+    if status != 302:
+        raise ValueError('Login failed with status {}.'.format(status))
+    return connection.cookies
@@ -0,0 +1,265 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from .models import (Address, Employee, Person, Positions, Restaurant,
+                     set_derived_address_columns)
+from .signals import bulk_changed
+
+# Marker of NULL values in CSV sent to COPY.
+COPY_NULL = r'\N'
+
+
+def read_rows(path):
+    """Yield rows of CSV file with header or of JSON lines file as dicts."""
+    with open(path, newline='', encoding='utf-8') as file:
+        if str(path).endswith('.jsonl'):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(file)
+
+
+def batched(iterable, size):
+    """Split iterable into lists of size items."""
+    iterator = iter(iterable)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+class BulkWriter:
+    """
+    Writer of model instances with the fastest bulk path of the database.
+
+    On PostgreSQL instances are written with COPY from a CSV buffer of one
+    batch, on other databases with bulk_create. Primary keys are written
+    only when explicit_pk is set, sequences are reset afterwards then.
+    """
+
+    def __init__(self, model, explicit_pk=False):
+        self.model = model
+        self.explicit_pk = explicit_pk
+        self.fields = [
+            field for field in model._meta.concrete_fields
+            if explicit_pk or not field.primary_key
+        ]
+
+    def write(self, objs):
+        if connection.vendor == 'postgresql':
+            self.copy(objs)
+        else:
+            self.model.objects.bulk_create(objs, batch_size=len(objs))
+
+    def copy(self, objs):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for obj in objs:
+            writer.writerow([self.prepare_value(field, obj)
+                             for field in self.fields])
+        buffer.seek(0)
+        sql = "COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, " \
+              "NULL '{null}')".format(
+                  table=connection.ops.quote_name(self.model._meta.db_table),
+                  columns=', '.join(connection.ops.quote_name(field.column)
+                                    for field in self.fields),
+                  null=COPY_NULL,
+              )
+        with connection.cursor() as cursor:
+            cursor.copy_expert(sql, buffer)
+
+    def prepare_value(self, field, obj):
+        value = field.get_db_prep_save(field.pre_save(obj, add=True),
+                                       connection)
+        return COPY_NULL if value is None else value
+
+    def finish(self):
+        if not self.explicit_pk:
+            return
+        statements = connection.ops.sequence_reset_sql(no_style(),
+                                                       [self.model])
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+class ModelLoader:
+    """
+    Loader of rows of one model file.
+
+    Rows are converted to instances batch by batch, foreign keys of the
+    batch are resolved with one query per relation. Rows with foreign keys
+    that can not be resolved are skipped.
+    """
+    model = None
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.loaded = 0
+        self.skipped = 0
+
+    def load(self, rows):
+        """
+        Write rows batch by batch, each batch in its own transaction.
+
+        Batches written before a failure are kept, sequences and derived
+        data are updated for them anyway, loaded counts their rows.
+        """
+        writer = None
+        try:
+            for batch in batched(rows, self.batch_size):
+                explicit_pk = self.has_explicit_pks(batch)
+                if writer is None:
+                    writer = BulkWriter(self.model, explicit_pk=explicit_pk)
+                elif explicit_pk != writer.explicit_pk:
+                    raise ValueError(self.get_mixed_pks_message(
+                        self.loaded + self.skipped + 1
+                    ))
+                objs = self.get_objects(batch)
+                with transaction.atomic():
+                    if objs:
+                        writer.write(objs)
+                self.loaded += len(objs)
+                self.skipped += len(batch) - len(objs)
+        finally:
+            if self.loaded:
+                writer.finish()
+                bulk_changed.send(sender=self.model)
+
+    def has_explicit_pks(self, rows):
+        """
+        Get whether rows have ids, either all of them or none should have.
+        """
+        explicit = [row.get('id') not in ('', None) for row in rows]
+        if any(explicit) and not all(explicit):
+            raise ValueError(self.get_mixed_pks_message(
+                self.loaded + self.skipped + explicit.index(not explicit[0])
+                + 1
+            ))
+        return explicit[0]
+
+    @staticmethod
+    def get_mixed_pks_message(number):
+        return (
+            'ids are set for some rows only, row {} differs from the first '
+            'one. Set ids of all rows or of none.'.format(number)
+        )
+
+    def get_objects(self, rows):
+        return [self.model(**self.get_values(row)) for row in rows]
+
+    def get_values(self, row):
+        values = {}
+        for field in self.model._meta.concrete_fields:
+            if field.is_relation or field.name not in row:
+                continue
+            value = row[field.name]
+            if value in ('', None) and (field.null or field.primary_key):
+                values[field.name] = None
+            else:
+                values[field.name] = field.to_python(value)
+        return values
+
+    @staticmethod
+    def get_existing_pks(model, values):
+        """Get those of values that are primary keys of model as strings."""
+        pks = {
+            str(value).strip() for value in values if value is not None
+        }
+        pks = [pk for pk in pks if pk.isdigit()]
+        return set(
+            str(pk) for pk in
+            model.objects.filter(pk__in=pks).values_list('pk', flat=True)
+        )
+
+
+class PersonLoader(ModelLoader):
+    model = Person
+
+
+class AddressLoader(ModelLoader):
+    """
+    Loader of addresses, full addresses and geo cells are built for every
+    row.
+    """
+    model = Address
+
+    def get_objects(self, rows):
+        objs = super().get_objects(rows)
+        for obj in objs:
+            set_derived_address_columns(obj)
+        return objs
+
+
+class RestaurantLoader(ModelLoader):
+    """Loader of restaurants, address column holds id of address."""
+    model = Restaurant
+
+    def get_objects(self, rows):
+        addresses = self.get_existing_pks(
+            Address, (row.get('address') for row in rows)
+        )
+        objs = []
+        for row in rows:
+            address = row.get('address')
+            if address in ('', None):
+                address = None
+            elif str(address).strip() not in addresses:
+                continue
+            objs.append(Restaurant(address_id=address,
+                                   **self.get_values(row)))
+        return objs
+
+
+class EmployeeLoader(ModelLoader):
+    """
+    Loader of employees.
+
+    Restaurant column holds name of restaurant, person column holds id of
+    person and position column holds either value or label of position.
+    """
+    model = Employee
+    positions = {
+        label.lower(): value for value, label in Positions.choices
+    }
+
+    def get_objects(self, rows):
+        restaurants = dict(Restaurant.objects.filter(
+            name__in={row.get('restaurant') for row in rows}
+        ).values_list('name', 'id'))
+        persons = self.get_existing_pks(
+            Person, (row.get('person') for row in rows)
+        )
+        objs = []
+        for row in rows:
+            restaurant = restaurants.get(row.get('restaurant'))
+            position = self.get_position(row.get('position'))
+            if (restaurant is None or position is None
+                    or str(row.get('person')).strip() not in persons):
+                continue
+            objs.append(Employee(
+                restaurant_id=restaurant, person_id=row['person'],
+                **self.get_values(dict(row, position=position))
+            ))
+        return objs
+
+    def get_position(self, value):
+        value = str(value).strip()
+        if value.isdigit() and int(value) in Positions.values:
+            return int(value)
+        return self.positions.get(value.lower())
+
+
+# Loaders in order of dependencies between models.
+LOADERS = (
+    ('addresses', AddressLoader),
+    ('persons', PersonLoader),
+    ('restaurants', RestaurantLoader),
+    ('employees', EmployeeLoader),
+)
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from urllib.parse import quote
+
+from .loadgen import HttpConnection, LoadResult
+
+# Percentiles of latency reported for every action.
+PERCENTILES = (50, 95, 99)
+
+# Requests of every action per 100 requests of the scenario, mostly reads
+# as clients of the API make.
+ACTION_WEIGHTS = {
+    'person-list': 8,
+    'person-retrieve': 8,
+    'person-create': 3,
+    'person-partial-update': 2,
+    'person-destroy': 2,
+    'address-list': 6,
+    'address-retrieve': 6,
+    'address-partial-update': 1,
+    'restaurant-list': 14,
+    'restaurant-retrieve': 12,
+    'restaurant-get-random-restaurant': 6,
+    'restaurant-partial-update': 2,
+    'employee-list': 15,
+    'employee-retrieve': 15,
+}
+
+
+class Scenario:
+    """
+    Weighted random mix of reads and writes of the API endpoints.
+
+    Paths are taken from paths, a dict of route name to path or, for
+    details, to a format string with {} for the lookup value, and objects
+    from ids, a dict of route basename to known lookup values. Persons
+    created by the scenario are updated and deleted by it.
+    """
+
+    def __init__(self, paths, ids, weights=None, rng=random):
+        self.paths = paths
+        self.ids = ids
+        self.weights = ACTION_WEIGHTS if weights is None else weights
+        self.rng = rng
+        self.created = []
+        self.counter = 0
+
+    def next_request(self):
+        """Get action, method, path and JSON body of the next request."""
+        names = list(self.weights)
+        action = self.rng.choices(names, [self.weights[name]
+                                          for name in names])[0]
+        if action == 'person-destroy' and not self.created:
+            action = 'person-create'
+        basename, _, kind = action.partition('-')
+        if kind == 'list':
+            return action, 'GET', self.paths[action], None
+        if kind == 'create':
+            self.counter += 1
+            return action, 'POST', self.paths[action], {
+                'firstname': 'Load {}'.format(self.counter),
+                'surname': 'Test',
+            }
+        if kind == 'destroy':
+            pk = self.created.pop(self.rng.randrange(len(self.created)))
+            return action, 'DELETE', self.get_detail_path(basename, pk), None
+        if kind not in ('retrieve', 'partial-update'):
+            return action, 'GET', self.paths[action], None
+
+        values = self.ids.get(basename)
+        if not values:
+            action = '{}-list'.format(basename)
+            return action, 'GET', self.paths[action], None
+        path = self.get_detail_path(basename, self.rng.choice(values))
+        if kind == 'retrieve':
+            return action, 'GET', path, None
+        return action, 'PATCH', path, self.get_update(basename)
+
+    def get_detail_path(self, basename, value):
+        return self.paths['{}-detail'.format(basename)].format(
+            quote(str(value))
+        )
+
+    def get_update(self, basename):
+        if basename == 'restaurant':
+            return {'rating': self.rng.randint(0, 100)}
+        if basename == 'address':
+            return {'zip_code': str(self.rng.randint(10000, 99999))}
+        return {'phone': '+7{}'.format(self.rng.randint(10 ** 9,
+                                                        10 ** 10 - 1))}
+
+    def handle_response(self, action, status, body):
+        if action == 'person-create' and status == 201:
+            self.created.append(json.loads(body)['id'])
+
+
+async def fetch_ids(url, paths, lookups, cookies=None, limit=1000):
+    """
+    Get up to limit lookup values of objects by basename, lookups is a
+    dict of basename to the lookup field.
+    """
+    ids = {}
+    connection = HttpConnection(url, cookies)
+    try:
+        for basename, lookup in lookups.items():
+            status, _, body = await connection.request(
+                'GET', '{}?fields={}&page_size={}'.format(
+                    paths['{}-list'.format(basename)], lookup, limit
+                ), [('Accept', 'application/json')],
+            )
+            if status != 200:
+                raise ValueError('Listing {} failed with status {}.'.format(
+                    basename, status
+                ))
+            ids[basename] = [item[lookup]
+                             for item in json.loads(body)['results']]
+    finally:
+        await connection.close()
+    return ids
+
+
+async def delete_created(url, scenario, headers=(), cookies=None):
+    """Delete persons created by the scenario and not deleted by it."""
+    connection = HttpConnection(url, cookies)
+    try:
+        while scenario.created:
+            await connection.request('DELETE', scenario.get_detail_path(
+                'person', scenario.created.pop()
+            ), headers)
+    finally:
+        await connection.close()
+
+
+async def run_scenario(url, scenario, total, concurrency, headers=(),
+                       timeout=30, cookies=None):
+    """
+    Make total requests of the scenario to the server at url from
+    concurrency clients and get load results by action.
+    """
+    results = defaultdict(LoadResult)
+    counter = iter(range(total))
+
+    async def client():
+        connection = HttpConnection(url, cookies)
+        try:
+            for _ in counter:
+                action, method, path, data = scenario.next_request()
+                request_headers = list(headers)
+                body = None
+                if data is not None:
+                    body = json.dumps(data).encode()
+                    request_headers.append(('Content-Type',
+                                            'application/json'))
+                started = time.perf_counter()
+                try:
+                    status, _, content = await asyncio.wait_for(
+                        connection.request(method, path, request_headers,
+                                           body),
+                        timeout,
+                    )
+                except (OSError, asyncio.TimeoutError,
+                        asyncio.IncompleteReadError, ValueError):
+                    results[action].errors += 1
+                    await connection.close()
+                    continue
+                results[action].add(status, time.perf_counter() - started)
+                scenario.handle_response(action, status, content)
+        finally:
+            await connection.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    for result in results.values():
+        result.elapsed = elapsed
+    return dict(results)
+
+
+def summarize(result):
+    """Get rate, errors, statuses and latency percentiles in ms."""
+    summary = {
+        'requests': result.requests,
+        'errors': result.errors,
+        'rate': round(result.rate, 2),
+        'statuses': {str(status): count
+                     for status, count in sorted(result.statuses.items())},
+    }
+    for percent in PERCENTILES:
+        summary['p{}'.format(percent)] = round(
+            result.percentile(percent) * 1000, 3
+        )
+    return summary
+
+
+def summarize_results(results):
+    """Get summaries of results by action and of all of them."""
+    total = LoadResult()
+    for result in results.values():
+        total.latencies.extend(result.latencies)
+        total.errors += result.errors
+        for status, count in result.statuses.items():
+            total.statuses[status] = total.statuses.get(status, 0) + count
+        total.elapsed = result.elapsed
+    return {
+        'actions': {action: summarize(results[action])
+                    for action in sorted(results)},
+        'total': summarize(total),
+    }
+
+
+def compare_summaries(baseline, current, threshold=0.1):
+    """
+    Get descriptions of regressions of the current run against the
+    baseline: rate fallen or p95, p99 grown by more than threshold, or
+    share of errors grown.
+    """
+    regressions = []
+    actions = dict(baseline['actions'], total=baseline['total'])
+    for action, before in sorted(actions.items()):
+        after = current['total'] if action == 'total' \
+            else current['actions'].get(action)
+        if after is None:
+            continue
+        if after['rate'] < before['rate'] * (1 - threshold):
+            regressions.append('{}: rate fell from {} to {} requests/s'.format(
+                action, before['rate'], after['rate']
+            ))
+        for name in ('p95', 'p99'):
+            if after[name] > before[name] * (1 + threshold):
+                regressions.append('{}: {} grew from {} to {} ms'.format(
+                    action, name, before[name], after[name]
+                ))
+        if get_error_share(after) > get_error_share(before):
+            regressions.append('{}: errors grew from {} to {}'.format(
+                action, before['errors'], after['errors']
+            ))
+    return regressions
+
+
+def get_error_share(summary):
+    """Get share of failed requests: errors and server errors."""
+    failed = summary['errors'] + sum(
+        count for status, count in summary['statuses'].items()
+        if status.startswith('5')
+    )
+    made = summary['requests'] + summary['errors']
+    return failed / made if made else 0
@@ -0,0 +1,69 @@
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurant.restaurant_api.loadgen import get_basic_auth_header, run_load
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare requests per second of the sync views served by a WSGI '
+        'server (restaurant.wsgi) and of the same views offloaded to threads '
+        'of an ASGI server (restaurant.asgi) under many concurrent clients. '
+        'Servers should be started beforehand, e.g. "gunicorn '
+        'restaurant.wsgi" and "uvicorn restaurant.asgi:application".'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--wsgi-url', required=True,
+            help='URL of a sync view, e.g. http://127.0.0.1:8000/'
+                 'restaurants/.',
+        )
+        parser.add_argument(
+            '--asgi-url', required=True,
+            help='URL of an offloaded view, e.g. http://127.0.0.1:8001/async/'
+                 'restaurants/.',
+        )
+        parser.add_argument('--requests', type=int, default=5000,
+                            help='Number of requests per server '
+                                 '(default 5000).')
+        parser.add_argument('--concurrency', type=int, default=200,
+                            help='Number of concurrent clients '
+                                 '(default 200).')
+        parser.add_argument('--user', metavar='USERNAME:PASSWORD',
+                            help='Credentials for basic authentication.')
+        parser.add_argument('--timeout', type=float, default=30,
+                            help='Timeout of a request in seconds '
+                                 '(default 30).')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('Requests and concurrency should be '
+                               'positive.')
+        headers = []
+        if options['user']:
+            headers.append(('Authorization',
+                            get_basic_auth_header(options['user'])))
+
+        results = []
+        for name in ('wsgi', 'asgi'):
+            result = asyncio.run(run_load(
+                [options['{}_url'.format(name)]], options['requests'],
+                options['concurrency'], headers, options['timeout'],
+            ))
+            results.append(result)
+            self.stdout.write(
+                '{name}: {rate:.1f} requests/s, p50 {p50:.1f} ms, p99 '
+                '{p99:.1f} ms, {errors} errors, statuses {statuses}'.format(
+                    name=name.upper(), rate=result.rate,
+                    p50=result.percentile(50) * 1000,
+                    p99=result.percentile(99) * 1000,
+                    errors=result.errors,
+                    statuses=dict(sorted(result.statuses.items())),
+                )
+            )
+        if results[0].rate:
+            self.stdout.write('ASGI/WSGI: {:.2f}x'.format(
+                results[1].rate / results[0].rate
+            ))
@@ -0,0 +1,116 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+from restaurant.restaurant_api.views import EmployeeViewSet, RestaurantViewSet
+
+EMPLOYEES_PER_RESTAURANT = 10
+
+
+def seed(restaurants):
+    """Create restaurants with addresses and employees."""
+    Address.objects.bulk_create(
+        Address(country='RU', province='Benchmark', city='City',
+                street='Street {}'.format(number), house=str(number))
+        for number in range(restaurants)
+    )
+    Restaurant.objects.bulk_create(
+        Restaurant(name='Benchmark {}'.format(number), address_id=address,
+                   phone='+199945645670', cuisine='Russian',
+                   rating=number % 101)
+        for number, address in enumerate(Address.objects.filter(
+            province='Benchmark'
+        ).values_list('pk', flat=True))
+    )
+    Person.objects.bulk_create(
+        Person(firstname='Firstname {}'.format(number), surname='Benchmark')
+        for number in range(restaurants * EMPLOYEES_PER_RESTAURANT)
+    )
+    restaurant_pks = list(Restaurant.objects.filter(
+        name__startswith='Benchmark '
+    ).values_list('pk', flat=True))
+    Employee.objects.bulk_create(
+        Employee(
+            restaurant_id=restaurant_pks[number // EMPLOYEES_PER_RESTAURANT],
+            person_id=person, position=Positions.COOK,
+        )
+        for number, person in enumerate(Person.objects.filter(
+            surname='Benchmark'
+        ).values_list('pk', flat=True))
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare time of rendering restaurant and employee lists from model '
+        'instances and from value dicts of projections. Renders of both '
+        'ways are checked to be byte for byte equal. With --seed the data '
+        'is created in a transaction that is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=1000,
+                            help='Number of rows rendered (default 1000).')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of runs, the best is reported '
+                                 '(default 5).')
+        parser.add_argument('--seed', type=int, default=0,
+                            metavar='RESTAURANTS',
+                            help='Create restaurants with {} employees '
+                                 'each before the benchmark.'.format(
+                                     EMPLOYEES_PER_RESTAURANT))
+
+    def handle(self, *args, **options):
+        if options['limit'] < 1 or options['repeat'] < 1:
+            raise CommandError('Limit and repeat should be positive.')
+        with transaction.atomic():
+            if options['seed']:
+                seed(options['seed'])
+            for viewset in (RestaurantViewSet, EmployeeViewSet):
+                self.benchmark(viewset, options['limit'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def benchmark(self, viewset, limit, repeat):
+        serializer_class = viewset.serializer_list_class
+        queryset = viewset.queryset.all()
+        projected = serializer_class.Meta.projection_class().get_queryset(
+            queryset
+        )
+        instances_time, instances_content = self.measure(
+            serializer_class, queryset[:limit], repeat
+        )
+        projection_time, projection_content = self.measure(
+            serializer_class, projected[:limit], repeat
+        )
+        if instances_content != projection_content:
+            raise CommandError('Projection of {} renders differently.'.format(
+                serializer_class.__name__
+            ))
+        self.stdout.write(
+            '{name}: {rows} rows, instances {instances:.1f} ms, projection '
+            '{projection:.1f} ms, {speedup:.1f}x faster'.format(
+                name=queryset.model._meta.verbose_name_plural,
+                rows=queryset[:limit].count(),
+                instances=instances_time * 1000,
+                projection=projection_time * 1000,
+                speedup=instances_time / projection_time
+                if projection_time else 0,
+            )
+        )
+
+    @staticmethod
+    def measure(serializer_class, queryset, repeat):
+        """Get the best time of reading and rendering queryset."""
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = JSONRenderer().render(
+                serializer_class(queryset.all(), many=True).data
+            )
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, content
@@ -0,0 +1,103 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from restaurant.restaurant_api.renderers import (MessagePackParser,
+                                                 MessagePackRenderer,
+                                                 ORJSONParser, ORJSONRenderer)
+from restaurant.restaurant_api.views import EmployeeViewSet, RestaurantViewSet
+
+from .bench_projections import EMPLOYEES_PER_RESTAURANT, seed
+
+FORMATS = (
+    ('json', JSONRenderer, JSONParser),
+    ('orjson', ORJSONRenderer, ORJSONParser),
+    ('msgpack', MessagePackRenderer, MessagePackParser),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare encode and decode throughput and payload size of the '
+        'default JSON renderer and parser, of the orjson ones and of '
+        'MessagePack on restaurant and employee lists. Decoded payloads of '
+        'all formats are checked to be equal. With --seed the data is '
+        'created in a transaction that is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=1000,
+                            help='Number of rows rendered (default 1000).')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Number of runs, the best is reported '
+                                 '(default 5).')
+        parser.add_argument('--seed', type=int, default=0,
+                            metavar='RESTAURANTS',
+                            help='Create restaurants with {} employees '
+                                 'each before the benchmark.'.format(
+                                     EMPLOYEES_PER_RESTAURANT))
+
+    def handle(self, *args, **options):
+        if options['limit'] < 1 or options['repeat'] < 1:
+            raise CommandError('Limit and repeat should be positive.')
+        with transaction.atomic():
+            if options['seed']:
+                seed(options['seed'])
+            for viewset in (RestaurantViewSet, EmployeeViewSet):
+                self.benchmark(viewset, options['limit'], options['repeat'])
+            transaction.set_rollback(True)
+
+    def benchmark(self, viewset, limit, repeat):
+        serializer_class = viewset.serializer_list_class
+        queryset = serializer_class.Meta.projection_class().get_queryset(
+            viewset.queryset.all()
+        )[:limit]
+        data = serializer_class(queryset, many=True).data
+        name = viewset.queryset.model._meta.verbose_name_plural
+        results = []
+        for format_name, renderer_class, parser_class in FORMATS:
+            renderer, parser = renderer_class(), parser_class()
+            encode_time, content = self.measure(
+                lambda: renderer.render(data), repeat
+            )
+            decode_time, decoded = self.measure(
+                lambda: parser.parse(io.BytesIO(content)), repeat
+            )
+            results.append((format_name, encode_time, decode_time,
+                            len(content), decoded))
+        expected = results[0][4]
+        for format_name, encode_time, decode_time, size, decoded in results:
+            if decoded != expected:
+                raise CommandError('{} payload of {} differs.'.format(
+                    format_name, name
+                ))
+            self.stdout.write(
+                '{name} {format}: {rows} rows, {size} bytes, encode '
+                '{encode:.1f} ms ({encode_rate:.1f} MB/s), decode '
+                '{decode:.1f} ms ({decode_rate:.1f} MB/s)'.format(
+                    name=name, format=format_name, rows=len(data),
+                    size=size, encode=encode_time * 1000,
+                    encode_rate=self.get_rate(size, encode_time),
+                    decode=decode_time * 1000,
+                    decode_rate=self.get_rate(size, decode_time),
+                )
+            )
+
+    @staticmethod
+    def get_rate(size, elapsed):
+        return size / elapsed / 1e6 if elapsed else 0
+
+    @staticmethod
+    def measure(function, repeat):
+        """Get the best time of calling function and its result."""
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
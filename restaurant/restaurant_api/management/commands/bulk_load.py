@@ -0,0 +1,67 @@
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from restaurant.restaurant_api.loading import LOADERS, read_rows
+
+DEFAULT_BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        'Load persons, addresses, restaurants and employees from CSV files '
+        'with header or JSON lines files (.jsonl) using bulk paths of the '
+        'database (COPY on PostgreSQL). Restaurants refer to addresses by '
+        'id, employees refer to restaurants by name and to persons by id. '
+        'Memory used depends on the batch size, not on the files size.'
+    )
+
+    def add_arguments(self, parser):
+        for name, loader in LOADERS:
+            parser.add_argument(
+                '--{}'.format(name), metavar='PATH',
+                help='File with {}.'.format(name),
+            )
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows written at once (default {}).'.format(
+                DEFAULT_BATCH_SIZE
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('Batch size should be positive.')
+        paths = [
+            (name, loader_class, options[name])
+            for name, loader_class in LOADERS if options[name]
+        ]
+        if not paths:
+            raise CommandError('Specify at least one file to load.')
+
+        for name, loader_class, path in paths:
+            loader = loader_class(options['batch_size'])
+            started = time.perf_counter()
+            try:
+                loader.load(read_rows(path))
+            except (OSError, ValueError, ValidationError,
+                    IntegrityError) as exc:
+                raise CommandError(
+                    'Can not load {name} from {path}: {exc}\nThe load is '
+                    'partial, {loaded} {name} written before the failure '
+                    'are kept.'.format(
+                        name=name, path=path, exc=exc, loaded=loader.loaded
+                    )
+                )
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                'Loaded {loaded} {name} in {elapsed:.2f}s ({rate:.0f} '
+                'rows/s), skipped {skipped} rows with unknown '
+                'references.'.format(
+                    loaded=loader.loaded, name=name, elapsed=elapsed,
+                    rate=loader.loaded / elapsed if elapsed else 0,
+                    skipped=loader.skipped,
+                )
+            )
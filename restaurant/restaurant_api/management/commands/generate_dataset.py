@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from restaurant.restaurant_api.synthetic import DatasetGenerator
+
+DEFAULT_BATCH_SIZE = 10000
+# Options with numbers of rows in order of generation.
+COUNTS = ('persons', 'addresses', 'restaurants', 'employees')
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate synthetic persons, addresses, restaurants and employees '
+        'using bulk paths of the database (COPY on PostgreSQL). Countries, '
+        'cuisines, ratings, sizes of restaurants and positions follow '
+        'realistic distributions, every restaurant has a director when '
+        'employees are generated, at least one per restaurant, and the same '
+        '--seed gives the same rows. Existing rows are kept.'
+    )
+
+    def add_arguments(self, parser):
+        for name in COUNTS:
+            parser.add_argument('--{}'.format(name), type=int, default=0,
+                                help='Number of {} to generate.'.format(name))
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Seed of the random data (default 0).')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help='Number of rows written at once (default {}).'.format(
+                DEFAULT_BATCH_SIZE
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('Batch size should be positive.')
+        if any(options[name] < 0 for name in COUNTS):
+            raise CommandError('Numbers of rows should not be negative.')
+        if not any(options[name] for name in COUNTS):
+            raise CommandError('Specify at least one number of rows.')
+
+        generator = DatasetGenerator(options['seed'], options['batch_size'])
+        started = time.perf_counter()
+        try:
+            counts = generator.generate(**{name: options[name]
+                                           for name in COUNTS})
+        except ValueError as exc:
+            raise CommandError(exc)
+        elapsed = time.perf_counter() - started
+        total = sum(counts.values())
+        self.stdout.write(
+            'Generated {counts} in {elapsed:.2f}s ({rate:.0f} '
+            'rows/s).'.format(
+                counts=', '.join(
+                    '{} {}'.format(counts[name], name) for name in COUNTS
+                ),
+                elapsed=elapsed, rate=total / elapsed if elapsed else 0,
+            )
+        )
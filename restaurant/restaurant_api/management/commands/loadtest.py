@@ -0,0 +1,146 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from restaurant.restaurant_api.loadgen import login
+from restaurant.restaurant_api.loadtest import (ACTION_WEIGHTS, PERCENTILES,
+                                                Scenario, compare_summaries,
+                                                delete_created, fetch_ids,
+                                                run_scenario,
+                                                summarize_results)
+
+# Lookup fields of the details of the routes by basename.
+LOOKUPS = {
+    'person': 'id',
+    'address': 'id',
+    'restaurant': 'name',
+    'employee': 'id',
+}
+LOOKUP_PLACEHOLDER = 'lookup'
+
+
+def get_paths():
+    """Get paths of the routes the scenario requests by route name."""
+    paths = {'restaurant-get-random-restaurant': reverse(
+        'restaurant-get-random-restaurant'
+    )}
+    for basename, lookup in LOOKUPS.items():
+        list_path = reverse('{}-list'.format(basename))
+        detail_path = reverse('{}-detail'.format(basename), kwargs={
+            'pk' if lookup == 'id' else lookup: LOOKUP_PLACEHOLDER,
+        }).replace(LOOKUP_PLACEHOLDER, '{}')
+        paths.update({
+            '{}-list'.format(basename): list_path,
+            '{}-create'.format(basename): list_path,
+            '{}-detail'.format(basename): detail_path,
+        })
+    return paths
+
+
+class Command(BaseCommand):
+    help = (
+        'Load a running server with a mix of reads and writes of all API '
+        'endpoints from many concurrent clients logged in through '
+        'api-auth/ and report requests per second and p{} latencies per '
+        'action. Persons created by the run are deleted afterwards. Save '
+        'the report with --output and compare a run with a saved one with '
+        '--compare to find regressions.'.format(
+            '/p'.join(str(percent) for percent in PERCENTILES)
+        )
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000',
+                            help='URL of the server (default '
+                                 'http://127.0.0.1:8000).')
+        parser.add_argument('--user', metavar='USERNAME:PASSWORD',
+                            required=True,
+                            help='Credentials of a user to log in.')
+        parser.add_argument('--requests', type=int, default=2000,
+                            help='Number of requests (default 2000).')
+        parser.add_argument('--concurrency', type=int, default=20,
+                            help='Number of concurrent clients '
+                                 '(default 20).')
+        parser.add_argument('--timeout', type=float, default=30,
+                            help='Timeout of a request in seconds '
+                                 '(default 30).')
+        parser.add_argument('--random-seed', type=int,
+                            help='Seed of the random mix of requests.')
+        parser.add_argument('--output', type=Path,
+                            help='Save the report to this JSON file.')
+        parser.add_argument('--compare', type=Path, metavar='BASELINE',
+                            help='Compare with the report of a previous '
+                                 'run saved with --output.')
+        parser.add_argument('--threshold', type=float, default=10,
+                            help='Percent by which rate may fall and p95, '
+                                 'p99 may grow before it is a regression '
+                                 '(default 10).')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('Requests and concurrency should be '
+                               'positive.')
+        baseline = None
+        if options['compare']:
+            baseline = json.loads(options['compare'].read_text())
+        username, _, password = options['user'].partition(':')
+        summary = asyncio.run(self.run(options, username, password))
+
+        for action, result in summary['actions'].items():
+            self.write_summary(action, result)
+        self.write_summary('total', summary['total'])
+        if options['output']:
+            options['output'].write_text(
+                json.dumps(summary, indent=2, sort_keys=True) + '\n'
+            )
+        if baseline is not None:
+            regressions = compare_summaries(baseline, summary,
+                                            options['threshold'] / 100)
+            for regression in regressions:
+                self.stdout.write('Regression: {}'.format(regression))
+            if regressions:
+                raise CommandError('{} regressions against {}.'.format(
+                    len(regressions), options['compare']
+                ))
+            self.stdout.write('No regressions against {}.'.format(
+                options['compare']
+            ))
+
+    async def run(self, options, username, password):
+        url, timeout = options['url'], options['timeout']
+        try:
+            cookies = await login(url, reverse('rest_framework:login'),
+                                  username, password, timeout)
+        except (OSError, asyncio.TimeoutError, ValueError) as exc:
+            raise CommandError('Cannot log in: {}'.format(exc))
+        headers = [('Accept', 'application/json'),
+                   ('X-CSRFToken', cookies.get('csrftoken', ''))]
+        paths = get_paths()
+        scenario = Scenario(
+            paths, await fetch_ids(url, paths, LOOKUPS, cookies),
+            ACTION_WEIGHTS, random.Random(options['random_seed']),
+        )
+        try:
+            results = await run_scenario(
+                url, scenario, options['requests'], options['concurrency'],
+                headers, timeout, cookies,
+            )
+        finally:
+            await delete_created(url, scenario, headers, cookies)
+        return summarize_results(results)
+
+    def write_summary(self, action, summary):
+        self.stdout.write(
+            '{action}: {requests} requests, {rate:.1f} requests/s, {latency}'
+            ', {errors} errors, statuses {statuses}'.format(
+                action=action, latency=', '.join(
+                    'p{} {:.1f} ms'.format(percent,
+                                           summary['p{}'.format(percent)])
+                    for percent in PERCENTILES
+                ), **summary
+            )
+        )
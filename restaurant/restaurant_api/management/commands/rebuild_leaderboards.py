@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from restaurant.restaurant_api.leaderboards import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild leaderboards of cuisines and countries from all '
+        'restaurants, e.g. after loaddata, which does not update them.'
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_leaderboards()
+        self.stdout.write('Rebuilt {} leaderboards.'.format(count))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from restaurant.restaurant_api.staffing import rebuild_staff_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Count employees of restaurants by position again, e.g. after '
+        'loaddata, which does not update the counters.'
+    )
+
+    def handle(self, *args, **options):
+        count = rebuild_staff_counts()
+        self.stdout.write('Rebuilt {} staff counts.'.format(count))
@@ -0,0 +1,247 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+from restaurant.db_pool.base import get_pool_stats
+
+from .cache import response_cache
+
+# Upper bounds of buckets of histograms of seconds and of bytes.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# Methods of serializers of views that represent and validate data.
+SERIALIZER_METHODS = ('to_representation', 'run_validation')
+
+
+def escape_label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace(
+        '\n', r'\n'
+    )
+
+
+def format_labels(names, values, extra=''):
+    labels = ','.join('{}="{}"'.format(name, escape_label(value))
+                      for name, value in zip(names, values))
+    if extra:
+        labels = '{},{}'.format(labels, extra) if labels else extra
+    return '{{{}}}'.format(labels) if labels else ''
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Metric of the text format of Prometheus with values by labels."""
+    kind = None
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values = {}
+
+    def render(self):
+        lines = ['# HELP {} {}'.format(self.name, self.description),
+                 '# TYPE {} {}'.format(self.name, self.kind)]
+        for labels, value in sorted(self.values.items()):
+            lines.extend(self.render_value(labels, value))
+        return lines
+
+    def render_value(self, labels, value):
+        return ['{}{} {}'.format(self.name,
+                                 format_labels(self.labels, labels),
+                                 format_value(value))]
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+
+class Histogram(Metric):
+    """Histogram, values are counts of buckets, count and sum."""
+    kind = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=()):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels, amount):
+        value = self.values.get(labels)
+        if value is None:
+            value = self.values[labels] = [0] * (len(self.buckets) + 2)
+        value[bisect_left(self.buckets, amount)] += 1
+        value[-1] += amount
+
+    def render_value(self, labels, value):
+        lines = []
+        count = 0
+        for bound, bucket in zip(self.buckets + ('+Inf',), value):
+            count += bucket
+            bucket_labels = format_labels(self.labels, labels,
+                                          'le="{}"'.format(bound))
+            lines.append('{}_bucket{} {}'.format(self.name, bucket_labels,
+                                                 count))
+        for suffix, total in (('_sum', format_value(value[-1])),
+                              ('_count', count)):
+            lines.append('{}{}{} {}'.format(
+                self.name, suffix, format_labels(self.labels, labels), total
+            ))
+        return lines
+
+
+class RequestMetrics:
+    """Serializer time of a request, counted by views."""
+    __slots__ = ('serializer_duration',)
+
+    def __init__(self):
+        self.serializer_duration = 0
+
+    @contextmanager
+    def serializing(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.serializer_duration += time.perf_counter() - started
+
+
+def get_request_metrics(request):
+    """Get metrics of Django or REST framework request if measured."""
+    return getattr(getattr(request, '_request', request), '_metrics', None)
+
+
+class ApiMetrics:
+    """
+    Metrics of requests to views of this process by view and action:
+    latency, queries and their time, serializer time, size of responses
+    and error responses.
+    """
+    labels = ('view', 'action')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.durations = Histogram(
+            'api_request_duration_seconds', 'Time to respond to requests.',
+            self.labels, DURATION_BUCKETS,
+        )
+        self.queries = Counter('api_db_queries_total',
+                               'Database queries made by requests.',
+                               self.labels)
+        self.db_durations = Counter(
+            'api_db_duration_seconds_total',
+            'Time of database queries made by requests.', self.labels,
+        )
+        self.serializer_durations = Counter(
+            'api_serializer_duration_seconds_total',
+            'Time spent in serializers of requests.', self.labels,
+        )
+        self.sizes = Histogram(
+            'api_response_size_bytes', 'Size of response bodies.',
+            self.labels, SIZE_BUCKETS,
+        )
+        self.errors = Counter('api_errors_total',
+                              'Responses with 4xx and 5xx statuses.',
+                              self.labels + ('status',))
+        self.metrics = (self.durations, self.queries, self.db_durations,
+                        self.serializer_durations, self.sizes, self.errors)
+
+    def observe(self, labels, status, duration, size=None, query_tracker=None,
+                serializer_duration=0):
+        with self.lock:
+            self.durations.observe(labels, duration)
+            if query_tracker is not None:
+                self.queries.inc(labels, query_tracker.count)
+                self.db_durations.inc(labels, query_tracker.duration)
+            self.serializer_durations.inc(labels, serializer_duration)
+            if size is not None:
+                self.sizes.observe(labels, size)
+            if status >= 400:
+                self.errors.inc(labels + (status,))
+
+    def render(self):
+        """Get metrics in the text format of Prometheus."""
+        with self.lock:
+            lines = [line for metric in self.metrics
+                     for line in metric.render()]
+        for metric in get_process_metrics():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def get_process_metrics():
+    """Get metrics of the response cache and database pools."""
+    hits = Counter('api_cache_hits_total', 'Hits of the response cache.',
+                   ('namespace',))
+    misses = Counter('api_cache_misses_total',
+                     'Misses of the response cache.', ('namespace',))
+    for namespace, stats in response_cache.stats().items():
+        hits.inc((namespace,), stats['hits'])
+        misses.inc((namespace,), stats['misses'])
+
+    pool_metrics = {
+        'size': Gauge('db_pool_size', 'Connections of the pool.',
+                      ('alias',)),
+        'in_use': Gauge('db_pool_in_use', 'Checked out connections.',
+                        ('alias',)),
+        'waits': Counter('db_pool_waits_total',
+                         'Checkouts that waited for a connection.',
+                         ('alias',)),
+        'wait_time': Counter('db_pool_wait_seconds_total',
+                             'Time waited for connections.', ('alias',)),
+        'timeouts': Counter('db_pool_timeouts_total',
+                            'Checkouts that timed out.', ('alias',)),
+    }
+    for alias, stats in get_pool_stats().items():
+        for name, metric in pool_metrics.items():
+            metric.values[(alias,)] = stats[name]
+    return (hits, misses) + tuple(pool_metrics.values())
+
+
+api_metrics = ApiMetrics()
+
+
+class SerializerMetricsMixin:
+    """
+    Count time spent in serializers of the view, validation and
+    representation, in metrics of the request.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        return self.measure_serializer(
+            super().get_serializer(*args, **kwargs)
+        )
+
+    def measure_serializer(self, serializer):
+        request_metrics = get_request_metrics(self.request)
+        if request_metrics is None:
+            return serializer
+        for name in SERIALIZER_METHODS:
+            method = getattr(serializer, name)
+            setattr(serializer, name, wraps(method)(
+                self.get_measured(method, request_metrics)
+            ))
+        return serializer
+
+    @staticmethod
+    def get_measured(method, request_metrics):
+        def measured(*args, **kwargs):
+            with request_metrics.serializing():
+                return method(*args, **kwargs)
+        return measured
+
+    def serializing(self):
+        """Get context manager counting the block as serializer time."""
+        request_metrics = get_request_metrics(self.request)
+        if request_metrics is None:
+            return nullcontext()
+        return request_metrics.serializing()
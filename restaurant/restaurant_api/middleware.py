@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestMetrics, api_metrics
+from .profiling import (ProfileLimiter, StackSampler, get_profile_name,
+                        save_profile)
+
+logger = logging.getLogger(__name__)
+
+# Literals and lists of placeholders, which differ between queries of the
+# same shape.
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+LIST_RE = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+
+
+class QueryBudgetExceeded(Exception):
+    """Request made more queries than its budget or repeated a query."""
+
+
+def get_query_shape(sql):
+    """Get SQL with literals and lists of parameters replaced."""
+    return LIST_RE.sub('(...)', LITERAL_RE.sub('?', sql))
+
+
+class QueryTracker:
+    """
+    Execute wrapper that counts queries and their shapes.
+
+    Queries of the same shape executed many times are a sign of N+1
+    pattern: a query per object where a query per list would do.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.shapes[get_query_shape(sql)] += 1
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+
+    def get_problems(self, budget=None, max_repeated=None):
+        """Get descriptions of exceeded budget and repeated queries."""
+        if max_repeated is None:
+            max_repeated = settings.QUERY_BUDGET_MAX_REPEATED
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append('{} queries made, budget is {}'.format(
+                self.count, budget
+            ))
+        problems.extend(
+            'query repeated {} times: {}'.format(count, shape)
+            for shape, count in self.shapes.most_common()
+            if count > max_repeated
+        )
+        return problems
+
+
+@contextmanager
+def track_queries():
+    """Track queries to all databases made in the block."""
+    tracker = QueryTracker()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(tracker))
+        yield tracker
+
+
+@contextmanager
+def assert_query_budget(budget=None, max_repeated=None):
+    """
+    Raise QueryBudgetExceeded when the block exceeds the budget of queries
+    or repeats a query more than max_repeated times.
+    """
+    with track_queries() as tracker:
+        yield tracker
+    problems = tracker.get_problems(budget, max_repeated)
+    if problems:
+        raise QueryBudgetExceeded('; '.join(problems))
+
+
+class QueryBudgetMiddleware:
+    """
+    Check queries of every request against the budget of its view action.
+
+    Views declare budgets in query_budgets, a dict of action (or method
+    for views without actions) to the maximal number of queries, including
+    queries of authentication. Requests of every action are checked for
+    repeated queries, actions with None budget are not checked at all.
+    Problems are logged, or raised when QUERY_BUDGET_RAISE is set. Queries
+    of streaming responses are made after the check and are not counted.
+    Under ASGI queries are reported only for offloaded views under /async/,
+    sync views run in another thread there.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Mark the instance as a coroutine function for the handler.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        with track_queries() as tracker:
+            response = self.get_response(request)
+        request._query_tracker = tracker
+        self.check_queries(request, tracker)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        # Offloaded views track queries in the thread that makes them.
+        tracker = getattr(request, '_query_tracker', None)
+        if tracker is not None:
+            self.check_queries(request, tracker)
+        return response
+
+    def check_queries(self, request, tracker):
+        view = getattr(request, '_query_budget_view', None)
+        if view is None:
+            return
+        label, budgets, action = view
+        if action in budgets and budgets[action] is None:
+            return
+        problems = tracker.get_problems(budgets.get(action))
+        if problems:
+            message = '{} {}: {}'.format(label, action, '; '.join(problems))
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is None:
+            return None
+        actions = getattr(view_func, 'actions', None) or {}
+        method = request.method.lower()
+        request._query_budget_view = (
+            view_class.__name__,
+            getattr(view_class, 'query_budgets', {}),
+            actions.get(method, method),
+        )
+        return None
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests of staff users that ask for it with PROFILING_HEADER
+    header or PROFILING_QUERY_PARAM parameter.
+
+    Stacks of the thread of the request are sampled through views,
+    serializers, queries and rendering, the call tree and folded stacks for
+    flame graphs are saved to PROFILING_DIR and the name of the profile is
+    returned in X-Profile-Id header. Only PROFILING_SAMPLE_RATE share of
+    such requests and at most PROFILING_MAX_PER_MINUTE of them per process
+    are profiled, so the middleware can stay enabled in production. Under
+    ASGI all threads of the process are sampled.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limiter = ProfileLimiter(settings.PROFILING_MAX_PER_MINUTE)
+        if asyncio.iscoroutinefunction(get_response):
+            # Mark the instance as a coroutine function for the handler.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        if not self.should_profile(request):
+            return self.get_response(request)
+        with self.get_sampler(threading.get_ident()) as sampler:
+            response = self.get_response(request)
+        self.save(request, response, sampler)
+        return response
+
+    async def __acall__(self, request):
+        # The lazy user of the request is loaded with queries.
+        if not (self.is_asked(request)
+                and await sync_to_async(self.should_profile)(request)):
+            return await self.get_response(request)
+        with self.get_sampler() as sampler:
+            response = await self.get_response(request)
+        await sync_to_async(self.save)(request, response, sampler)
+        return response
+
+    @staticmethod
+    def is_asked(request):
+        return bool(request.headers.get(settings.PROFILING_HEADER)
+                    or request.GET.get(settings.PROFILING_QUERY_PARAM))
+
+    def should_profile(self, request):
+        if not self.is_asked(request):
+            return False
+        user = getattr(request, 'user', None)
+        return (
+            user is not None and user.is_staff
+            and random.random() < settings.PROFILING_SAMPLE_RATE
+            and self.limiter.acquire()
+        )
+
+    @staticmethod
+    def get_sampler(thread_id=None):
+        return StackSampler(thread_id, settings.PROFILING_INTERVAL,
+                            settings.PROFILING_MAX_SECONDS)
+
+    @staticmethod
+    def save(request, response, sampler):
+        name = get_profile_name(request.method, request.path)
+        title = '{} {} {}'.format(request.method, request.get_full_path(),
+                                  response.status_code)
+        try:
+            save_profile(settings.PROFILING_DIR, name, sampler, title,
+                         settings.PROFILING_KEEP)
+        except OSError as exc:
+            logger.warning('Cannot save profile %s: %s', name, exc)
+            return
+        response['X-Profile-Id'] = name
+
+
+class MetricsMiddleware:
+    """
+    Record latency, queries, serializer time, response size and errors of
+    every request in metrics of its view and action.
+
+    Queries are taken from the tracker of QueryBudgetMiddleware, which
+    should come after this middleware, serializer time is counted by
+    viewsets with SerializerMetricsMixin. Streaming responses are recorded
+    when they start, without size and the work done while streaming.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Mark the instance as a coroutine function for the handler.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        request._metrics = RequestMetrics()
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        request._metrics = RequestMetrics()
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - started)
+        return response
+
+    @staticmethod
+    def observe(request, response, duration):
+        view = getattr(request, '_query_budget_view', None)
+        size = None
+        if not response.streaming:
+            size = len(response.content)
+        api_metrics.observe(
+            (view[0], view[2]) if view is not None else ('', ''),
+            response.status_code, duration, size,
+            getattr(request, '_query_tracker', None),
+            request._metrics.serializer_duration,
+        )
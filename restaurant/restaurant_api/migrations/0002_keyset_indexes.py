@@ -0,0 +1,22 @@
+# flake8: noqa
+# Generated by Django 3.1.14 on 2026-10-18 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['country', 'id'], name='address_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['surname', 'firstname', 'id'], name='person_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# flake8: noqa
+# Generated by Django 3.1.14 on 2026-10-18 04:32
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import translation
+
+# Copies of the constants and the builder of the models at the time of this
+# migration, later changes of the models must not change what it fills.
+BATCH_SIZE = 1000
+FULL_ADDRESS_COLUMNS = ('full_address_text', 'full_address_translations')
+
+
+def build_full_address(address):
+    return ' '.join((address.country.name, address.province, address.city,
+                     address.street, address.house, address.zip_code or ''))
+
+
+def set_full_address(address):
+    with translation.override(settings.LANGUAGE_CODE):
+        address.full_address_text = build_full_address(address)
+    translations = {}
+    for language, name in settings.LANGUAGES:
+        with translation.override(language):
+            translations[language] = build_full_address(address)
+    address.full_address_translations = translations
+
+
+def fill_full_addresses(apps, schema_editor):
+    Address = apps.get_model('restaurant_api', 'Address')
+    batch = []
+    for address in Address.objects.order_by('pk').iterator(
+            chunk_size=BATCH_SIZE):
+        set_full_address(address)
+        batch.append(address)
+        if len(batch) == BATCH_SIZE:
+            Address.objects.bulk_update(batch, FULL_ADDRESS_COLUMNS)
+            batch = []
+    if batch:
+        Address.objects.bulk_update(batch, FULL_ADDRESS_COLUMNS)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant_api', '0003_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='full_address_text',
+            field=models.TextField(db_index=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='full_address_translations',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+        migrations.RunPython(fill_full_addresses,
+                             migrations.RunPython.noop),
+    ]
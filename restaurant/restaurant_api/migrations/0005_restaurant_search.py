@@ -0,0 +1,86 @@
+# flake8: noqa
+# Generated by Django 3.1.14 on 2026-10-18 06:20
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# The search vector of a restaurant is built from its name, cuisine and the
+# city, province and street of its address by the trigger of restaurants,
+# changes of addresses touch their restaurants to rebuild it.
+CREATE_SEARCH_SQL = """
+CREATE FUNCTION restaurant_api_restaurant_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.cuisine, '')), 'B') ||
+        coalesce((
+            SELECT setweight(to_tsvector('simple', concat_ws(
+                ' ', address.city, address.province, address.street
+            )), 'C')
+            FROM restaurant_api_address address
+            WHERE address.id = NEW.address_id
+        ), '');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER restaurant_api_restaurant_search_vector
+    BEFORE INSERT OR UPDATE OF name, cuisine, address_id
+    ON restaurant_api_restaurant
+    FOR EACH ROW EXECUTE PROCEDURE restaurant_api_restaurant_search_vector();
+
+CREATE FUNCTION restaurant_api_address_search_vector() RETURNS trigger AS $$
+BEGIN
+    UPDATE restaurant_api_restaurant SET address_id = address_id
+    WHERE address_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER restaurant_api_address_search_vector
+    AFTER UPDATE OF city, province, street ON restaurant_api_address
+    FOR EACH ROW
+    WHEN (OLD.city IS DISTINCT FROM NEW.city
+          OR OLD.province IS DISTINCT FROM NEW.province
+          OR OLD.street IS DISTINCT FROM NEW.street)
+    EXECUTE PROCEDURE restaurant_api_address_search_vector();
+
+UPDATE restaurant_api_restaurant SET address_id = address_id;
+
+CREATE INDEX restaurant_search_vector_idx ON restaurant_api_restaurant
+    USING gin (search_vector);
+"""
+
+DROP_SEARCH_SQL = """
+DROP INDEX IF EXISTS restaurant_search_vector_idx;
+DROP TRIGGER IF EXISTS restaurant_api_address_search_vector
+    ON restaurant_api_address;
+DROP FUNCTION IF EXISTS restaurant_api_address_search_vector();
+DROP TRIGGER IF EXISTS restaurant_api_restaurant_search_vector
+    ON restaurant_api_restaurant;
+DROP FUNCTION IF EXISTS restaurant_api_restaurant_search_vector();
+"""
+
+
+def run_on_postgresql(sql):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant_api', '0004_full_address'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(run_on_postgresql(CREATE_SEARCH_SQL),
+                             run_on_postgresql(DROP_SEARCH_SQL)),
+    ]
@@ -0,0 +1,34 @@
+# flake8: noqa
+# Generated by Django 3.1.14 on 2026-10-18 04:53
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant_api', '0005_restaurant_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='geo_cell',
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-90), django.core.validators.MaxValueValidator(90)]),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(-180), django.core.validators.MaxValueValidator(180)]),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['geo_cell'], name='address_geo_cell_idx'),
+        ),
+    ]
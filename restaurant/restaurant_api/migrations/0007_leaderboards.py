@@ -0,0 +1,64 @@
+# flake8: noqa
+# Generated by Django 3.1.14 on 2026-10-18 04:57
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# Copies of the constants of leaderboards at the time of this migration.
+BATCH_SIZE = 1000
+LEADERBOARD_SIZE = 20
+
+
+def fill_leaderboards(apps, schema_editor):
+    Restaurant = apps.get_model('restaurant_api', 'Restaurant')
+    Leaderboard = apps.get_model('restaurant_api', 'Leaderboard')
+    rows = Restaurant.objects.filter(rating__isnull=False).order_by(
+        '-rating', 'name'
+    ).values_list('id', 'name', 'rating', 'cuisine', 'address__country')
+    boards = defaultdict(list)
+    for pk, name, rating, cuisine, country in rows.iterator():
+        cuisine, country = cuisine or '', country or ''
+        keys = set()
+        if cuisine:
+            keys.add((cuisine, ''))
+        if country:
+            keys.add(('', country))
+        if cuisine and country:
+            keys.add((cuisine, country))
+        for key in keys:
+            if len(boards[key]) < LEADERBOARD_SIZE:
+                boards[key].append({'id': pk, 'name': name, 'rating': rating})
+    Leaderboard.objects.bulk_create((
+        Leaderboard(cuisine=cuisine, country=country, entries=entries)
+        for (cuisine, country), entries in boards.items()
+    ), batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant_api', '0006_address_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Leaderboard',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cuisine', models.TextField(blank=True, default='')),
+                ('country', models.CharField(blank=True, default='', max_length=2)),
+                ('entries', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['cuisine', '-rating', 'name'], name='restaurant_cuisine_rating_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboard',
+            constraint=models.UniqueConstraint(fields=('cuisine', 'country'), name='leaderboard_key'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
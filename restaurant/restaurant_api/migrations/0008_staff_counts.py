@@ -0,0 +1,45 @@
+# flake8: noqa
+# Generated by Django 3.1.14 on 2026-10-18 05:01
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count
+
+# Copy of the batch size of bulk writes at the time of this migration.
+BATCH_SIZE = 1000
+
+
+def fill_staff_counts(apps, schema_editor):
+    Employee = apps.get_model('restaurant_api', 'Employee')
+    StaffCount = apps.get_model('restaurant_api', 'StaffCount')
+    rows = Employee.objects.order_by().values(
+        'restaurant_id', 'position'
+    ).annotate(count=Count('id'))
+    StaffCount.objects.bulk_create(
+        (StaffCount(**row) for row in rows.iterator()),
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant_api', '0007_leaderboards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaffCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.IntegerField(choices=[(1, 'Director'), (2, 'Manager'), (3, 'Cook'), (4, 'Waiter')])),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('restaurant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='staff_counts', to='restaurant_api.restaurant')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='staffcount',
+            constraint=models.UniqueConstraint(fields=('restaurant', 'position'), name='staff_count_key'),
+        ),
+        migrations.RunPython(fill_staff_counts, migrations.RunPython.noop),
+    ]
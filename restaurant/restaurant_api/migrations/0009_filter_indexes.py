@@ -0,0 +1,34 @@
+# flake8: noqa
+# Generated by Django 3.1.14 on 2026-10-18 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('restaurant_api', '0008_staff_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['position', 'id'], name='employee_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['restaurant', 'position'], name='employee_rest_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['surname'], name='person_surname_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['date_of_birth'], name='person_date_of_birth_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['rating', 'name'], name='restaurant_rating_idx'),
+        ),
+    ]
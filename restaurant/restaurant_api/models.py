@@ -1,7 +1,14 @@
-from django.core.validators import RegexValidator
+from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+from django.core.validators import (MaxValueValidator, MinValueValidator,
+                                    RegexValidator)
 from django.db import models
+from django.utils import translation
 from django_countries.fields import CountryField
 
+from .constants import BULK_BATCH_SIZE
+from .geo import get_geo_cell
+
 phone_regex = RegexValidator(
     regex=r'^\+?\d?\d{9,15}$',
     message="Phone number must be entered in the format: '+999999999'. Up to "
@@ -9,6 +16,14 @@ phone_regex = RegexValidator(
 )
 
 
+# Order of persons by name, employees of restaurants are shown in it.
+PERSON_NAME_ORDERING = ('surname', 'firstname', 'id')
+
+
+def get_person_name(surname, firstname):
+    return ' '.join((surname, firstname))
+
+
 class Person(models.Model):
     """Person."""
     firstname = models.CharField(max_length=100)
@@ -21,14 +36,135 @@ class Person(models.Model):
     phone = models.CharField(max_length=17, validators=[phone_regex],
                              verbose_name='Contact phone number',
                              null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def person_name(self):
-        return ' '.join((self.surname, self.firstname))
+        return get_person_name(self.surname, self.firstname)
 
     def __str__(self):
         return self.person_name
 
+    class Meta:
+        indexes = [
+            # Keyset pagination reads persons in this order.
+            models.Index(fields=list(PERSON_NAME_ORDERING),
+                         name='person_keyset_idx'),
+            # Filters of persons: by prefix of surname, which needs the
+            # pattern operator class on PostgreSQL, and by birth date.
+            models.Index(fields=['surname'], opclasses=['varchar_pattern_ops'],
+                         name='person_surname_prefix_idx'),
+            models.Index(fields=['date_of_birth'],
+                         name='person_date_of_birth_idx'),
+        ]
+
+
+# Fields of address the full address is built from.
+FULL_ADDRESS_FIELDS = ('country', 'province', 'city', 'street', 'house',
+                       'zip_code')
+# Fields that hold the materialized full address.
+FULL_ADDRESS_COLUMNS = ('full_address_text', 'full_address_translations')
+
+
+def build_full_address(address):
+    """Build full address of address in the active language."""
+    return ' '.join((address.country.name, address.province, address.city,
+                     address.street, address.house, address.zip_code or ''))
+
+
+def get_stored_full_address(translations):
+    """Get stored full address in the active language or None."""
+    language = translation.get_language()
+    if language:
+        for code in (language, language.split('-')[0]):
+            if code in translations:
+                return translations[code]
+    return None
+
+
+def set_full_address(address):
+    """Set materialized full addresses of address from its fields."""
+    with translation.override(settings.LANGUAGE_CODE):
+        address.full_address_text = build_full_address(address)
+    translations = {}
+    for language, name in settings.LANGUAGES:
+        with translation.override(language):
+            translations[language] = build_full_address(address)
+    address.full_address_translations = translations
+
+
+def set_geo_cell(address):
+    """Set grid cell of address from its coordinates."""
+    address.geo_cell = get_geo_cell(address.latitude, address.longitude)
+
+
+# Fields of address, columns derived from them and functions setting them.
+DERIVED_ADDRESS_COLUMNS = (
+    (FULL_ADDRESS_FIELDS, FULL_ADDRESS_COLUMNS, set_full_address),
+    (('latitude', 'longitude'), ('geo_cell',), set_geo_cell),
+)
+
+
+def get_derived_address_columns(fields=None):
+    """
+    Get columns derived from any of fields, or from all fields when fields
+    is None, and the functions setting them.
+    """
+    columns = set()
+    setters = []
+    for sources, derived, setter in DERIVED_ADDRESS_COLUMNS:
+        if fields is None or set(fields).intersection(sources):
+            columns.update(derived)
+            setters.append(setter)
+    return columns, setters
+
+
+def set_derived_address_columns(address, setters=None):
+    """Set columns of address derived from its fields."""
+    if setters is None:
+        setters = get_derived_address_columns()[1]
+    for setter in setters:
+        setter(address)
+
+
+class AddressQuerySet(models.QuerySet):
+    """
+    Queryset that keeps full addresses and geo cells of bulk written rows
+    in sync.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            set_derived_address_columns(obj)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        columns, setters = get_derived_address_columns(fields)
+        if setters:
+            objs = list(objs)
+            for obj in objs:
+                set_derived_address_columns(obj, setters)
+            fields = set(fields).union(columns)
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def update(self, **kwargs):
+        columns, setters = get_derived_address_columns(kwargs)
+        if not setters:
+            return super().update(**kwargs)
+        pks = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        for start in range(0, len(pks), BULK_BATCH_SIZE):
+            objs = list(self.model.objects.filter(
+                pk__in=pks[start:start + BULK_BATCH_SIZE]
+            ))
+            for obj in objs:
+                set_derived_address_columns(obj, setters)
+            self.model.objects.bulk_update(objs, columns)
+        return rows
+
+    update.alters_data = True
+
 
 class Address(models.Model):
     """Person."""
@@ -38,15 +174,57 @@ class Address(models.Model):
     street = models.TextField()
     house = models.CharField(max_length=50)
     zip_code = models.CharField(max_length=5, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Full address in the default language and in every language of the
+    # site, built from the fields above on every write.
+    full_address_text = models.TextField(editable=False, db_index=True,
+                                         default='')
+    full_address_translations = models.JSONField(editable=False,
+                                                 default=dict)
+    latitude = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True, blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+    # Cell of the grid of geo module the coordinates are in.
+    geo_cell = models.BigIntegerField(null=True, editable=False)
+
+    objects = AddressQuerySet.as_manager()
 
     @property
     def full_address(self):
-        return ' '.join((self.country.name, self.province, self.city,
-                         self.street, self.house, self.zip_code or ''))
+        full_address = get_stored_full_address(
+            self.full_address_translations
+        )
+        if full_address is None:
+            return build_full_address(self)
+        return full_address
 
     def __str__(self):
         return self.full_address
 
+    def save(self, *args, update_fields=None, **kwargs):
+        columns, setters = get_derived_address_columns(update_fields)
+        if update_fields is not None:
+            if not setters:
+                return super().save(*args, update_fields=update_fields,
+                                    **kwargs)
+            update_fields = set(update_fields).union(columns)
+        set_derived_address_columns(self, setters)
+        return super().save(*args, update_fields=update_fields, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination reads addresses in this order.
+            models.Index(fields=['country', 'id'],
+                         name='address_keyset_idx'),
+            # Nearby addresses are read by ranges of cells.
+            models.Index(fields=['geo_cell'], name='address_geo_cell_idx'),
+        ]
+
 
 class Restaurant(models.Model):
     """Restaurant."""
@@ -65,10 +243,24 @@ class Restaurant(models.Model):
     cuisine = models.TextField(null=True, blank=True)
     rating = models.PositiveSmallIntegerField(null=True, blank=True)
     employees = models.ManyToManyField(Person, through='Employee')
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by triggers on PostgreSQL from name, cuisine and address.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.name
 
+    class Meta:
+        indexes = [
+            # Leaderboards of cuisines are rebuilt in this order.
+            # It also backs filters by cuisine with or without ratings.
+            models.Index(fields=['cuisine', '-rating', 'name'],
+                         name='restaurant_cuisine_rating_idx'),
+            # Filter by ratings, lists are ordered by names.
+            models.Index(fields=['rating', 'name'],
+                         name='restaurant_rating_idx'),
+        ]
+
 
 class Positions(models.IntegerChoices):
     """PositionsEnumerates."""
@@ -87,6 +279,7 @@ class Employee(models.Model):
     person = models.ForeignKey(Person, verbose_name='related person',
                                on_delete=models.CASCADE)
     position = models.IntegerField(choices=Positions.choices)
+    updated_at = models.DateTimeField(auto_now=True)
 
     @property
     def position_name(self):
@@ -104,3 +297,43 @@ class Employee(models.Model):
         # what one person can hold only one position in one restaurant in
         # one time and when can be deleted unique_together option.
         unique_together = ('restaurant', 'person')
+        indexes = [
+            # Filters by position alone and with restaurant, lists are
+            # ordered by id. Filters by person use its foreign key index.
+            models.Index(fields=['position', 'id'],
+                         name='employee_position_idx'),
+            models.Index(fields=['restaurant', 'position'],
+                         name='employee_rest_position_idx'),
+        ]
+
+
+class StaffCount(models.Model):
+    """Number of employees of a restaurant in a position."""
+    restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE,
+                                   related_name='staff_counts')
+    position = models.IntegerField(choices=Positions.choices)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['restaurant', 'position'],
+                                    name='staff_count_key'),
+        ]
+
+
+class Leaderboard(models.Model):
+    """
+    Top rated restaurants of a cuisine, of a country or of a cuisine in a
+    country, the other part of the key is empty.
+    """
+    cuisine = models.TextField(blank=True, default='')
+    country = models.CharField(max_length=2, blank=True, default='')
+    # Restaurants with id, name and rating, the best first.
+    entries = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cuisine', 'country'],
+                                    name='leaderboard_key'),
+        ]
@@ -0,0 +1,254 @@
+import json
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple('Cursor', ['reverse', 'position'])
+
+
+def reverse_ordering(ordering):
+    """Get ordering with every direction flipped."""
+    return tuple(
+        name[1:] if name.startswith('-') else '-' + name for name in ordering
+    )
+
+
+def get_keyset_filter(ordering, position, reverse=False):
+    """
+    Get filter for rows that follow the position in the ordering.
+
+    The comparison of the whole ordering tuple is expanded into a chain of
+    conditions, the bound on the first field is repeated on its own so the
+    database can start an index range scan right from the position.
+    """
+    following = Q()
+    equal = Q()
+    for name, value in zip(ordering, position):
+        attr = name.lstrip('-')
+        descending = name.startswith('-') != reverse
+        lookup = '__lt' if descending else '__gt'
+        following |= equal & Q(**{attr + lookup: value})
+        equal &= Q(**{attr: value})
+
+    first = ordering[0]
+    lookup = '__lte' if first.startswith('-') != reverse else '__gte'
+    return Q(**{first.lstrip('-') + lookup: position[0]}) & following
+
+
+def get_unique_ordering(queryset):
+    """Get ordering of queryset completed up to an unique field."""
+    model = queryset.model
+    ordering = list(queryset.query.order_by or model._meta.ordering)
+    assert all(
+        isinstance(name, str) and '__' not in name and name != '?'
+        for name in ordering
+    ), (
+        'Keyset pagination supports ordering only by fields of the model '
+        'or annotations, but got {ordering}.'.format(ordering=ordering)
+    )
+    if not ordering or not _is_unique(model, ordering[-1]):
+        ordering.append('pk')
+    return tuple(ordering)
+
+
+def get_ordering_fields(queryset, ordering):
+    """Get model fields or output fields of annotations of the ordering."""
+    model = queryset.model
+    fields = []
+    for name in ordering:
+        name = name.lstrip('-')
+        if name in queryset.query.annotations:
+            fields.append(queryset.query.annotations[name].output_field)
+        elif name == 'pk':
+            fields.append(model._meta.pk)
+        else:
+            fields.append(model._meta.get_field(name))
+    return fields
+
+
+def parse_position_value(field, value):
+    """
+    Get value of the ordering field from a decoded cursor, raise
+    ValueError or ValidationError if it does not fit the field.
+    """
+    if (not isinstance(value, (str, int, float))
+            or isinstance(value, float) and not math.isfinite(value)):
+        raise ValueError('Invalid position value: {!r}.'.format(value))
+    return field.to_python(value)
+
+
+def _is_unique(model, name):
+    name = name.lstrip('-')
+    if name == 'pk':
+        return True
+    try:
+        return model._meta.get_field(name).unique
+    except FieldDoesNotExist:
+        return False
+
+
+def iter_keyset_chunks(queryset, chunk_size):
+    """
+    Iterate over queryset by chunks read with keyset filters.
+
+    Every chunk is a separate query, so related objects are fetched and
+    prefetched per chunk and only one chunk is kept in memory.
+    """
+    ordering = get_unique_ordering(queryset)
+    queryset = queryset.order_by(*ordering)
+    chunk = list(queryset[:chunk_size])
+    while chunk:
+        yield chunk
+        if len(chunk) < chunk_size:
+            break
+        position = get_position(chunk[-1], ordering)
+        chunk = list(
+            queryset.filter(get_keyset_filter(ordering, position))[
+                :chunk_size
+            ]
+        )
+
+
+def get_position(instance, ordering):
+    """Get database values of the ordering fields of instance or row."""
+    if isinstance(instance, Mapping):
+        return [instance[name.lstrip('-')] for name in ordering]
+
+    position = []
+    for name in ordering:
+        attr = name.lstrip('-')
+        if attr == 'pk':
+            position.append(instance.pk)
+            continue
+        try:
+            field = instance._meta.get_field(attr)
+        except FieldDoesNotExist:
+            position.append(getattr(instance, attr))
+        else:
+            position.append(
+                field.get_prep_value(getattr(instance, field.attname))
+            )
+    return position
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination by the whole ordering of the view's queryset.
+
+    Unlike the cursor pagination of rest framework, which filters by the
+    first ordering field and skips the rest with an offset, the cursor
+    keeps the values of all ordering fields. Every page is a single range
+    read over the index of the ordering, so page N costs as much as page 1.
+    Ordering is completed with the primary key if its last field is not
+    unique, ordering fields should not be nullable.
+    """
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return settings.API_MAX_PAGE_SIZE
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.ordering_fields = get_ordering_fields(queryset, self.ordering)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        if reverse:
+            queryset = queryset.order_by(*reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(get_keyset_filter(
+                self.ordering, self.cursor.position, reverse
+            ))
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = self.cursor is not None
+
+        if self.page:
+            self.previous_position = get_position(self.page[0],
+                                                  self.ordering)
+            self.next_position = get_position(self.page[-1], self.ordering)
+        else:
+            self.previous_position = self.next_position = (
+                self.cursor and self.cursor.position
+            )
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(reverse=False,
+                                         position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(reverse=True,
+                                         position=self.previous_position))
+
+    def get_ordering(self, request, queryset, view):
+        return get_unique_ordering(queryset)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position = tokens['p']
+            reverse = bool(tokens.get('r', False))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if (not isinstance(position, list)
+                or len(position) != len(self.ordering)):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                parse_position_value(field, value)
+                for field, value in zip(self.ordering_fields, position)
+            ]
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {'p': cursor.position}
+        if cursor.reverse:
+            tokens['r'] = 1
+
+        querystring = json.dumps(tokens, cls=DjangoJSONEncoder,
+                                 separators=(',', ':'))
+        encoded = urlsafe_b64encode(querystring.encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   encoded)
@@ -0,0 +1,210 @@
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+
+# Frames of the call tree below this share of samples are left out.
+TREE_MIN_SHARE = 0.005
+# Extensions of files of a profile: call tree and folded stacks, the input
+# of flamegraph.pl, inferno and speedscope.
+CALL_TREE_SUFFIX = '.txt'
+FOLDED_SUFFIX = '.folded'
+SLUG_RE = re.compile(r'[^A-Za-z0-9]+')
+# Names of functions by code objects.
+frame_names = {}
+
+
+def get_frame_name(code, prefixes):
+    """Get name of the function of code with its file relative to sys.path."""
+    name = frame_names.get(code)
+    if name is None:
+        filename = code.co_filename
+        for prefix in prefixes:
+            if filename.startswith(prefix):
+                filename = filename[len(prefix):].lstrip(os.sep)
+                break
+        name = frame_names[code] = '{}:{}'.format(filename, code.co_name)
+    return name
+
+
+class StackSampler:
+    """
+    Sampling profiler of a thread.
+
+    A background thread takes the stack of the profiled thread every
+    interval seconds and counts identical stacks, for at most max_duration
+    seconds. Without thread_id all other threads are sampled and stacks
+    start with names of threads. Unlike a tracing profiler it does not
+    slow down the profiled code, only takes the GIL for each sample.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005, max_duration=30):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_duration = max_duration
+        self.stacks = Counter()
+        self.duration = 0
+        self.prefixes = sorted(
+            (path for path in sys.path if path), key=len, reverse=True
+        )
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def run(self):
+        own_id = threading.get_ident()
+        deadline = time.perf_counter() + self.max_duration
+        while not self._stopped.wait(self.interval):
+            if time.perf_counter() > deadline:
+                break
+            frames = sys._current_frames()
+            if self.thread_id is not None:
+                frame = frames.get(self.thread_id)
+                if frame is not None:
+                    self.stacks[self.get_stack(frame)] += 1
+                continue
+            names = {thread.ident: thread.name
+                     for thread in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id != own_id:
+                    self.stacks[(names.get(thread_id, str(thread_id)),)
+                                + self.get_stack(frame)] += 1
+
+    def get_stack(self, frame):
+        """Get names of functions of frame and its callers, outermost first."""
+        stack = []
+        while frame is not None:
+            stack.append(get_frame_name(frame.f_code, self.prefixes))
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+
+class ProfileLimiter:
+    """
+    Limiter of profiles to at most max_count in every period seconds, to
+    cap the overhead of profiling of a process.
+    """
+
+    def __init__(self, max_count, period=60, clock=time.monotonic):
+        self.max_count = max_count
+        self.period = period
+        self.clock = clock
+        self.times = deque()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Get whether a profile can be taken now and count it."""
+        with self.lock:
+            now = self.clock()
+            while self.times and self.times[0] <= now - self.period:
+                self.times.popleft()
+            if len(self.times) >= self.max_count:
+                return False
+            self.times.append(now)
+            return True
+
+
+def format_folded(stacks):
+    """Get lines of folded stacks with their numbers of samples."""
+    return ''.join(
+        '{} {}\n'.format(';'.join(stack), count)
+        for stack, count in sorted(stacks.items())
+    )
+
+
+def format_call_tree(stacks, interval, min_share=TREE_MIN_SHARE):
+    """
+    Get call tree of stacks: total and own share of samples and estimated
+    milliseconds of every function under its callers.
+    """
+    total = sum(stacks.values())
+    # Nodes are [samples, own samples, children by name].
+    root = [total, 0, {}]
+    for stack, count in stacks.items():
+        node = root
+        for name in stack:
+            node = node[2].setdefault(name, [0, 0, {}])
+            node[0] += count
+        node[1] += count
+
+    lines = ['  total    own       ms  function']
+
+    def add_lines(children, depth):
+        for name, (samples, own, grandchildren) in sorted(
+            children.items(), key=lambda item: -item[1][0]
+        ):
+            if samples < total * min_share:
+                continue
+            lines.append('{:6.1%} {:6.1%} {:8.1f}  {}{}'.format(
+                samples / total, own / total, samples * interval * 1000,
+                '  ' * depth, name,
+            ))
+            add_lines(grandchildren, depth + 1)
+
+    if total:
+        add_lines(root[2], 0)
+    return '\n'.join(lines) + '\n'
+
+
+def get_profile_name(method, path):
+    """Get unique name of a profile of a request."""
+    return '{}-{}-{}-{}'.format(
+        datetime.now().strftime('%Y%m%d-%H%M%S'), method,
+        SLUG_RE.sub('-', path).strip('-')[:50] or 'root',
+        uuid.uuid4().hex[:8],
+    )
+
+
+def save_profile(directory, name, sampler, title, keep=None):
+    """
+    Save call tree and folded stacks of sampler to directory, deleting
+    all but the keep latest profiles.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    header = '{}\n{} samples every {:g} ms in {:.1f} ms\n\n'.format(
+        title, sum(sampler.stacks.values()), sampler.interval * 1000,
+        sampler.duration * 1000,
+    )
+    (directory / (name + CALL_TREE_SUFFIX)).write_text(
+        header + format_call_tree(sampler.stacks, sampler.interval)
+    )
+    (directory / (name + FOLDED_SUFFIX)).write_text(
+        format_folded(sampler.stacks)
+    )
+    if keep is not None:
+        delete_old_profiles(directory, keep)
+
+
+def delete_old_profiles(directory, keep):
+    """Delete files of all but the keep latest profiles in directory."""
+    names = sorted(
+        (path.stat().st_mtime, path.name[:-len(FOLDED_SUFFIX)])
+        for path in Path(directory).glob('*' + FOLDED_SUFFIX)
+    )
+    for _, name in names[:max(0, len(names) - keep)]:
+        for suffix in (CALL_TREE_SUFFIX, FOLDED_SUFFIX):
+            try:
+                (Path(directory) / (name + suffix)).unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,186 @@
+from collections import defaultdict
+
+from django.utils.encoding import force_str
+
+from .models import (PERSON_NAME_ORDERING, Address, Employee, get_person_name,
+                     get_stored_full_address)
+from .pagination import get_unique_ordering
+
+
+class Projection:
+    """
+    Read-only representation of rows read with values().
+
+    Subclasses list lookups of the columns they need and build from the
+    value dicts the same representation their serializers build from
+    instances, without creating instances and walking attributes field by
+    field. Lookups needed only by some fields are listed by field in
+    field_lookups, projections of a subset of fields do not read them.
+    """
+    lookups = ()
+    field_lookups = {}
+
+    def __init__(self, fields=None):
+        self.fields = fields
+
+    def includes(self, name):
+        """Check whether the field is represented."""
+        return self.fields is None or name in self.fields
+
+    def get_lookups(self):
+        lookups = self.lookups
+        for name, field_lookups in self.field_lookups.items():
+            if self.includes(name):
+                lookups += field_lookups
+        return lookups
+
+    def get_queryset(self, queryset):
+        """Get queryset of value dicts with lookups and ordering fields."""
+        ordering = [name.lstrip('-') for name in get_unique_ordering(queryset)]
+        return queryset.select_related(None).prefetch_related(None).values(
+            *dict.fromkeys(self.get_lookups() + tuple(ordering))
+        )
+
+    def represent(self, rows):
+        """Get representations of the list of value dicts."""
+        return [self.to_representation(row) for row in rows]
+
+    def to_representation(self, row):
+        raise NotImplementedError(
+            '`to_representation()` must be implemented.'
+        )
+
+
+class EmployeeFullInfoProjection(Projection):
+    """Projection of EmployeeFullInfoSerializer."""
+    lookups = ('id',)
+    field_lookups = {
+        'employee_name': ('person__surname', 'person__firstname'),
+        'restaurant_name': ('restaurant__name',),
+        'position_name': ('position',),
+    }
+
+    def __init__(self, fields=None):
+        super().__init__(fields)
+        self.positions = dict(
+            Employee._meta.get_field('position').flatchoices
+        )
+
+    def to_representation(self, row):
+        representation = {}
+        if self.includes('id'):
+            representation['id'] = row['id']
+        if self.includes('employee_name'):
+            representation['employee_name'] = get_person_name(
+                row['person__surname'], row['person__firstname']
+            )
+        if self.includes('restaurant_name'):
+            representation['restaurant_name'] = row['restaurant__name']
+        if self.includes('position_name'):
+            position = row['position']
+            representation['position_name'] = force_str(
+                self.positions.get(position, position), strings_only=True
+            )
+        return representation
+
+
+class RestaurantFullInfoProjection(Projection):
+    """
+    Projection of RestaurantFullInfoSerializer.
+
+    Names of employees of the whole page are read with one query. Full
+    address is omitted for restaurants without address, as the serializer
+    does.
+    """
+    lookups = ('id',)
+    field_lookups = {
+        'name': ('name',),
+        'phone': ('phone',),
+        'cuisine': ('cuisine',),
+        'rating': ('rating',),
+        'full_address': ('address_id', 'address__full_address_translations'),
+    }
+
+    def represent(self, rows):
+        if self.includes('employees'):
+            self.employees = self.get_employees([row['id'] for row in rows])
+        if self.includes('full_address'):
+            self.full_addresses = self.get_full_addresses(rows)
+        return super().represent(rows)
+
+    def to_representation(self, row):
+        representation = {
+            name: row[name]
+            for name in ('id', 'name', 'phone', 'cuisine', 'rating')
+            if self.includes(name)
+        }
+        if self.includes('full_address') and row['address_id'] is not None:
+            representation['full_address'] = self.full_addresses[
+                row['address_id']
+            ]
+        if self.includes('employees'):
+            representation['employees'] = self.employees.get(row['id'], [])
+        return representation
+
+    @staticmethod
+    def get_employees(pks):
+        """Get names of employees by restaurant in the order of names."""
+        employees = defaultdict(list)
+        for restaurant_id, surname, firstname in Employee.objects.filter(
+            restaurant_id__in=pks
+        ).order_by(
+            *('person__{}'.format(name) for name in PERSON_NAME_ORDERING)
+        ).values_list('restaurant_id', 'person__surname',
+                      'person__firstname'):
+            employees[restaurant_id].append(get_person_name(surname,
+                                                            firstname))
+        return employees
+
+    @staticmethod
+    def get_full_addresses(rows):
+        """Get full addresses by id, building those that are not stored."""
+        full_addresses = {}
+        missing = []
+        for row in rows:
+            if row['address_id'] is None:
+                continue
+            full_address = get_stored_full_address(
+                row['address__full_address_translations']
+            )
+            if full_address is None:
+                missing.append(row['address_id'])
+            full_addresses[row['address_id']] = full_address
+        for pk, address in Address.objects.in_bulk(missing).items():
+            full_addresses[pk] = address.full_address
+        return full_addresses
+
+
+class ProjectionListMixin:
+    """
+    List action that reads value dicts when the serializer has projection.
+
+    Pages and streamed chunks are read with projection querysets of list
+    serializers that set Meta.projection_class, their list serializers
+    represent value dicts with the projection.
+    """
+    use_projection = True
+    list_actions = ('list',)
+
+    def get_projection(self):
+        if not self.use_projection or self.action not in self.list_actions:
+            return None
+        projection_class = getattr(self.get_serializer_class().Meta,
+                                   'projection_class', None)
+        return projection_class and projection_class()
+
+    def project_queryset(self, queryset):
+        projection = self.get_projection()
+        if projection is None:
+            return queryset
+        return projection.get_queryset(queryset)
+
+    def paginate_queryset(self, queryset):
+        return super().paginate_queryset(self.project_queryset(queryset))
+
+    def stream_list(self, queryset):
+        return super().stream_list(self.project_queryset(queryset))
@@ -0,0 +1,126 @@
+import math
+from decimal import Decimal
+
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Types orjson and msgpack do not know, e.g. decimals, lazy translations
+# and querysets, are converted as the default renderer of the API does.
+encode_default = JSONEncoder().default
+
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Line and paragraph separators are escaped as the default renderer does,
+# JSON with them unescaped is not valid JavaScript.
+JS_ESCAPES = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+
+
+def dumps_json(data, indent=False):
+    """Get compact UTF-8 JSON of data as the default JSON renderer has."""
+    options = JSON_OPTIONS | orjson.OPT_INDENT_2 if indent else JSON_OPTIONS
+    content = orjson.dumps(data, default=encode_default, option=options)
+    # orjson writes NaN and infinities as null, look for them only then.
+    if b'null' in content:
+        check_finite(data)
+    for char, escape in JS_ESCAPES:
+        content = content.replace(char, escape)
+    return content
+
+
+def check_finite(data):
+    """
+    Raise ValueError on NaN and infinite numbers as strict JSON of the
+    default renderer does.
+    """
+    if isinstance(data, (float, Decimal)):
+        if not math.isfinite(data):
+            raise ValueError(
+                'Out of range float values are not JSON compliant'
+            )
+    elif isinstance(data, dict):
+        for value in data.values():
+            check_finite(value)
+    elif isinstance(data, (list, tuple)):
+        for value in data:
+            check_finite(value)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    JSON renderer built on orjson.
+
+    Output is the JSON of the default renderer with compact separators and
+    not escaped unicode, up to formatting of floats; indented output, e.g.
+    of the browsable API, is indented by 2 spaces.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        indent = renderer_context.get('indent')
+        if indent is None and accepted_media_type:
+            indent = 'indent=' in accepted_media_type
+        return dumps_json(data, indent=bool(indent))
+
+
+class ORJSONParser(BaseParser):
+    """JSON parser built on orjson."""
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read() if stream is not None else b'')
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - {}'.format(exc))
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack renderer, clients ask for it by Accept header."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """MessagePack parser of request bodies."""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(
+                stream.read() if stream is not None else b'', raw=False
+            )
+        except ValueError as exc:
+            raise ParseError('MessagePack parse error - {}'.format(exc))
+
+
+class PlainTextRenderer(BaseRenderer):
+    """
+    Renderer of text, e.g. metrics in the text format of Prometheus. Other
+    data, e.g. errors, is rendered as JSON.
+    """
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        return dumps_json(data)
@@ -0,0 +1,143 @@
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+STICKY_COOKIE = 'use_primary'
+
+# Replica alias that reads of the current request are routed to.
+read_database = ContextVar('read_database', default=None)
+
+LAG_SQL = (
+    'SELECT CASE WHEN NOT pg_is_in_recovery() '
+    'OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END'
+)
+
+lags = {}
+lags_lock = threading.Lock()
+
+
+def get_replica_lag(alias):
+    """
+    Get seconds the replica is behind its primary, None when it is not
+    available. Lags are checked once per REPLICA_LAG_CHECK_INTERVAL.
+    """
+    now = time.monotonic()
+    with lags_lock:
+        checked_at, lag = lags.get(alias, (None, None))
+    if checked_at is not None \
+            and now - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+        return lag
+
+    connection = connections[alias]
+    try:
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                lag = float(cursor.fetchone()[0] or 0)
+        else:
+            lag = 0
+    except DatabaseError:
+        logger.warning('Replica %s is not available.', alias, exc_info=True)
+        lag = None
+    with lags_lock:
+        lags[alias] = (now, lag)
+    return lag
+
+
+def get_replica():
+    """Get random replica within REPLICA_MAX_LAG, None if there is none."""
+    replicas = []
+    for alias in settings.DATABASE_REPLICAS:
+        lag = get_replica_lag(alias)
+        if lag is not None and lag <= settings.REPLICA_MAX_LAG:
+            replicas.append(alias)
+    return random.choice(replicas) if replicas else None
+
+
+def get_sticky_key(user):
+    return 'replica-sticky:{}'.format(user.pk)
+
+
+def is_sticky(request):
+    """Check if the client wrote recently and should read the primary."""
+    if STICKY_COOKIE in request.COOKIES:
+        return True
+    user = request.user
+    return bool(user.is_authenticated and cache.get(get_sticky_key(user)))
+
+
+def make_sticky(request, response):
+    """Make the client read the primary for REPLICA_STICKY_SECONDS."""
+    seconds = settings.REPLICA_STICKY_SECONDS
+    response.set_cookie(STICKY_COOKIE, '1', max_age=seconds, httponly=True,
+                        samesite='Lax')
+    # Clients without cookies are recognized by their user.
+    if request.user.is_authenticated:
+        cache.set(get_sticky_key(request.user), True, timeout=seconds)
+
+
+class ReplicaRouter:
+    """
+    Route reads of requests marked by ReplicaReadMixin to their replica and
+    everything else to the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary.
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaReadMixin:
+    """
+    Read safe requests of replica_actions of a viewset from a replica.
+
+    A replica is chosen once per request, so all its queries see the same
+    snapshot. Clients that made a successful write read the primary for
+    REPLICA_STICKY_SECONDS afterwards to see their own writes, replicas
+    lagging more than REPLICA_MAX_LAG are skipped. Streaming responses
+    read the primary after the view returns.
+    """
+    replica_actions = ('list', 'retrieve')
+
+    def dispatch(self, request, *args, **kwargs):
+        token = read_database.set(None)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            read_database.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (settings.DATABASE_REPLICAS
+                and request.method in ('GET', 'HEAD')
+                and self.action in self.replica_actions
+                and not is_sticky(request)):
+            read_database.set(get_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args,
+                                             **kwargs)
+        if (settings.DATABASE_REPLICAS
+                and request.method not in ('GET', 'HEAD', 'OPTIONS')
+                and response.status_code < 400):
+            make_sticky(request, response)
+        return response
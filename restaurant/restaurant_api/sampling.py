@@ -0,0 +1,40 @@
+import random
+
+from django.db.models import Max, Min
+
+PROBES_PER_QUERY = 16
+PROBE_ROUNDS = 3
+
+
+def get_random_object(queryset, probes=PROBES_PER_QUERY, rounds=PROBE_ROUNDS,
+                      rng=random):
+    """
+    Get uniformly random object of queryset without sorting the whole table.
+
+    Primary key bounds are taken from the index, then batches of random keys
+    inside the bounds are probed. The first probed key that exists is chosen,
+    so every existing row has the same chance to be picked whatever gaps
+    deleted rows left. If the key space is too sparse for probing, a row at
+    a random offset of the key index is taken: still uniform, but the index
+    is counted and read up to the offset.
+    """
+    keys = queryset.order_by()
+    bounds = keys.aggregate(low=Min('pk'), high=Max('pk'))
+    low, high = bounds['low'], bounds['high']
+    if low is None:
+        return None
+
+    for _ in range(rounds):
+        candidates = [rng.randint(low, high) for _ in range(probes)]
+        existing = set(
+            keys.filter(pk__in=candidates).values_list('pk', flat=True)
+        )
+        for pk in candidates:
+            if pk in existing:
+                return queryset.get(pk=pk)
+
+    # The nearest key after a random one would favour keys after long gaps.
+    count = keys.count()
+    if not count:
+        return None
+    return queryset.order_by('pk')[rng.randrange(count)]
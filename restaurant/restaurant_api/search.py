@@ -0,0 +1,44 @@
+from functools import reduce
+from operator import and_, or_
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast
+
+# Names and places are not stemmed.
+SEARCH_CONFIG = 'simple'
+
+# Columns of the search vector. Triggers of migration 0005 weigh the name
+# as A, the cuisine as B and the address as C.
+SEARCH_FIELDS = ('name', 'cuisine', 'address__city', 'address__province',
+                 'address__street')
+
+
+def search_restaurants(queryset, text):
+    """
+    Get restaurants matching the text annotated with rank and ordered by it.
+
+    PostgreSQL matches the text as a web search query against the search
+    vector index and ranks by weights of matched columns. Other databases
+    match every word in any column and rank matches of the name first.
+    """
+    if connections[queryset.db].vendor == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG,
+                            search_type='websearch')
+        queryset = queryset.filter(search_vector=query).annotate(
+            # Double precision keeps the rank exact in cursors.
+            rank=Cast(SearchRank(F('search_vector'), query), FloatField()),
+        )
+    else:
+        words = text.split()
+        queryset = queryset.filter(reduce(and_, [
+            reduce(or_, [Q(**{name + '__icontains': word})
+                         for name in SEARCH_FIELDS])
+            for word in words
+        ], Q())).annotate(rank=Case(
+            When(reduce(and_, [Q(name__icontains=word) for word in words],
+                        Q()), then=Value(1.0)),
+            default=Value(0.0), output_field=FloatField(),
+        ))
+    return queryset.order_by('-rank', 'name')
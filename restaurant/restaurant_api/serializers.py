@@ -1,21 +1,206 @@
+from collections.abc import Mapping
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Manager
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
+
+from .constants import (BULK_BATCH_SIZE, NEARBY_DEFAULT_LIMIT,
+                        NEARBY_DEFAULT_RADIUS, NEARBY_MAX_LIMIT,
+                        NEARBY_MAX_RADIUS, RATING_MAX_VALUE)
+from .models import Address, Employee, Person, Positions, Restaurant
+from .projections import (EmployeeFullInfoProjection,
+                          RestaurantFullInfoProjection)
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key related field that takes objects preloaded for a batch.
+
+    Objects for all items of a batch are loaded by BulkListSerializer with
+    one query, single objects are still loaded by the field itself.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = self.context.get('preloaded_objects', {}).get(
+            self.field_name
+        )
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        if self.pk_field is not None:
+            data = self.pk_field.to_internal_value(data)
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except (TypeError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in preloaded:
+            self.fail('does_not_exist', pk_value=data)
+        return preloaded[pk]
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer that writes whole batches with multi-row statements.
+
+    Related objects are loaded and unique together constraints are checked
+    for the whole batch at once instead of per item. To update, serializer
+    gets list of instances in the order of data items, items without an
+    instance are reported as not found.
+    """
+    not_found_message = 'Not found.'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.unique_together_validators = [
+            validator for validator in self.child.validators
+            if isinstance(validator, UniqueTogetherValidator)
+        ]
+        self.child.validators = [
+            validator for validator in self.child.validators
+            if not isinstance(validator, UniqueTogetherValidator)
+        ]
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super().to_internal_value(data)
+
+        self.preload_related_objects(data)
+        instances = self.instance or [None] * len(data)
+        ret = []
+        errors = []
+        for item, instance in zip(data, instances):
+            if self.instance is not None and instance is None:
+                errors.append({'id': [self.not_found_message]})
+                continue
+            self.child.instance = instance
+            try:
+                validated = self.child.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors.append(exc.detail)
+            else:
+                ret.append(validated)
+                errors.append({})
+        self.child.instance = None
+
+        if not any(errors):
+            errors = self.get_unique_together_errors(ret, instances)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return ret
+
+    def preload_related_objects(self, data):
+        """Load objects of all primary key related fields of the batch."""
+        preloaded = {}
+        for name, field in self.child.fields.items():
+            if (not isinstance(field, BulkPrimaryKeyRelatedField)
+                    or field.read_only):
+                continue
+            pk_field = field.get_queryset().model._meta.pk
+            pks = set()
+            for item in data:
+                if not isinstance(item, Mapping) or item.get(name) is None:
+                    continue
+                try:
+                    pks.add(pk_field.to_python(item[name]))
+                except (TypeError, DjangoValidationError):
+                    continue
+            preloaded[name] = field.get_queryset().in_bulk(pks)
+        self.context['preloaded_objects'] = preloaded
+
+    def get_unique_together_errors(self, items, instances):
+        """Check unique together sets with one query per constraint."""
+        errors = [{} for _ in items]
+        updated = [instance.pk for instance in instances if instance]
+        for validator in self.unique_together_validators:
+            fields = validator.fields
+            keys = [
+                tuple(
+                    getattr(value, 'pk', value) for value in (
+                        attrs[field] if field in attrs
+                        else getattr(instance, field)
+                        for field in fields
+                    )
+                )
+                for attrs, instance in zip(items, instances)
+            ]
+            existing = validator.queryset.filter(**{
+                field + '__in': {key[index] for key in keys}
+                for index, field in enumerate(fields)
+            }).exclude(pk__in=updated)
+            taken = set(existing.values_list(*fields))
+            message = validator.message.format(field_names=', '.join(fields))
+            for index, key in enumerate(keys):
+                if key in taken:
+                    errors[index] = {
+                        api_settings.NON_FIELD_ERRORS_KEY: [message]
+                    }
+                taken.add(key)
+        return errors
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        return model.objects.bulk_create(
+            [model(**attrs) for attrs in validated_data],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+    def update(self, instances, validated_data):
+        model = self.child.Meta.model
+        fields = set()
+        for instance, attrs in zip(instances, validated_data):
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+            fields.update(attrs)
+        if not fields:
+            return instances
+
+        # Bulk update does not call pre_save of fields like save does.
+        for field in model._meta.concrete_fields:
+            if getattr(field, 'auto_now', False):
+                for instance in instances:
+                    field.pre_save(instance, add=False)
+                fields.add(field.name)
+        model.objects.bulk_update(instances, fields,
+                                  batch_size=BULK_BATCH_SIZE)
+        return instances
+
 
-from .constants import RATING_MAX_VALUE
-from .models import Address, Employee, Person, Restaurant
+class ProjectionListSerializer(serializers.ListSerializer):
+    """
+    List serializer that represents value dicts with a projection.
+
+    Value dicts are represented by the projection class of the child's
+    Meta, instances are represented by the child as usual.
+    """
+
+    def to_representation(self, data):
+        rows = list(data.all() if isinstance(data, Manager) else data)
+        if rows and isinstance(rows[0], Mapping):
+            return self.child.Meta.projection_class(
+                fields=tuple(self.child.fields)
+            ).represent(rows)
+        return super().to_representation(rows)
 
 
 class PersonSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Person
-        fields = '__all__'
+        exclude = ('updated_at',)
+        list_serializer_class = BulkListSerializer
 
 
 class AddressSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Address
-        fields = '__all__'
+        exclude = ('updated_at', 'full_address_text',
+                   'full_address_translations', 'geo_cell')
+        list_serializer_class = BulkListSerializer
 
 
 class RestaurantSerializer(serializers.ModelSerializer):
@@ -23,14 +208,16 @@ class RestaurantSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Restaurant
-        fields = '__all__'
+        exclude = ('updated_at', 'search_vector')
 
 
 class EmployeeSerializer(serializers.ModelSerializer):
+    serializer_related_field = BulkPrimaryKeyRelatedField
 
     class Meta:
         model = Employee
-        fields = '__all__'
+        exclude = ('updated_at',)
+        list_serializer_class = BulkListSerializer
 
 
 class EmployeeFullInfoSerializer(serializers.ModelSerializer):
@@ -40,6 +227,8 @@ class EmployeeFullInfoSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = ('id', 'employee_name', 'restaurant_name', 'position_name')
+        list_serializer_class = ProjectionListSerializer
+        projection_class = EmployeeFullInfoProjection
 
 
 class EmployeeRelatedSerializer(serializers.RelatedField):
@@ -61,3 +250,84 @@ class RestaurantFullInfoSerializer(serializers.ModelSerializer):
         model = Restaurant
         fields = ('id', 'name', 'phone', 'cuisine', 'rating',
                   'full_address', 'employees')
+        list_serializer_class = ProjectionListSerializer
+        projection_class = RestaurantFullInfoProjection
+
+
+class NearbyQuerySerializer(serializers.Serializer):
+    """Point, radius in meters and limit of nearby restaurants."""
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0, max_value=NEARBY_MAX_RADIUS,
+                                    default=NEARBY_DEFAULT_RADIUS)
+    limit = serializers.IntegerField(min_value=1, max_value=NEARBY_MAX_LIMIT,
+                                     default=NEARBY_DEFAULT_LIMIT)
+
+
+class RangeFilterSerializer(serializers.Serializer):
+    """Filter serializer that checks <name>_min is not above <name>_max."""
+
+    def validate(self, attrs):
+        for name, low in attrs.items():
+            if not name.endswith('_min'):
+                continue
+            high = attrs.get(name[:-len('_min')] + '_max')
+            if high is not None and low > high:
+                raise serializers.ValidationError(
+                    '{} should not be greater than {}.'.format(
+                        name, name[:-len('_min')] + '_max'
+                    )
+                )
+        return attrs
+
+
+class RestaurantFilterSerializer(RangeFilterSerializer):
+    """Query parameters that filter restaurants."""
+    rating_min = serializers.IntegerField(min_value=0,
+                                          max_value=RATING_MAX_VALUE,
+                                          required=False)
+    rating_max = serializers.IntegerField(min_value=0,
+                                          max_value=RATING_MAX_VALUE,
+                                          required=False)
+    cuisine = serializers.CharField(required=False)
+    country = serializers.CharField(min_length=2, max_length=2,
+                                    required=False)
+
+    class Meta:
+        lookups = {
+            'rating_min': 'rating__gte',
+            'rating_max': 'rating__lte',
+            'cuisine': 'cuisine',
+            'country': 'address__country',
+        }
+
+    def validate_country(self, value):
+        return value.upper()
+
+
+class EmployeeFilterSerializer(serializers.Serializer):
+    """Query parameters that filter employees."""
+    restaurant = serializers.IntegerField(required=False)
+    person = serializers.IntegerField(required=False)
+    position = serializers.ChoiceField(Positions.choices, required=False)
+
+    class Meta:
+        lookups = {
+            'restaurant': 'restaurant_id',
+            'person': 'person_id',
+            'position': 'position',
+        }
+
+
+class PersonFilterSerializer(RangeFilterSerializer):
+    """Query parameters that filter persons."""
+    surname = serializers.CharField(required=False)
+    date_of_birth_min = serializers.DateField(required=False)
+    date_of_birth_max = serializers.DateField(required=False)
+
+    class Meta:
+        lookups = {
+            'surname': 'surname__startswith',
+            'date_of_birth_min': 'date_of_birth__gte',
+            'date_of_birth_max': 'date_of_birth__lte',
+        }
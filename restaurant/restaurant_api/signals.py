@@ -0,0 +1,258 @@
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import Signal, receiver
+
+from .cache import response_cache
+from .leaderboards import (ENTRY_FIELDS, get_board_keys, get_entry, move_entry,
+                           rebuild_leaderboard, rebuild_leaderboards)
+from .models import Address, Employee, Person, Restaurant
+from .staffing import move_employee, rebuild_staff_counts
+
+# Sent with the model as sender after rows were written by bulk paths that
+# bypass model signals: bulk endpoints and bulk loading. Optional arguments:
+# deleted, models of rows deleted with cascades, board_keys, keys of the only
+# leaderboards to rebuild, and restaurant_ids, ids of the only restaurants to
+# recount employees of.
+bulk_changed = Signal()
+# Receivers of model signals skip rows of bulk paths of the thread.
+muted = threading.local()
+
+
+@contextmanager
+def muted_model_signals():
+    """
+    Skip receivers of model signals of rows written in the block, which
+    is followed by bulk_changed for the whole batch.
+    """
+    previous = getattr(muted, 'active', False)
+    muted.active = True
+    try:
+        yield
+    finally:
+        muted.active = previous
+
+
+def unless_muted(function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if not getattr(muted, 'active', False):
+            return function(*args, **kwargs)
+    return wrapper
+
+
+# Response cache namespaces that depend on rows of each model.
+DEPENDENT_NAMESPACES = {
+    Restaurant: ('restaurant-list', 'employee-list', 'restaurant-detail'),
+    Address: ('restaurant-list',),
+    Person: ('restaurant-list', 'employee-list'),
+    Employee: ('restaurant-list', 'employee-list', 'restaurant-detail',
+               'employee-detail'),
+}
+
+
+def get_restaurant_names(pks):
+    return set(
+        Restaurant.objects.filter(pk__in=pks).values_list('name', flat=True)
+    )
+
+
+def invalidate_restaurant_details(names):
+    response_cache.invalidate(*(
+        'restaurant-detail:{}'.format(name) for name in names if name
+    ))
+
+
+def get_restaurant_row(restaurant):
+    return {name: getattr(restaurant, name)
+            for name in ENTRY_FIELDS + ('cuisine',)}
+
+
+def get_restaurant_board_keys(restaurant, country):
+    if restaurant['rating'] is None:
+        return set()
+    return get_board_keys(restaurant['cuisine'], country)
+
+
+@receiver(pre_save, sender=Restaurant)
+@unless_muted
+def remember_saved_restaurant(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    saved = Restaurant.objects.filter(pk=instance.pk).values(
+        'name', 'cuisine', 'rating', 'address__country'
+    ).first()
+    if saved is not None:
+        instance._saved_name = saved['name']
+        instance._saved_board_keys = get_restaurant_board_keys(
+            saved, saved['address__country']
+        )
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+@unless_muted
+def invalidate_restaurant(sender, instance, **kwargs):
+    response_cache.invalidate('restaurant-list', 'employee-list')
+    invalidate_restaurant_details(
+        {instance.name, getattr(instance, '_saved_name', None)}
+    )
+
+
+@receiver(post_save, sender=Restaurant)
+@unless_muted
+def update_restaurant_leaderboards(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    country = Address.objects.filter(pk=instance.address_id).values_list(
+        'country', flat=True
+    ).first()
+    row = get_restaurant_row(instance)
+    move_entry(get_entry(row), getattr(instance, '_saved_board_keys', ()),
+               get_restaurant_board_keys(row, country))
+
+
+@receiver(pre_delete, sender=Restaurant)
+@unless_muted
+def remove_restaurant_from_leaderboards(sender, instance, **kwargs):
+    # The address may be deleted together with restaurants.
+    country = Address.objects.filter(pk=instance.address_id).values_list(
+        'country', flat=True
+    ).first()
+    row = get_restaurant_row(instance)
+    move_entry(get_entry(row), get_restaurant_board_keys(row, country), ())
+
+
+@receiver(pre_save, sender=Address)
+@unless_muted
+def remember_address_country(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    instance._saved_country = Address.objects.filter(
+        pk=instance.pk
+    ).values_list('country', flat=True).first()
+
+
+@receiver(post_save, sender=Address)
+@unless_muted
+def update_address_leaderboards(sender, instance, raw=False, **kwargs):
+    saved_country = getattr(instance, '_saved_country', None)
+    country = instance.country.code
+    if raw or saved_country is None or saved_country == country:
+        return
+    for restaurant in Restaurant.objects.filter(
+        address_id=instance.pk, rating__isnull=False
+    ).values(*ENTRY_FIELDS, 'cuisine'):
+        move_entry(get_entry(restaurant),
+                   get_restaurant_board_keys(restaurant, saved_country),
+                   get_restaurant_board_keys(restaurant, country))
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+@unless_muted
+def invalidate_address(sender, instance, **kwargs):
+    if Restaurant.objects.filter(address_id=instance.pk).exists():
+        response_cache.invalidate('restaurant-list')
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+@unless_muted
+def invalidate_person(sender, instance, **kwargs):
+    if Employee.objects.filter(person_id=instance.pk).exists():
+        response_cache.invalidate('restaurant-list', 'employee-list')
+
+
+@receiver(pre_save, sender=Employee)
+@unless_muted
+def remember_saved_employee(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    saved = Employee.objects.filter(pk=instance.pk).values_list(
+        'restaurant_id', 'position'
+    ).first()
+    if saved is not None:
+        instance._saved_restaurant_id = saved[0]
+        instance._saved_staff_key = saved
+
+
+@receiver(post_save, sender=Employee)
+@unless_muted
+def update_saved_employee_staff_counts(sender, instance, raw=False,
+                                       **kwargs):
+    if raw:
+        return
+    move_employee(getattr(instance, '_saved_staff_key', None),
+                  (instance.restaurant_id, instance.position))
+
+
+@receiver(post_delete, sender=Employee)
+@unless_muted
+def update_deleted_employee_staff_counts(sender, instance, **kwargs):
+    move_employee((instance.restaurant_id, instance.position), None)
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@unless_muted
+def invalidate_employee(sender, instance, **kwargs):
+    response_cache.invalidate(
+        'restaurant-list', 'employee-list',
+        'employee-detail:{}'.format(instance.pk),
+    )
+    invalidate_restaurant_details(get_restaurant_names({
+        instance.restaurant_id,
+        getattr(instance, '_saved_restaurant_id', None),
+    }))
+
+
+@receiver(m2m_changed, sender=Restaurant.employees.through)
+@unless_muted
+def invalidate_restaurant_employees(sender, instance, action, reverse,
+                                    pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    response_cache.invalidate('restaurant-list', 'employee-list')
+    # Employees added through the relation have no signals of their own.
+    if not reverse:
+        invalidate_restaurant_details({instance.name})
+        rebuild_staff_counts({instance.pk})
+    elif pk_set:
+        invalidate_restaurant_details(get_restaurant_names(pk_set))
+        rebuild_staff_counts(pk_set)
+    else:
+        response_cache.invalidate('restaurant-detail', 'employee-detail')
+        rebuild_staff_counts()
+
+
+@receiver(bulk_changed)
+def invalidate_bulk_changed(sender, deleted=(), **kwargs):
+    response_cache.invalidate(*(
+        namespace for model in {sender, *deleted}
+        for namespace in DEPENDENT_NAMESPACES.get(model, ())
+    ))
+
+
+@receiver(bulk_changed)
+def rebuild_bulk_changed_leaderboards(sender, board_keys=None, **kwargs):
+    if board_keys is not None:
+        for key in board_keys:
+            rebuild_leaderboard(key)
+    elif sender in (Restaurant, Address):
+        rebuild_leaderboards()
+
+
+@receiver(bulk_changed)
+def rebuild_bulk_changed_staff_counts(sender, restaurant_ids=None,
+                                      deleted=(), **kwargs):
+    if restaurant_ids is not None:
+        if restaurant_ids:
+            rebuild_staff_counts(restaurant_ids)
+    elif Employee in (sender, *deleted):
+        # New restaurants have no employees and counters of deleted ones
+        # are deleted with them.
+        rebuild_staff_counts()
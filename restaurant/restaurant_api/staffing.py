@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Sum
+
+from .constants import BULK_BATCH_SIZE
+from .models import Employee, Positions, Restaurant, StaffCount
+
+
+def change_staff_count(restaurant_id, position, delta):
+    """Add delta to the number of employees of restaurant in position."""
+    counts = StaffCount.objects.filter(restaurant_id=restaurant_id,
+                                       position=position)
+    if delta < 0:
+        # Counts of deleted restaurants are already deleted.
+        counts.filter(count__gte=-delta).update(count=F('count') + delta)
+        return
+    if counts.update(count=F('count') + delta):
+        return
+    # The first employee in the position creates the counter, unless a
+    # concurrent request has just created it.
+    _, created = StaffCount.objects.get_or_create(
+        restaurant_id=restaurant_id, position=position,
+        defaults={'count': delta},
+    )
+    if not created:
+        counts.update(count=F('count') + delta)
+
+
+def move_employee(old_key, new_key):
+    """
+    Move an employee between counters of (restaurant id, position) keys,
+    old_key is None for created employees and new_key for deleted ones.
+    """
+    if old_key == new_key:
+        return
+    if old_key is not None:
+        change_staff_count(*old_key, -1)
+    if new_key is not None:
+        change_staff_count(*new_key, 1)
+
+
+def rebuild_staff_counts(restaurant_ids=None):
+    """
+    Count employees of the restaurants, or of all restaurants, again.
+    Return the number of counters.
+    """
+    counts = StaffCount.objects.all()
+    employees = Employee.objects.all()
+    if restaurant_ids is not None:
+        counts = counts.filter(restaurant_id__in=restaurant_ids)
+        employees = employees.filter(restaurant_id__in=restaurant_ids)
+    rows = list(employees.order_by().values(
+        'restaurant_id', 'position'
+    ).annotate(count=Count('id')))
+    with transaction.atomic():
+        counts.delete()
+        StaffCount.objects.bulk_create(
+            (StaffCount(**row) for row in rows), batch_size=BULK_BATCH_SIZE
+        )
+    return len(rows)
+
+
+def get_positions():
+    return {label: 0 for label in Positions.labels}
+
+
+def add_count(stats, key, defaults, position, count):
+    group = stats.get(key)
+    if group is None:
+        group = stats[key] = dict(defaults, positions=get_positions(),
+                                  total=0)
+    group['positions'][position] += count
+    group['total'] += count
+
+
+def get_staffing_stats():
+    """
+    Get number of employees by position per country and city and in total
+    with one query summing the counters by city.
+    """
+    rows = StaffCount.objects.filter(count__gt=0).values(
+        'position', country=F('restaurant__address__country'),
+        city=F('restaurant__address__city'),
+    ).annotate(count=Sum('count')).order_by()
+    total = {'positions': get_positions(), 'total': 0}
+    countries, cities = {}, {}
+    for row in rows:
+        position, count = Positions(row['position']).label, row['count']
+        total['positions'][position] += count
+        total['total'] += count
+        if row['country'] is None:
+            continue
+        add_count(countries, row['country'], {'country': row['country']},
+                  position, count)
+        add_count(cities, (row['country'], row['city']), {
+            'country': row['country'], 'city': row['city'],
+        }, position, count)
+    return dict(
+        total,
+        countries=[countries[key] for key in sorted(countries)],
+        cities=[cities[key] for key in sorted(cities)],
+    )
+
+
+def get_staffed_restaurants():
+    """Get rows of restaurants with employees ordered by name."""
+    return Restaurant.objects.filter(Exists(StaffCount.objects.filter(
+        restaurant=OuterRef('pk'), count__gt=0
+    ))).order_by('name').values('id', 'name',
+                                country=F('address__country'),
+                                city=F('address__city'))
+
+
+def get_restaurants_staffing(restaurants):
+    """
+    Get number of employees by position of restaurant rows with one query
+    of their counters.
+    """
+    stats = {row['id']: dict(row, positions=get_positions(), total=0)
+             for row in restaurants}
+    for restaurant_id, position, count in StaffCount.objects.filter(
+        restaurant_id__in=list(stats), count__gt=0
+    ).values_list('restaurant_id', 'position', 'count'):
+        add_count(stats, restaurant_id, {}, Positions(position).label, count)
+    return list(stats.values())
@@ -0,0 +1,37 @@
+from django.http import StreamingHttpResponse
+
+from .pagination import iter_keyset_chunks
+from .renderers import dumps_json
+
+
+class StreamingListMixin:
+    """
+    List action that streams the whole JSON array when asked.
+
+    With the stream query parameter the queryset is read by keyset chunks,
+    each chunk is serialized and sent before the next one is read, so time
+    to first byte and memory do not depend on the size of the list.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.stream_query_param) is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(self.stream_list(queryset),
+                                     content_type='application/json')
+
+    def stream_list(self, queryset):
+        """Yield JSON array of serialized queryset chunk by chunk."""
+        yield b'['
+        separator = b''
+        for chunk in iter_keyset_chunks(queryset, self.stream_chunk_size):
+            serializer = self.get_serializer(chunk, many=True)
+            # Items of the chunk are rendered as one array without brackets.
+            items = dumps_json(serializer.data)[1:-1]
+            if items:
+                yield separator + items
+                separator = b','
+        yield b']'
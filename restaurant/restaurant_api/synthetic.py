@@ -0,0 +1,254 @@
+import random
+from datetime import date, timedelta
+from itertools import accumulate
+
+from django.db import transaction
+from django.db.models import Max
+
+from .constants import RATING_MAX_VALUE
+from .loading import BulkWriter, batched
+from .models import (Address, Employee, Person, Positions, Restaurant,
+                     get_derived_address_columns, set_derived_address_columns)
+from .signals import bulk_changed
+
+# Countries with their share of addresses and cities as (city, province,
+# latitude, longitude).
+COUNTRIES = (
+    ('US', 25, (('New York', 'New York', 40.71, -74.01),
+                ('Los Angeles', 'California', 34.05, -118.24),
+                ('Chicago', 'Illinois', 41.88, -87.63),
+                ('Houston', 'Texas', 29.76, -95.37))),
+    ('RU', 15, (('Moscow', 'Moscow', 55.76, 37.62),
+                ('Saint Petersburg', 'Saint Petersburg', 59.94, 30.31),
+                ('Kazan', 'Tatarstan rep.', 55.79, 49.12),
+                ('Tula', 'Tula region', 54.19, 37.62))),
+    ('DE', 10, (('Berlin', 'Berlin', 52.52, 13.40),
+                ('Munich', 'Bavaria', 48.14, 11.58),
+                ('Hamburg', 'Hamburg', 53.55, 9.99))),
+    ('FR', 10, (('Paris', 'Ile-de-France', 48.86, 2.35),
+                ('Lyon', 'Auvergne-Rhone-Alpes', 45.76, 4.84))),
+    ('IT', 10, (('Rome', 'Lazio', 41.90, 12.50),
+                ('Milan', 'Lombardy', 45.46, 9.19))),
+    ('GB', 10, (('London', 'England', 51.51, -0.13),
+                ('Manchester', 'England', 53.48, -2.24))),
+    ('ES', 8, (('Madrid', 'Madrid', 40.42, -3.70),
+               ('Barcelona', 'Catalonia', 41.39, 2.17))),
+    ('CN', 7, (('Beijing', 'Beijing', 39.90, 116.41),
+               ('Shanghai', 'Shanghai', 31.23, 121.47))),
+    ('JP', 5, (('Tokyo', 'Tokyo', 35.68, 139.69),
+               ('Osaka', 'Osaka', 34.69, 135.50))),
+)
+STREETS = ('Main', 'Park', 'Oak', 'Lenina', 'Pushkina', 'Baumana', 'High',
+           'Station', 'Church', 'Mill', 'River', 'Garden')
+# Spread in degrees of coordinates around the center of a city.
+CITY_SPREAD = 0.15
+CUISINES = (('Italian', 20), ('American', 15), ('Chinese', 12),
+            ('Japanese', 10), ('French', 8), ('Russian', 8),
+            ('Mexican', 8), ('Indian', 7), ('Georgian', 4), ('Tatar', 3),
+            ('Thai', 5))
+NAME_ADJECTIVES = ('Golden', 'Red', 'Hungry', 'Happy', 'Little', 'Old',
+                   'Silver', 'Green', 'Royal', 'Lucky', 'Blue', 'Wild')
+NAME_NOUNS = ('Wolf', 'Bear', 'Dragon', 'Fork', 'Spoon', 'Garden', 'Table',
+              'Oven', 'Kitchen', 'Lantern', 'Anchor', 'Fox')
+FIRSTNAMES = ('Ivan', 'Anna', 'John', 'Maria', 'Peter', 'Olga', 'James',
+              'Elena', 'Michael', 'Sofia', 'David', 'Emma', 'Alexey',
+              'Laura', 'Daniel', 'Irina', 'Thomas', 'Julia', 'Paul', 'Nina')
+SURNAMES = ('Ivanov', 'Smith', 'Petrov', 'Johnson', 'Sidorov', 'Brown',
+            'Kuznetsov', 'Garcia', 'Popov', 'Miller', 'Volkov', 'Davis',
+            'Sokolov', 'Wilson', 'Lebedev', 'Taylor', 'Kozlov', 'Moore',
+            'Novikov', 'Martin')
+BIRTH_DATE_START = date(1950, 1, 1)
+BIRTH_DATE_DAYS = 365 * 55
+# Ratings are normally distributed, some restaurants are not rated yet.
+RATING_MEAN = 70
+RATING_DEVIATION = 15
+UNRATED_SHARE = 0.1
+# Staff of a restaurant: a director, the rest by these weights.
+STAFF_POSITIONS = ((Positions.MANAGER, 10), (Positions.COOK, 35),
+                   (Positions.WAITER, 55))
+# Deviation of the logarithm of the sizes of restaurants.
+STAFF_SIZE_DEVIATION = 0.6
+
+
+def get_cumulative_weights(choices):
+    return list(accumulate(weight for _, weight, *_ in choices))
+
+
+def get_staff_sizes(total, count, cap, rng):
+    """
+    Get numbers of employees of count restaurants that add up to total,
+    at least one and no number above cap, with log-normally distributed
+    sizes. Total should not be less than count.
+    """
+    total = min(total, count * cap)
+    weights = [rng.lognormvariate(0, STAFF_SIZE_DEVIATION)
+               for _ in range(count)]
+    # Every restaurant has a director, the rest is shared by weights.
+    scale = (total - count) / sum(weights)
+    sizes = [min(cap, 1 + int(weight * scale)) for weight in weights]
+    # Restaurants under the cap get the rest, the largest first.
+    order = sorted(range(count), key=weights.__getitem__, reverse=True)
+    missing = total - sum(sizes)
+    while missing:
+        for index in order:
+            if not missing:
+                break
+            if sizes[index] < cap:
+                sizes[index] += 1
+                missing -= 1
+    return sizes
+
+
+class DatasetGenerator:
+    """
+    Generator of persons, addresses, restaurants and employees.
+
+    Rows get primary keys following the existing ones and are written in
+    batches by BulkWriter (COPY on PostgreSQL). Restaurants refer to the
+    generated addresses, employees to the generated restaurants and
+    persons, a person works at a restaurant at most once. The same seed
+    and counts give the same rows.
+    """
+
+    def __init__(self, seed=0, batch_size=10000):
+        self.seed = seed
+        self.batch_size = batch_size
+        self.country_weights = get_cumulative_weights(COUNTRIES)
+        self.cuisine_weights = get_cumulative_weights(CUISINES)
+
+    def get_rng(self, model):
+        # Rows of every model do not depend on counts of other models.
+        return random.Random('{}:{}'.format(self.seed, model.__name__))
+
+    @staticmethod
+    def get_first_pk(model):
+        return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+    def write(self, model, objs):
+        """Write objs in batches and get their number."""
+        writer = BulkWriter(model, explicit_pk=True)
+        written = 0
+        for batch in batched(objs, self.batch_size):
+            with transaction.atomic():
+                writer.write(batch)
+            written += len(batch)
+        writer.finish()
+        if written:
+            bulk_changed.send(sender=model)
+        return written
+
+    def generate(self, persons=0, addresses=0, restaurants=0, employees=0):
+        """Generate rows and get numbers of written rows by name."""
+        if restaurants and not addresses:
+            raise ValueError('Restaurants need addresses.')
+        if employees and not (persons and restaurants):
+            raise ValueError('Employees need persons and restaurants.')
+        if employees and employees < restaurants:
+            raise ValueError(
+                'Every restaurant needs a director, generate at least as '
+                'many employees as restaurants.'
+            )
+        first_person = self.get_first_pk(Person)
+        first_address = self.get_first_pk(Address)
+        first_restaurant = self.get_first_pk(Restaurant)
+        return {
+            'persons': self.write(Person, self.generate_persons(
+                first_person, persons
+            )),
+            'addresses': self.write(Address, self.generate_addresses(
+                first_address, addresses
+            )),
+            'restaurants': self.write(Restaurant, self.generate_restaurants(
+                first_restaurant, restaurants, first_address, addresses
+            )),
+            'employees': self.write(Employee, self.generate_employees(
+                self.get_first_pk(Employee), employees, first_restaurant,
+                restaurants, first_person, persons,
+            )),
+        }
+
+    def generate_persons(self, first_pk, count):
+        rng = self.get_rng(Person)
+        for pk in range(first_pk, first_pk + count):
+            yield Person(
+                pk=pk,
+                firstname=rng.choice(FIRSTNAMES),
+                surname=rng.choice(SURNAMES),
+                date_of_birth=BIRTH_DATE_START + timedelta(
+                    days=rng.randrange(BIRTH_DATE_DAYS)
+                ),
+                phone='+7{}'.format(rng.randrange(10 ** 9, 10 ** 10))
+                if rng.random() < 0.8 else None,
+            )
+
+    def generate_addresses(self, first_pk, count):
+        rng = self.get_rng(Address)
+        setters = get_derived_address_columns()[1]
+        for pk in range(first_pk, first_pk + count):
+            country, _, cities = rng.choices(
+                COUNTRIES, cum_weights=self.country_weights
+            )[0]
+            # The first cities of countries are the largest.
+            city, province, latitude, longitude = cities[min(
+                len(cities) - 1, int(rng.expovariate(1))
+            )]
+            address = Address(
+                pk=pk, country=country, province=province, city=city,
+                street='{} st.'.format(rng.choice(STREETS)),
+                house=str(rng.randint(1, 200)),
+                zip_code='{:05d}'.format(rng.randrange(100000)),
+                latitude=round(latitude + rng.uniform(-CITY_SPREAD,
+                                                      CITY_SPREAD), 6),
+                longitude=round(longitude + rng.uniform(-CITY_SPREAD,
+                                                        CITY_SPREAD), 6),
+            )
+            set_derived_address_columns(address, setters)
+            yield address
+
+    def generate_restaurants(self, first_pk, count, first_address,
+                             addresses):
+        rng = self.get_rng(Restaurant)
+        for number, pk in enumerate(range(first_pk, first_pk + count)):
+            rating = None
+            if rng.random() >= UNRATED_SHARE:
+                rating = min(RATING_MAX_VALUE, max(0, round(
+                    rng.gauss(RATING_MEAN, RATING_DEVIATION)
+                )))
+            yield Restaurant(
+                pk=pk,
+                # Primary key keeps names unique.
+                name='{} {} {}'.format(rng.choice(NAME_ADJECTIVES),
+                                       rng.choice(NAME_NOUNS), pk),
+                # Most restaurants have an address of their own.
+                address_id=first_address + (
+                    number if number < addresses
+                    else rng.randrange(addresses)
+                ),
+                phone='+1{}'.format(rng.randrange(10 ** 9, 10 ** 10)),
+                cuisine=rng.choices(CUISINES,
+                                    cum_weights=self.cuisine_weights)[0][0],
+                rating=rating,
+            )
+
+    def generate_employees(self, first_pk, count, first_restaurant,
+                           restaurants, first_person, persons):
+        if not count:
+            return
+        rng = self.get_rng(Employee)
+        positions = [position for position, _ in STAFF_POSITIONS]
+        position_weights = get_cumulative_weights(STAFF_POSITIONS)
+        pk = first_pk
+        for number, size in enumerate(get_staff_sizes(count, restaurants,
+                                                      persons, rng)):
+            staff = rng.sample(range(persons), size)
+            staff_positions = [Positions.DIRECTOR] + rng.choices(
+                positions, cum_weights=position_weights, k=size - 1
+            )
+            for person, position in zip(staff, staff_positions):
+                yield Employee(
+                    pk=pk,
+                    restaurant_id=first_restaurant + number,
+                    person_id=first_person + person,
+                    position=position,
+                )
+                pk += 1
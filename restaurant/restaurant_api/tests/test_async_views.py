@@ -0,0 +1,101 @@
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.middleware import QueryBudgetExceeded
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+from restaurant.restaurant_api.views import RestaurantViewSet
+
+from .test_views import UserTestCase
+
+
+@override_settings(ASYNC_VIEWS_THREAD_SENSITIVE=True)
+class AsyncViewTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        cls.restaurant = Restaurant.objects.create(name='Russian wolf',
+                                                   address=cls.address)
+        cls.person = Person.objects.create(firstname='Test', surname='Test')
+        cls.employee = Employee.objects.create(
+            restaurant=cls.restaurant, person=cls.person,
+            position=Positions.COOK,
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.async_client.login(username=self.username,
+                                password=self.password)
+
+    def get_cases(self):
+        return (
+            ('person-list', {}),
+            ('person-detail', {'pk': self.person.pk}),
+            ('address-list', {}),
+            ('address-detail', {'pk': self.address.pk}),
+            ('restaurant-list', {}),
+            ('restaurant-detail', {'name': self.restaurant.name}),
+            ('restaurant-get-random-restaurant', {}),
+            ('employee-list', {}),
+            ('employee-detail', {'pk': self.employee.pk}),
+        )
+
+    async def test_same_responses_as_sync_views(self):
+        for name, kwargs in self.get_cases():
+            with self.subTest(name):
+                response = await self.async_client.get(
+                    reverse('async-' + name, kwargs=kwargs)
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                expected = await sync_to_async(self.client.get)(
+                    reverse(name, kwargs=kwargs)
+                )
+                self.assertEqual(json.loads(response.content),
+                                 json.loads(expected.content))
+
+    async def test_create(self):
+        response = await self.async_client.post(
+            reverse('async-person-list'),
+            data={'firstname': 'Async', 'surname': 'Test'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(json.loads(response.content)['firstname'], 'Async')
+
+    async def test_not_allowed_methods(self):
+        response = await self.async_client.delete(
+            reverse('async-person-detail', kwargs={'pk': self.person.pk})
+        )
+        self.assertEqual(response.status_code,
+                         status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def test_not_authenticated(self):
+        await sync_to_async(self.async_client.logout)()
+        response = await self.async_client.get(reverse('async-person-list'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_not_modified(self):
+        url = reverse('async-restaurant-list')
+        response = await self.async_client.get(url)
+        # Async client of Django 3.1 takes extra arguments as headers.
+        response = await self.async_client.get(
+            url, **{'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_query_budget(self):
+        budgets = dict(RestaurantViewSet.query_budgets, list=1)
+        with mock.patch.object(RestaurantViewSet, 'query_budgets', budgets):
+            with self.assertRaisesMessage(QueryBudgetExceeded,
+                                          'budget is 1'):
+                await self.async_client.get(reverse('async-restaurant-list'))
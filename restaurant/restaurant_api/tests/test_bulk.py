@@ -0,0 +1,227 @@
+import json
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.leaderboards import get_leaderboard
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+
+from .test_views import UserTestCase
+
+
+class BulkViewTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.person_url = reverse('person-bulk')
+        cls.employee_url = reverse('employee-bulk')
+        cls.address_url = reverse('address-bulk')
+        cls.restaurant = Restaurant.objects.create(name='Russian wolf')
+        cls.persons = [
+            Person.objects.create(firstname='Test{}'.format(number),
+                                  surname='Test')
+            for number in range(3)
+        ]
+
+    def send(self, method, url, data):
+        return getattr(self.client, method)(
+            url, data=json.dumps(data), content_type='application/json'
+        )
+
+    def get_employees_batch(self, persons):
+        return [
+            {
+                'restaurant': self.restaurant.id,
+                'person': person.id,
+                'position': Positions.COOK,
+            } for person in persons
+        ]
+
+    def test_bulk_create_persons(self):
+        response = self.send('post', self.person_url, [
+            {'firstname': 'New{}'.format(number), 'surname': 'Test'}
+            for number in range(5)
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(
+            Person.objects.filter(firstname__startswith='New').count(), 5
+        )
+
+    def test_bulk_create_with_invalid_items(self):
+        response = self.send('post', self.person_url, [
+            {'firstname': 'New', 'surname': 'Test'},
+            {'surname': 'Test'},
+            {'firstname': 'New', 'surname': 'Test', 'date_of_birth': 1},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(str(response.data[1]['firstname'][0]),
+                         'This field is required.')
+        self.assertIn('date_of_birth', response.data[2])
+        self.assertFalse(Person.objects.filter(firstname='New').exists())
+
+    def test_bulk_create_employees(self):
+        response = self.send('post', self.employee_url,
+                             self.get_employees_batch(self.persons))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Employee.objects.count(), 3)
+
+    def test_bulk_create_employees_with_not_existing_person(self):
+        batch = self.get_employees_batch(self.persons[:1])
+        batch.append(dict(batch[0], person=1000))
+        response = self.send('post', self.employee_url, batch)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(str(response.data[1]['person'][0]),
+                         'Invalid pk "1000" - object does not exist.')
+        self.assertEqual(Employee.objects.count(), 0)
+
+    def test_bulk_create_employees_not_unique(self):
+        Employee.objects.create(restaurant=self.restaurant,
+                                person=self.persons[0],
+                                position=Positions.DIRECTOR)
+        batch = self.get_employees_batch(self.persons)
+        batch.append(batch[-1])
+        response = self.send('post', self.employee_url, batch)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        message = 'The fields restaurant, person must make a unique set.'
+        self.assertEqual(
+            [
+                [str(error) for error in item.get('non_field_errors', [])]
+                for item in response.data
+            ],
+            [[message], [], [], [message]],
+        )
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_bulk_create_employees_queries_count(self):
+        Person.objects.bulk_create([
+            Person(firstname='New{}'.format(number), surname='Test')
+            for number in range(50)
+        ])
+        persons = list(Person.objects.filter(firstname__startswith='New'))
+        counts = []
+        for batch in (persons[:5], persons[5:]):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.send('post', self.employee_url,
+                                     self.get_employees_batch(batch))
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_update_persons(self):
+        response = self.send('put', self.person_url, [
+            {'id': person.id, 'firstname': 'Updated', 'surname': 'Test'}
+            for person in self.persons[:2]
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Person.objects.filter(firstname='Updated').count(), 2
+        )
+
+    def test_bulk_partial_update_employees(self):
+        Employee.objects.bulk_create([
+            Employee(restaurant=self.restaurant, person=person,
+                     position=Positions.COOK)
+            for person in self.persons
+        ])
+        employees = list(Employee.objects.order_by('id'))
+        response = self.send('patch', self.employee_url, [
+            {'id': employee.id, 'position': Positions.WAITER}
+            for employee in employees
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Employee.objects.filter(position=Positions.WAITER).count(), 3
+        )
+
+    def test_bulk_update_not_found(self):
+        response = self.send('patch', self.person_url, [
+            {'id': self.persons[0].id, 'firstname': 'Updated'},
+            {'id': 1000, 'firstname': 'Updated'},
+            {'firstname': 'Updated'},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(str(response.data[1]['id'][0]), 'Not found.')
+        self.assertEqual(str(response.data[2]['id'][0]), 'Not found.')
+        self.assertFalse(Person.objects.filter(firstname='Updated').exists())
+
+    def test_bulk_delete_persons(self):
+        response = self.send('delete', self.person_url,
+                             [person.id for person in self.persons[:2]])
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(Person.objects.count(), 1)
+
+    def test_bulk_delete_employees_queries_count(self):
+        persons = Person.objects.bulk_create([
+            Person(firstname='New{}'.format(number), surname='Test')
+            for number in range(22)
+        ])
+        Employee.objects.bulk_create([
+            Employee(restaurant=self.restaurant, person=person,
+                     position=Positions.COOK)
+            for person in Person.objects.filter(firstname__startswith='New')
+        ])
+        self.assertEqual(len(persons), 22)
+        employees = list(Employee.objects.values_list('id', flat=True))
+        counts = []
+        for batch in (employees[:2], employees[2:-1]):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.send('delete', self.employee_url, batch)
+            self.assertEqual(response.status_code,
+                             status.HTTP_204_NO_CONTENT)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+        self.assertEqual(Employee.objects.count(), 1)
+
+    def test_bulk_address_changes_update_leaderboards(self):
+        address = Address.objects.create(
+            country='RU', province='Moscow', city='Moscow', street='Arbat',
+            house='1',
+        )
+        restaurant = Restaurant.objects.create(
+            name='Brown bear', cuisine='Russian', rating=90, address=address,
+        )
+        entry = {'id': restaurant.id, 'name': 'Brown bear', 'rating': 90}
+        self.assertEqual(get_leaderboard(country='RU'), [entry])
+
+        response = self.send('patch', self.address_url,
+                             [{'id': address.id, 'country': 'DE'}])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_leaderboard(country='RU'), [])
+        self.assertEqual(get_leaderboard('Russian', 'DE'), [entry])
+
+        response = self.send('delete', self.address_url, [address.id])
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Restaurant.objects.filter(pk=restaurant.pk).exists())
+        self.assertEqual(get_leaderboard('Russian'), [])
+        self.assertEqual(get_leaderboard(country='DE'), [])
+
+    def test_bulk_delete_not_found(self):
+        response = self.send('delete', self.person_url,
+                             [self.persons[0].id, 1000])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        self.assertEqual(str(response.data[1]['id'][0]), 'Not found.')
+        self.assertEqual(Person.objects.count(), 3)
+
+    def test_bulk_not_a_list(self):
+        response = self.send('post', self.person_url,
+                             {'firstname': 'New', 'surname': 'Test'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(API_MAX_BULK_SIZE=2)
+    def test_bulk_too_large(self):
+        response = self.send('delete', self.person_url,
+                             [person.id for person in self.persons])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            str(response.data['non_field_errors'][0]),
+            'Ensure this list has no more than 2 items.',
+        )
@@ -0,0 +1,134 @@
+import json
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.cache import response_cache
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+
+from .test_views import UserTestCase
+
+
+class ResponseCacheTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.restaurant_url = reverse('restaurant-list')
+        cls.employee_url = reverse('employee-list')
+        cls.address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        cls.restaurant = Restaurant.objects.create(name='Russian wolf',
+                                                   address=cls.address)
+        cls.person = Person.objects.create(firstname='Test', surname='Test')
+        cls.employee = Employee.objects.create(
+            restaurant=cls.restaurant, person=cls.person,
+            position=Positions.COOK,
+        )
+
+    def assertCached(self, url, cached=True):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'HIT' if cached else 'MISS')
+        return response
+
+    def test_list_is_cached(self):
+        first = self.assertCached(self.restaurant_url, cached=False)
+        second = self.assertCached(self.restaurant_url)
+        self.assertEqual(first.data, second.data)
+        with self.assertNumQueries(2):
+            self.assertCached(self.restaurant_url)
+
+    def test_restaurant_save_invalidates_lists(self):
+        self.assertCached(self.restaurant_url, cached=False)
+        self.assertCached(self.employee_url, cached=False)
+        self.restaurant.rating = 10
+        self.restaurant.save()
+        response = self.assertCached(self.restaurant_url, cached=False)
+        self.assertEqual(response.data['results'][0]['rating'], 10)
+        self.assertCached(self.employee_url, cached=False)
+
+    def test_address_save_invalidates_restaurants(self):
+        self.assertCached(self.restaurant_url, cached=False)
+        self.assertCached(self.employee_url, cached=False)
+        self.address.city = 'Moscow'
+        self.address.save()
+        response = self.assertCached(self.restaurant_url, cached=False)
+        self.assertIn('Moscow', response.data['results'][0]['full_address'])
+        self.assertCached(self.employee_url)
+
+    def test_person_save_invalidates_lists(self):
+        self.assertCached(self.employee_url, cached=False)
+        self.person.surname = 'Renamed'
+        self.person.save()
+        response = self.assertCached(self.employee_url, cached=False)
+        self.assertEqual(response.data['results'][0]['employee_name'],
+                         'Renamed Test')
+
+    def test_not_employed_person_save_keeps_lists(self):
+        self.assertCached(self.restaurant_url, cached=False)
+        Person.objects.create(firstname='Test2', surname='Test2')
+        self.assertCached(self.restaurant_url)
+
+    def test_employee_delete_invalidates_restaurant_detail(self):
+        url = reverse('restaurant-detail', kwargs={'name': 'Russian wolf'})
+        self.assertCached(url, cached=False)
+        self.assertCached(url)
+        self.employee.delete()
+        response = self.assertCached(url, cached=False)
+        self.assertEqual(response.data['employees'], [])
+
+    def test_employees_m2m_change_invalidates_restaurants(self):
+        self.assertCached(self.restaurant_url, cached=False)
+        person = Person.objects.create(firstname='Test2', surname='Test2')
+        self.restaurant.employees.add(
+            person, through_defaults={'position': Positions.WAITER}
+        )
+        response = self.assertCached(self.restaurant_url, cached=False)
+        self.assertEqual(len(response.data['results'][0]['employees']), 2)
+
+    def test_restaurant_rename_invalidates_old_detail(self):
+        url = reverse('restaurant-detail', kwargs={'name': 'Russian wolf'})
+        self.assertCached(url, cached=False)
+        self.restaurant.name = 'Russian wolf2'
+        self.restaurant.save()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_endpoint_invalidates_lists(self):
+        self.assertCached(self.employee_url, cached=False)
+        response = self.client.patch(
+            reverse('employee-bulk'),
+            data=json.dumps([
+                {'id': self.employee.id, 'position': Positions.DIRECTOR}
+            ]),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.assertCached(self.employee_url, cached=False)
+        self.assertEqual(response.data['results'][0]['position_name'],
+                         'Director')
+
+    def test_stream_is_not_cached(self):
+        response = self.client.get(self.restaurant_url, {'stream': ''})
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.has_header('X-Cache'))
+
+    def test_cache_stats(self):
+        url = reverse('cache-stats')
+        self.assertEqual(self.client.get(url).status_code,
+                         status.HTTP_403_FORBIDDEN)
+        hits = response_cache.stats().get(
+            'restaurant-list', {'hits': 0}
+        )['hits']
+        self.assertCached(self.restaurant_url, cached=False)
+        self.assertCached(self.restaurant_url)
+        User.objects.create_superuser(username='admin', password='admin')
+        self.client.login(username='admin', password='admin')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['restaurant-list']['hits'], hits + 1)
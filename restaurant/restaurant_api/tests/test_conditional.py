@@ -0,0 +1,158 @@
+import json
+
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.conditional import etag_matches, get_etag
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+
+from .test_views import UserTestCase
+
+
+class EtagMatchesTestCase(UserTestCase):
+
+    def test_etag_matches(self):
+        etag = get_etag('test')
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(etag, '"other", {}'.format(etag)))
+        self.assertTrue(etag_matches(etag, '*'))
+        self.assertFalse(etag_matches(etag, '"other"'))
+        self.assertFalse(etag_matches(etag, 'W/{}'.format(etag)))
+        self.assertTrue(etag_matches(etag, 'W/{}'.format(etag), weak=True))
+
+
+class ConditionalViewTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        cls.restaurant = Restaurant.objects.create(name='Russian wolf',
+                                                   address=cls.address)
+        cls.person = Person.objects.create(firstname='Test', surname='Test')
+        cls.employee = Employee.objects.create(
+            restaurant=cls.restaurant, person=cls.person,
+            position=Positions.COOK,
+        )
+        cls.restaurant_list_url = reverse('restaurant-list')
+        cls.restaurant_url = reverse('restaurant-detail',
+                                     kwargs={'name': 'Russian wolf'})
+        cls.employee_list_url = reverse('employee-list')
+        cls.person_url = reverse('person-detail',
+                                 kwargs={'pk': cls.person.pk})
+
+    def get_etag(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response['ETag']
+
+    def assertNotModified(self, url, etag, modified=False):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK if modified else status.HTTP_304_NOT_MODIFIED
+        )
+        return response
+
+    def test_not_modified(self):
+        urls = (
+            self.restaurant_list_url, self.restaurant_url,
+            self.employee_list_url, self.person_url,
+            reverse('person-list'), reverse('address-list'),
+            reverse('address-detail', kwargs={'pk': self.address.pk}),
+            reverse('employee-detail', kwargs={'pk': self.employee.pk}),
+        )
+        for url in urls:
+            with self.subTest(url):
+                etag = self.get_etag(url)
+                response = self.assertNotModified(url, etag)
+                self.assertEqual(response['ETag'], etag)
+                self.assertFalse(response.content)
+
+    def test_cached_response_not_modified(self):
+        etag = self.get_etag(self.restaurant_list_url)
+        with self.assertNumQueries(2):
+            response = self.assertNotModified(self.restaurant_list_url,
+                                              etag)
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_address_change_modifies_restaurant_list(self):
+        etag = self.get_etag(self.restaurant_list_url)
+        detail_etag = self.get_etag(self.restaurant_url)
+        self.address.city = 'Moscow'
+        self.address.save()
+        response = self.assertNotModified(self.restaurant_list_url, etag,
+                                          modified=True)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertNotModified(self.restaurant_url, detail_etag)
+
+    def test_person_change_modifies_lists(self):
+        restaurant_etag = self.get_etag(self.restaurant_list_url)
+        employee_etag = self.get_etag(self.employee_list_url)
+        Person.objects.get(pk=self.person.pk).save()
+        self.assertNotModified(self.restaurant_list_url, restaurant_etag,
+                               modified=True)
+        self.assertNotModified(self.employee_list_url, employee_etag,
+                               modified=True)
+
+    def test_employee_delete_modifies_restaurant(self):
+        etag = self.get_etag(self.restaurant_url)
+        Employee.objects.filter(pk=self.employee.pk).delete()
+        self.assertNotModified(self.restaurant_url, etag, modified=True)
+
+    def test_other_page_is_not_modified(self):
+        Restaurant.objects.create(name='Another')
+        url = '{}?page_size=1'.format(self.restaurant_list_url)
+        etag = self.get_etag(url)
+        next_url = self.client.get(url).data['next']
+        next_etag = self.get_etag(next_url)
+        self.address.save()
+        self.assertNotModified(url, etag)
+        self.assertNotModified(next_url, next_etag, modified=True)
+
+    def test_bulk_update_modifies_person(self):
+        etag = self.get_etag(self.person_url)
+        response = self.client.patch(
+            reverse('person-bulk'),
+            data=json.dumps([{'id': self.person.pk, 'surname': 'Renamed'}]),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotModified(self.person_url, etag, modified=True)
+
+    def test_missing_object(self):
+        url = reverse('person-detail', kwargs={'pk': 0})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_if_match(self):
+        etag = self.get_etag(self.person_url)
+        response = self.client.patch(self.person_url, {'surname': 'First'},
+                                     HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response['ETag'], self.get_etag(self.person_url))
+
+        response = self.client.patch(self.person_url, {'surname': 'Second'},
+                                     HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(Person.objects.get(pk=self.person.pk).surname,
+                         'First')
+
+    def test_put_if_match(self):
+        etag = self.get_etag(self.restaurant_url)
+        data = {'name': 'Russian wolf', 'cuisine': 'Russian',
+                'rating': 10, 'address': self.address.pk}
+        response = self.client.put(self.restaurant_url, data,
+                                   HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code,
+                         status.HTTP_412_PRECONDITION_FAILED)
+        response = self.client.put(self.restaurant_url, data,
+                                   HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rating'], 10)
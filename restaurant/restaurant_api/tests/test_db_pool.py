@@ -0,0 +1,168 @@
+import threading
+import time
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from psycopg2 import extensions
+from rest_framework import status
+
+from restaurant.db_pool.base import reset_connection
+from restaurant.db_pool.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+
+    def get_pool(self, **kwargs):
+        self.connections = []
+
+        def connect():
+            self.connections.append(FakeConnection())
+            return self.connections[-1]
+
+        return ConnectionPool(connect, **kwargs)
+
+    def test_reuse(self):
+        pool = self.get_pool(min_size=2, max_size=3)
+        pool.open()
+        self.assertEqual(len(self.connections), 2)
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(len(self.connections), 2)
+        stats = pool.stats()
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['in_use'], 1)
+        self.assertEqual(stats['idle'], 1)
+
+    def test_timeout(self):
+        pool = self.get_pool(max_size=2, timeout=0.05)
+        checked_out = [pool.getconn(), pool.getconn()]
+        self.assertEqual(pool.stats()['saturation'], 1)
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+        stats = pool.stats()
+        self.assertEqual(stats['timeouts'], 1)
+        self.assertEqual(stats['waits'], 1)
+        pool.putconn(checked_out[0])
+        self.assertIs(pool.getconn(), checked_out[0])
+
+    def test_wait(self):
+        pool = self.get_pool(max_size=1, timeout=5)
+        first = pool.getconn()
+        timer = threading.Timer(0.05, pool.putconn, [first])
+        timer.start()
+        self.assertIs(pool.getconn(), first)
+        timer.join()
+        stats = pool.stats()
+        self.assertEqual(stats['waits'], 1)
+        self.assertGreater(stats['max_wait_time'], 0.01)
+        self.assertGreaterEqual(stats['wait_time'], stats['max_wait_time'])
+
+    def test_check(self):
+        pool = self.get_pool(max_size=1)
+        pool.check = lambda connection: False
+        first = pool.getconn()
+        pool.putconn(first)
+        second = pool.getconn()
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()['failed_checks'], 1)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_check_after(self):
+        pool = self.get_pool(max_size=1, check_after=60)
+        pool.check = mock.Mock(return_value=False)
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertIs(pool.getconn(), first)
+        pool.check.assert_not_called()
+
+    def test_reset(self):
+        pool = self.get_pool(max_size=1)
+        pool.reset = mock.Mock(side_effect=[True, False])
+        first = pool.getconn()
+        pool.putconn(first)
+        self.assertFalse(first.closed)
+        pool.putconn(pool.getconn())
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_max_idle(self):
+        pool = self.get_pool(min_size=1, max_size=3, max_idle=0.05)
+        checked_out = [pool.getconn() for _ in range(3)]
+        for pooled in checked_out:
+            pool.putconn(pooled)
+        time.sleep(0.06)
+        pool.putconn(pool.getconn())
+        self.assertEqual(pool.stats()['size'], 1)
+        self.assertEqual(sum(pooled.closed for pooled in checked_out), 2)
+
+    def test_close(self):
+        pool = self.get_pool(min_size=1, max_size=2)
+        pool.open()
+        checked_out = pool.getconn()
+        idle = pool.getconn()
+        pool.putconn(idle)
+        pool.close()
+        self.assertTrue(idle.closed)
+        pool.putconn(checked_out)
+        self.assertTrue(checked_out.closed)
+        self.assertEqual(pool.stats()['size'], 0)
+
+    def test_sizes(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(FakeConnection, min_size=2, max_size=1)
+
+    def test_reset_connection(self):
+        pooled = mock.Mock(closed=False)
+        pooled.info.transaction_status = extensions.TRANSACTION_STATUS_INERROR
+        self.assertTrue(reset_connection(pooled))
+        pooled.rollback.assert_called_once_with()
+        pooled.info.transaction_status = extensions.TRANSACTION_STATUS_UNKNOWN
+        self.assertFalse(reset_connection(pooled))
+
+
+class DatabasePoolTestCase(TestCase):
+
+    def test_stats_view(self):
+        url = reverse('db-pool-stats')
+        User.objects.create_superuser(username='admin', password='admin')
+        self.client.login(username='admin', password='admin')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        if connection.settings_dict['ENGINE'] == 'restaurant.db_pool':
+            self.assertGreaterEqual(response.data['default']['in_use'], 1)
+
+    @skipUnless(connection.settings_dict['ENGINE'] == 'restaurant.db_pool',
+                'Database is not pooled.')
+    def test_reuse_connection(self):
+        def get_backend_pid():
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_backend_pid()')
+                return cursor.fetchone()[0]
+
+        # Test case keeps connection in a transaction, use another thread.
+        def run():
+            pids.append(get_backend_pid())
+            connection.close()
+            pids.append(get_backend_pid())
+            connection.close()
+
+        pids = []
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        self.assertEqual(len(pids), 2)
+        self.assertEqual(pids[0], pids[1])
@@ -0,0 +1,99 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.fieldsets import trim_queryset
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+from restaurant.restaurant_api.serializers import RestaurantFullInfoSerializer
+from restaurant.restaurant_api.views import RestaurantViewSet
+
+from .test_views import UserTestCase
+
+
+class SparseFieldsTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10', latitude=55.79, longitude=49.12,
+        )
+        cls.restaurant = Restaurant.objects.create(
+            name='Wolf', cuisine='Russian', rating=90, address=address,
+        )
+        cls.person = Person.objects.create(firstname='Ivan',
+                                           surname='Ivanov',
+                                           phone='+79999999999')
+        Employee.objects.create(restaurant=cls.restaurant,
+                                person=cls.person, position=Positions.COOK)
+
+    def get(self, name, params, kwargs=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(name, kwargs=kwargs), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, ' '.join(
+            query['sql'] for query in context.captured_queries
+        )
+
+    def test_restaurant_list(self):
+        data, sql = self.get('restaurant-list', {'fields': 'name,rating'})
+        self.assertEqual(data['results'], [{'name': 'Wolf', 'rating': 90}])
+        self.assertNotIn('restaurant_api_employee', sql)
+        self.assertNotIn('restaurant_api_address', sql)
+
+    def test_restaurant_stream(self):
+        response = self.client.get(reverse('restaurant-list'),
+                                   {'fields': 'name,employees', 'stream': ''})
+        self.assertEqual(
+            b''.join(response.streaming_content).decode(),
+            '[{"name":"Wolf","employees":["Ivanov Ivan"]}]',
+        )
+
+    def test_restaurant_detail(self):
+        data, _ = self.get('restaurant-detail', {'fields': 'name,cuisine'},
+                           kwargs={'name': self.restaurant.name})
+        self.assertEqual(data, {'name': 'Wolf', 'cuisine': 'Russian'})
+
+    def test_random_restaurant(self):
+        data, sql = self.get('restaurant-get-random-restaurant',
+                             {'fields': 'full_address'})
+        self.assertEqual(list(data), ['full_address'])
+        self.assertNotIn('restaurant_api_employee', sql)
+
+    def test_nearby(self):
+        data, _ = self.get('restaurant-nearby', {
+            'lat': 55.79, 'lon': 49.12, 'fields': 'name',
+        })
+        self.assertEqual(data, [{'name': 'Wolf', 'distance': 0.0}])
+
+    def test_employee_list(self):
+        data, sql = self.get('employee-list', {'fields': 'id,position_name'})
+        self.assertEqual(list(data['results'][0]), ['id', 'position_name'])
+        self.assertNotIn('restaurant_api_person', sql)
+
+    def test_person_detail(self):
+        data, sql = self.get('person-detail', {'fields': 'surname'},
+                             kwargs={'pk': self.person.pk})
+        self.assertEqual(data, {'surname': 'Ivanov'})
+        self.assertNotIn('"phone"', sql)
+
+    def test_unknown_fields(self):
+        for fields in ('name,unknown', ','):
+            with self.subTest(fields):
+                response = self.client.get(reverse('restaurant-list'),
+                                           {'fields': fields})
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+
+    def test_trim_queryset(self):
+        queryset = trim_queryset(
+            RestaurantViewSet.queryset, RestaurantFullInfoSerializer().fields,
+            ('name', 'full_address'),
+        )
+        self.assertEqual(queryset.query.select_related, {'address': {}})
+        self.assertEqual(queryset._prefetch_related_lookups, ())
+        self.assertEqual(queryset.query.deferred_loading,
+                         ({'id', 'name', 'address'}, False))
@@ -0,0 +1,112 @@
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+
+from .test_views import UserTestCase
+
+
+class FilterTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        kazan = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        berlin = Address.objects.create(
+            country='DE', province='Berlin', city='Berlin', street='Test',
+            house='1',
+        )
+        cls.wolf = Restaurant.objects.create(
+            name='Wolf', cuisine='Russian', rating=90, address=kazan,
+        )
+        cls.bear = Restaurant.objects.create(
+            name='Bear', cuisine='Russian', rating=60, address=berlin,
+        )
+        Restaurant.objects.create(name='Pizza', cuisine='Italian',
+                                  rating=70, address=kazan)
+        cls.ivanov = Person.objects.create(
+            firstname='Ivan', surname='Ivanov',
+            date_of_birth=date(1980, 5, 1),
+        )
+        cls.ivanova = Person.objects.create(
+            firstname='Anna', surname='Ivanova',
+            date_of_birth=date(1990, 5, 1),
+        )
+        Person.objects.create(firstname='Petr', surname='Petrov')
+        Employee.objects.create(restaurant=cls.wolf, person=cls.ivanov,
+                                position=Positions.COOK)
+        Employee.objects.create(restaurant=cls.wolf, person=cls.ivanova,
+                                position=Positions.WAITER)
+        Employee.objects.create(restaurant=cls.bear, person=cls.ivanova,
+                                position=Positions.COOK)
+
+    def get_results(self, name, params, field):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item[field] for item in response.data['results']]
+
+    def test_restaurant_filters(self):
+        for params, names in (
+            ({'rating_min': 65}, ['Pizza', 'Wolf']),
+            ({'rating_min': 65, 'rating_max': 80}, ['Pizza']),
+            ({'cuisine': 'Russian'}, ['Bear', 'Wolf']),
+            ({'country': 'ru'}, ['Pizza', 'Wolf']),
+            ({'country': 'RU', 'cuisine': 'Russian'}, ['Wolf']),
+        ):
+            with self.subTest(params):
+                self.assertEqual(
+                    self.get_results('restaurant-list', params, 'name'), names
+                )
+
+    def test_employee_filters(self):
+        for params, count in (
+            ({'restaurant': self.wolf.pk}, 2),
+            ({'position': Positions.COOK}, 2),
+            ({'restaurant': self.wolf.pk, 'position': Positions.COOK}, 1),
+            ({'person': self.ivanova.pk}, 2),
+            ({'person': self.ivanov.pk, 'restaurant': self.bear.pk}, 0),
+        ):
+            with self.subTest(params):
+                self.assertEqual(
+                    len(self.get_results('employee-list', params, 'id')),
+                    count,
+                )
+
+    def test_person_filters(self):
+        for params, firstnames in (
+            ({'surname': 'Ivanov'}, ['Ivan', 'Anna']),
+            ({'surname': 'Ivanova'}, ['Anna']),
+            ({'date_of_birth_min': '1985-01-01'}, ['Anna']),
+            ({'surname': 'Iv', 'date_of_birth_max': '1985-01-01'}, ['Ivan']),
+        ):
+            with self.subTest(params):
+                self.assertEqual(
+                    self.get_results('person-list', params, 'firstname'),
+                    firstnames,
+                )
+
+    def test_invalid_filters(self):
+        for name, params in (
+            ('restaurant-list', {'rating_min': 'high'}),
+            ('restaurant-list', {'rating_min': 80, 'rating_max': 70}),
+            ('restaurant-list', {'country': 'Russia'}),
+            ('employee-list', {'position': 10}),
+            ('person-list', {'date_of_birth_min': '1 May'}),
+        ):
+            with self.subTest(params):
+                response = self.client.get(reverse(name), params)
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+
+    def test_details_are_not_filtered(self):
+        response = self.client.get(
+            reverse('restaurant-detail', kwargs={'name': 'Bear'}),
+            {'country': 'RU'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,99 @@
+from django.test import SimpleTestCase
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.geo import (GEO_GRID_COLUMNS, get_cell_ranges,
+                                           get_geo_cell)
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+
+from .test_views import UserTestCase
+
+
+class GeoCellTestCase(SimpleTestCase):
+
+    def test_get_geo_cell(self):
+        self.assertIsNone(get_geo_cell(None, 10))
+        self.assertEqual(get_geo_cell(-90, -180), 0)
+        self.assertEqual(get_geo_cell(-89.95, 180), 0)
+        self.assertEqual(get_geo_cell(-89.85, -179.75), GEO_GRID_COLUMNS + 2)
+
+    def test_cell_ranges_cover_circle(self):
+        ranges = get_cell_ranges(55.79, 49.12, 5000)
+        self.assertEqual(len(ranges), 2)
+        for latitude, longitude in ((55.79, 49.12), (55.83, 49.19),
+                                    (55.75, 49.05)):
+            cell = get_geo_cell(latitude, longitude)
+            self.assertTrue(any(low <= cell <= high for low, high in ranges))
+        far = get_geo_cell(55.79, 49.5)
+        self.assertFalse(any(low <= far <= high for low, high in ranges))
+
+    def test_cell_ranges_cross_antimeridian(self):
+        ranges = get_cell_ranges(0.05, 179.99, 5000)
+        self.assertEqual(len(ranges), 2)
+        for longitude in (179.96, -179.98):
+            cell = get_geo_cell(0.05, longitude)
+            self.assertTrue(any(low <= cell <= high for low, high in ranges))
+
+    def test_cell_ranges_around_pole(self):
+        ranges = get_cell_ranges(89.99, 0, 5000)
+        self.assertTrue(all(high - low == GEO_GRID_COLUMNS - 1
+                            for low, high in ranges))
+
+
+class NearbyTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url = reverse('restaurant-nearby')
+        points = {
+            'Kremlin': (55.7520, 37.6175),
+            'Arbat': (55.7494, 37.5910),
+            'Sokolniki': (55.7930, 37.6740),
+            'Kazan': (55.7961, 49.1064),
+        }
+        for name, (latitude, longitude) in points.items():
+            address = Address.objects.create(
+                country='RU', province='Test', city=name, street='Test',
+                house='1', latitude=latitude, longitude=longitude,
+            )
+            Restaurant.objects.create(name=name, address=address)
+        Restaurant.objects.create(name='Nowhere')
+        person = Person.objects.create(firstname='Test', surname='Test')
+        Employee.objects.create(
+            restaurant=Restaurant.objects.get(name='Arbat'), person=person,
+            position=Positions.COOK,
+        )
+
+    def get_nearby(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_nearest_first(self):
+        data = self.get_nearby(lat=55.7525, lon=37.6231, radius=10000)
+        self.assertEqual([row['name'] for row in data],
+                         ['Kremlin', 'Arbat', 'Sokolniki'])
+        distances = [row['distance'] for row in data]
+        self.assertEqual(distances, sorted(distances))
+        self.assertAlmostEqual(distances[0], 354.6, delta=1)
+        self.assertAlmostEqual(distances[1], 2038.2, delta=1)
+        self.assertEqual(data[1]['employees'], ['Test Test'])
+        self.assertIn('full_address', data[1])
+
+    def test_radius_and_limit(self):
+        data = self.get_nearby(lat=55.7525, lon=37.6231, radius=1000)
+        self.assertEqual([row['name'] for row in data], ['Kremlin'])
+        data = self.get_nearby(lat=55.7525, lon=37.6231, radius=50000,
+                               limit=2)
+        self.assertEqual([row['name'] for row in data], ['Kremlin', 'Arbat'])
+
+    def test_invalid_query(self):
+        for params in ({'lat': 55.75}, {'lat': 91, 'lon': 0},
+                       {'lat': 0, 'lon': 0, 'radius': 10 ** 7},
+                       {'lat': 0, 'lon': 0, 'limit': 0}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,142 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api import leaderboards
+from restaurant.restaurant_api.leaderboards import (build_leaderboards,
+                                                    get_leaderboard)
+from restaurant.restaurant_api.models import Address, Leaderboard, Restaurant
+from restaurant.restaurant_api.signals import bulk_changed
+
+from .test_views import UserTestCase
+
+
+def get_names(cuisine='', country=''):
+    return [entry['name'] for entry in get_leaderboard(cuisine, country)]
+
+
+@mock.patch.object(leaderboards, 'LEADERBOARD_SIZE', 2)
+class LeaderboardTestCase(TestCase):
+
+    @classmethod
+    @mock.patch.object(leaderboards, 'LEADERBOARD_SIZE', 2)
+    def setUpTestData(cls):
+        cls.kazan = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        cls.berlin = Address.objects.create(
+            country='DE', province='Berlin', city='Berlin', street='Test',
+            house='1',
+        )
+        for name, cuisine, rating, address in (
+            ('Wolf', 'Russian', 90, cls.kazan),
+            ('Bear', 'Russian', 80, cls.kazan),
+            ('Fox', 'Russian', 70, cls.berlin),
+            ('Pizza', 'Italian', 60, cls.kazan),
+            ('Unrated', 'Russian', None, cls.kazan),
+        ):
+            Restaurant.objects.create(name=name, cuisine=cuisine,
+                                      rating=rating, address=address)
+
+    def test_build_leaderboards(self):
+        rows = [
+            {'id': 1, 'name': 'A', 'rating': 3, 'cuisine': 'X',
+             'country': 'RU'},
+            {'id': 2, 'name': 'B', 'rating': 2, 'cuisine': 'X',
+             'country': ''},
+            {'id': 3, 'name': 'C', 'rating': 1, 'cuisine': 'X',
+             'country': 'RU'},
+        ]
+        boards = build_leaderboards(rows, size=2)
+        self.assertEqual([entry['id'] for entry in boards['X', '']], [1, 2])
+        self.assertEqual([entry['id'] for entry in boards['', 'RU']],
+                         [1, 3])
+        self.assertEqual(boards['X', 'RU'][0],
+                         {'id': 1, 'name': 'A', 'rating': 3})
+
+    def test_boards_follow_writes(self):
+        self.assertEqual(get_names('Russian'), ['Wolf', 'Bear'])
+        self.assertEqual(get_names(country='RU'), ['Wolf', 'Bear'])
+        self.assertEqual(get_names('Russian', 'DE'), ['Fox'])
+        self.assertEqual(get_names('Italian', 'RU'), ['Pizza'])
+
+        fox = Restaurant.objects.get(name='Fox')
+        fox.rating = 100
+        fox.save()
+        self.assertEqual(get_names('Russian'), ['Fox', 'Wolf'])
+
+        # The best restaurant falls out, the next one takes its place.
+        fox.rating = 10
+        fox.save()
+        self.assertEqual(get_names('Russian'), ['Wolf', 'Bear'])
+
+        wolf = Restaurant.objects.get(name='Wolf')
+        wolf.cuisine = 'Italian'
+        wolf.save()
+        self.assertEqual(get_names('Russian'), ['Bear', 'Fox'])
+        self.assertEqual(get_names('Italian'), ['Wolf', 'Pizza'])
+        self.assertEqual(get_names(country='RU'), ['Wolf', 'Bear'])
+
+        Restaurant.objects.get(name='Bear').delete()
+        self.assertEqual(get_names('Russian'), ['Fox'])
+        self.assertEqual(get_names(country='RU'), ['Wolf', 'Pizza'])
+
+    def test_boards_follow_address_country(self):
+        self.berlin.country = 'RU'
+        self.berlin.save()
+        self.assertEqual(get_names('Russian', 'RU'), ['Wolf', 'Bear'])
+        self.assertEqual(get_names('Russian', 'DE'), [])
+        self.assertFalse(Leaderboard.objects.filter(country='DE').exists())
+
+    def test_rebuild_after_bulk_changes(self):
+        Restaurant.objects.filter(name='Pizza').update(rating=100)
+        bulk_changed.send(sender=Restaurant)
+        self.assertEqual(get_names(country='RU'), ['Pizza', 'Wolf'])
+
+    def test_rebuild_command(self):
+        Leaderboard.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_leaderboards', stdout=out)
+        self.assertIn('Rebuilt 7 leaderboards', out.getvalue())
+        self.assertEqual(get_names('Russian'), ['Wolf', 'Bear'])
+
+    def test_read_is_one_query(self):
+        with self.assertNumQueries(1):
+            get_leaderboard('Russian', 'RU')
+
+
+class LeaderboardViewTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url = reverse('restaurant-leaderboard')
+        address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        cls.restaurant = Restaurant.objects.create(
+            name='Wolf', cuisine='Russian', rating=90, address=address,
+        )
+
+    def test_leaderboard(self):
+        response = self.client.get(self.url, {'cuisine': 'Russian',
+                                              'country': 'ru'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'cuisine': 'Russian',
+            'country': 'RU',
+            'results': [{'id': self.restaurant.pk, 'name': 'Wolf',
+                         'rating': 90}],
+        })
+        response = self.client.get(self.url, {'cuisine': 'Unknown'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_key_is_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from restaurant.restaurant_api.loadgen import (HttpConnection,
+                                               get_basic_auth_header, run_load)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = self.headers.get('Authorization', 'anonymous').encode()
+        if self.path == '/missing/':
+            self.send_response(404)
+        else:
+            self.send_response(200)
+        if self.path == '/chunked/':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in (body[:3], body[3:]):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class LoadgenTestCase(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = 'http://127.0.0.1:{}'.format(cls.server.server_port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_connection(self):
+        async def requests():
+            connection = HttpConnection(self.url)
+            try:
+                return [
+                    await connection.request('GET', path, [
+                        ('Authorization', get_basic_auth_header('test:test')),
+                    ])
+                    for path in ('/', '/chunked/', '/missing/')
+                ]
+            finally:
+                await connection.close()
+
+        responses = asyncio.run(requests())
+        self.assertEqual([status for status, _, _ in responses],
+                         [200, 200, 404])
+        self.assertEqual(responses[1][2], b'Basic dGVzdDp0ZXN0')
+        self.assertEqual(responses[0][2], responses[1][2])
+
+    def test_run_load(self):
+        result = asyncio.run(run_load(
+            [self.url + '/', self.url + '/missing/'], 20, 4
+        ))
+        self.assertEqual(result.requests, 20)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.statuses, {200: 10, 404: 10})
+        self.assertGreater(result.rate, 0)
+        self.assertLessEqual(result.percentile(50), result.percentile(99))
+
+    def test_bench_asgi_command(self):
+        out = StringIO()
+        call_command('bench_asgi', wsgi_url=self.url + '/',
+                     asgi_url=self.url + '/chunked/', requests=10,
+                     concurrency=2, stdout=out)
+        self.assertIn('WSGI: ', out.getvalue())
+        self.assertIn('ASGI/WSGI: ', out.getvalue())
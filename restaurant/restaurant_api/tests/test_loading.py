@@ -0,0 +1,136 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant,
+                                              StaffCount)
+
+
+class BulkLoadCommandTestCase(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_file(self, name, content):
+        path = self.directory / name
+        path.write_text(content)
+        return str(path)
+
+    def load(self, **files):
+        out = StringIO()
+        call_command('bulk_load', batch_size=2, stdout=out, **files)
+        return out.getvalue()
+
+    def test_load_all_models(self):
+        addresses = self.write_file(
+            'addresses.csv',
+            'id,country,province,city,street,house,zip_code\n'
+            '10,RU,Tatarstan rep.,Kazan,Pushkina,10,\n'
+            '11,US,California,Los Angeles,Sunset,1,90001\n',
+        )
+        persons = self.write_file('persons.jsonl', '\n'.join(
+            json.dumps(person) for person in (
+                {'id': 20, 'firstname': 'Test', 'surname': 'Test',
+                 'date_of_birth': '2010-10-10'},
+                {'id': 21, 'firstname': 'Test2', 'surname': 'Test2'},
+                {'id': 22, 'firstname': 'Test3', 'surname': 'Test3'},
+            )
+        ))
+        restaurants = self.write_file(
+            'restaurants.csv',
+            'name,address,cuisine,rating\n'
+            'Russian wolf,10,Russian,100\n'
+            'American wolf,11,American,\n'
+            'Lost wolf,99,Russian,10\n',
+        )
+        employees = self.write_file(
+            'employees.csv',
+            'restaurant,person,position\n'
+            'Russian wolf,20,Director\n'
+            'Russian wolf,21,3\n'
+            'American wolf,22,waiter\n'
+            'Lost wolf,22,Cook\n'
+            'American wolf,99,Cook\n',
+        )
+
+        output = self.load(addresses=addresses, persons=persons,
+                           restaurants=restaurants, employees=employees)
+
+        self.assertEqual(Address.objects.count(), 2)
+        self.assertEqual(Person.objects.get(pk=20).date_of_birth.year, 2010)
+        self.assertIsNone(Person.objects.get(pk=21).date_of_birth)
+        self.assertEqual(Restaurant.objects.count(), 2)
+        self.assertEqual(
+            Restaurant.objects.get(name='Russian wolf').address_id, 10
+        )
+        self.assertIsNone(Restaurant.objects.get(name='American wolf').rating)
+        self.assertCountEqual(
+            Employee.objects.values_list('restaurant__name', 'person_id',
+                                         'position'),
+            [
+                ('Russian wolf', 20, Positions.DIRECTOR),
+                ('Russian wolf', 21, Positions.COOK),
+                ('American wolf', 22, Positions.WAITER),
+            ],
+        )
+        self.assertIn('Loaded 2 restaurants', output)
+        self.assertIn('skipped 1 rows', output)
+        self.assertIn('skipped 2 rows', output)
+
+    def test_load_without_files(self):
+        with self.assertRaises(CommandError):
+            self.load()
+
+    def test_load_invalid_file(self):
+        persons = self.write_file(
+            'persons.csv',
+            'firstname,surname,date_of_birth\nTest,Test,yesterday\n',
+        )
+        with self.assertRaises(CommandError):
+            self.load(persons=persons)
+
+    def test_load_mixed_ids(self):
+        persons = self.write_file('persons.csv',
+                                  'id,firstname,surname\n1,A,A\n,B,B\n')
+        with self.assertRaisesMessage(CommandError, 'row 2 differs'):
+            self.load(persons=persons)
+        self.assertFalse(Person.objects.exists())
+
+    def test_load_mixed_ids_of_batches(self):
+        persons = self.write_file(
+            'persons.csv', 'id,firstname,surname\n1,A,A\n2,B,B\n,C,C\n'
+        )
+        with self.assertRaisesMessage(CommandError, 'row 3 differs'):
+            self.load(persons=persons)
+
+    def test_load_partially(self):
+        wolf = Restaurant.objects.create(name='Wolf')
+        persons = [
+            Person.objects.create(firstname=str(number), surname='Test')
+            for number in range(3)
+        ]
+        employees = self.write_file(
+            'employees.csv',
+            'id,restaurant,person,position\n'
+            '1,Wolf,{},Cook\n2,Wolf,{},Cook\n,Wolf,{},Cook\n'.format(
+                *(person.pk for person in persons)
+            ),
+        )
+
+        with self.assertRaisesMessage(CommandError,
+                                      '2 employees written before'):
+            self.load(employees=employees)
+
+        self.assertEqual(Employee.objects.count(), 2)
+        self.assertEqual(
+            StaffCount.objects.get(restaurant=wolf,
+                                   position=Positions.COOK).count,
+            2,
+        )
@@ -0,0 +1,117 @@
+import json
+import random
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import LiveServerTestCase, SimpleTestCase
+
+from restaurant.restaurant_api.loadgen import LoadResult
+from restaurant.restaurant_api.loadtest import (Scenario, compare_summaries,
+                                                summarize_results)
+from restaurant.restaurant_api.management.commands.loadtest import get_paths
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+
+
+def get_summary(rate, p95, errors=0):
+    result = {'requests': 100, 'errors': errors, 'rate': rate, 'p50': 1,
+              'p95': p95, 'p99': p95, 'statuses': {'200': 100}}
+    return {'actions': {'person-list': result}, 'total': result}
+
+
+class ScenarioTestCase(SimpleTestCase):
+
+    def test_requests(self):
+        scenario = Scenario(get_paths(), {
+            'person': [1], 'address': [], 'restaurant': ['Russian wolf'],
+            'employee': [2],
+        }, rng=random.Random(1))
+        requests = [scenario.next_request() for _ in range(500)]
+        actions = {action for action, _, _, _ in requests}
+        self.assertIn('restaurant-get-random-restaurant', actions)
+        self.assertNotIn('address-retrieve', actions)
+        self.assertNotIn('person-destroy', actions)
+        methods = {method for _, method, _, _ in requests}
+        self.assertEqual(methods, {'GET', 'POST', 'PATCH'})
+        self.assertIn(
+            ('restaurant-retrieve', 'GET', '/restaurants/Russian%20wolf/',
+             None),
+            requests,
+        )
+
+        scenario.handle_response('person-create', 201, b'{"id": 5}')
+        scenario.weights = {'person-destroy': 1}
+        self.assertEqual(scenario.next_request(),
+                         ('person-destroy', 'DELETE', '/persons/5/', None))
+
+    def test_summarize_results(self):
+        result = LoadResult()
+        for latency in (0.001, 0.002, 0.003, 0.004):
+            result.add(200, latency)
+        result.elapsed = 2
+        summary = summarize_results({'person-list': result})
+        self.assertEqual(summary['total']['requests'], 4)
+        self.assertEqual(summary['total']['rate'], 2)
+        self.assertEqual(summary['actions']['person-list']['p50'], 2)
+        self.assertEqual(summary['actions']['person-list']['statuses'],
+                         {'200': 4})
+
+    def test_compare_summaries(self):
+        baseline = get_summary(100, 10)
+        self.assertEqual(
+            compare_summaries(baseline, get_summary(95, 10.5)), []
+        )
+        regressions = compare_summaries(baseline, get_summary(80, 20, 1))
+        self.assertIn('person-list: rate fell from 100 to 80 requests/s',
+                      regressions)
+        self.assertIn('total: p95 grew from 10 to 20 ms', regressions)
+        self.assertIn('total: errors grew from 0 to 1', regressions)
+
+
+class LoadTestCommandTestCase(LiveServerTestCase):
+
+    def setUp(self):
+        User.objects.create_user(username='load', password='password')
+        address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        restaurant = Restaurant.objects.create(name='Russian wolf',
+                                               address=address, rating=50)
+        person = Person.objects.create(firstname='Ivan', surname='Ivanov')
+        Employee.objects.create(restaurant=restaurant, person=person,
+                                position=Positions.COOK)
+
+    def test_loadtest_command(self):
+        # One client, SQLite test database locks tables on concurrent
+        # writes.
+        with tempfile.TemporaryDirectory() as directory:
+            report = Path(directory) / 'report.json'
+            out = StringIO()
+            call_command('loadtest', url=self.live_server_url,
+                         user='load:password', requests=80, concurrency=1,
+                         random_seed=1, output=report, stdout=out)
+            summary = json.loads(report.read_text())
+            self.assertEqual(summary['total']['requests'], 80)
+            self.assertEqual(summary['total']['errors'], 0)
+            self.assertFalse(any(
+                status.startswith(('4', '5'))
+                for status in summary['total']['statuses']
+            ), summary['total']['statuses'])
+            self.assertIn('restaurant-get-random-restaurant: ',
+                          out.getvalue())
+            self.assertEqual(Person.objects.count(), 1)
+
+            call_command('loadtest', url=self.live_server_url,
+                         user='load:password', requests=20, concurrency=1,
+                         compare=report, threshold=100000, stdout=out)
+            self.assertIn('No regressions', out.getvalue())
+
+    def test_login_failure(self):
+        with self.assertRaisesMessage(CommandError, 'Cannot log in'):
+            call_command('loadtest', url=self.live_server_url,
+                         user='load:wrong', requests=1, stdout=StringIO())
@@ -0,0 +1,159 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from restaurant.restaurant_api.metrics import ApiMetrics, Counter, Histogram
+from restaurant.restaurant_api.middleware import QueryTracker
+from restaurant.restaurant_api.models import (Employee, Person, Positions,
+                                              Restaurant)
+
+from .test_views import UserTestCase
+
+
+def get_value(text, sample):
+    """Get value of the sample line of metrics text."""
+    for line in text.splitlines():
+        name, _, value = line.rpartition(' ')
+        if name == sample:
+            return float(value)
+    return None
+
+
+class MetricFormatTestCase(SimpleTestCase):
+
+    def test_histogram(self):
+        histogram = Histogram('latency_seconds', 'Latency.', ('view',),
+                              (0.1, 1))
+        histogram.observe(('A',), 0.05)
+        histogram.observe(('A',), 0.1)
+        histogram.observe(('A',), 5)
+        self.assertEqual(histogram.render(), [
+            '# HELP latency_seconds Latency.',
+            '# TYPE latency_seconds histogram',
+            'latency_seconds_bucket{view="A",le="0.1"} 2',
+            'latency_seconds_bucket{view="A",le="1"} 2',
+            'latency_seconds_bucket{view="A",le="+Inf"} 3',
+            'latency_seconds_sum{view="A"} 5.15',
+            'latency_seconds_count{view="A"} 3',
+        ])
+
+    def test_counter(self):
+        counter = Counter('errors_total', 'Errors.', ('path',))
+        counter.inc(('a"b\\',))
+        counter.inc(('a"b\\',), 2)
+        self.assertEqual(counter.render()[2],
+                         'errors_total{path="a\\"b\\\\"} 3')
+
+    def test_api_metrics(self):
+        metrics = ApiMetrics()
+        tracker = QueryTracker()
+        tracker.count, tracker.duration = 3, 0.25
+        metrics.observe(('PersonViewSet', 'list'), 200, 0.5, 100, tracker,
+                        0.125)
+        metrics.observe(('PersonViewSet', 'list'), 500, 0.5)
+        text = metrics.render()
+        labels = '{view="PersonViewSet",action="list"}'
+        self.assertEqual(
+            get_value(text, 'api_request_duration_seconds_count' + labels), 2
+        )
+        self.assertEqual(get_value(text, 'api_db_queries_total' + labels), 3)
+        self.assertEqual(
+            get_value(text, 'api_db_duration_seconds_total' + labels), 0.25
+        )
+        self.assertEqual(get_value(
+            text, 'api_serializer_duration_seconds_total' + labels
+        ), 0.125)
+        self.assertEqual(
+            get_value(text, 'api_response_size_bytes_count' + labels), 1
+        )
+        self.assertEqual(get_value(
+            text,
+            'api_errors_total{view="PersonViewSet",action="list",'
+            'status="500"}',
+        ), 1)
+
+
+class MetricsMiddlewareTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        User.objects.filter(username=cls.username).update(is_staff=True)
+        restaurant = Restaurant.objects.create(name='Russian wolf')
+        person = Person.objects.create(firstname='Ivan', surname='Ivanov')
+        Employee.objects.create(restaurant=restaurant, person=person,
+                                position=Positions.COOK)
+
+    def setUp(self):
+        super().setUp()
+        self.metrics = ApiMetrics()
+        for module in ('middleware', 'views'):
+            patcher = mock.patch(
+                'restaurant.restaurant_api.{}.api_metrics'.format(module),
+                self.metrics,
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get_metrics(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'],
+                         'text/plain; charset=utf-8')
+        return response.content.decode()
+
+    def test_request_metrics(self):
+        for name in ('restaurant-list', 'employee-list'):
+            response = self.client.get(reverse(name), {'fields': 'id'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.get(reverse('person-detail', kwargs={'pk': 0}))
+        text = self.get_metrics()
+
+        labels = '{view="RestaurantViewSet",action="list"}'
+        self.assertEqual(
+            get_value(text, 'api_request_duration_seconds_count' + labels), 1
+        )
+        self.assertGreater(get_value(text, 'api_db_queries_total' + labels),
+                           0)
+        self.assertGreater(
+            get_value(text, 'api_db_duration_seconds_total' + labels), 0
+        )
+        self.assertGreater(get_value(
+            text, 'api_serializer_duration_seconds_total' + labels
+        ), 0)
+        self.assertEqual(get_value(
+            text, 'api_response_size_bytes_count' + labels
+        ), 1)
+        self.assertEqual(get_value(
+            text,
+            'api_errors_total{view="PersonViewSet",action="retrieve",'
+            'status="404"}',
+        ), 1)
+        self.assertIn('# TYPE api_cache_hits_total counter', text)
+
+    def test_random_restaurant_serializer_time(self):
+        self.client.get(reverse('restaurant-get-random-restaurant'))
+        self.assertGreater(get_value(
+            self.get_metrics(),
+            'api_serializer_duration_seconds_total{view="RestaurantViewSet",'
+            'action="get_random_restaurant"}',
+        ), 0)
+
+    def test_not_staff(self):
+        User.objects.filter(username=self.username).update(is_staff=False)
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token(self):
+        client = APIClient()
+        response = client.get(reverse('metrics'),
+                              HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = client.get(reverse('metrics'),
+                              HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.middleware import (QueryBudgetExceeded,
+                                                  assert_query_budget,
+                                                  get_query_shape)
+from restaurant.restaurant_api.models import (Employee, Person, Positions,
+                                              Restaurant)
+from restaurant.restaurant_api.views import RestaurantViewSet
+
+from .test_views import UserTestCase
+
+
+class QueryShapeTestCase(SimpleTestCase):
+
+    def test_get_query_shape(self):
+        self.assertEqual(
+            get_query_shape(
+                'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (%s, %s, %s) '
+                "AND \"a\".\"name\" = 'it''s' LIMIT 21"
+            ),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...) '
+            'AND "a"."name" = ? LIMIT ?',
+        )
+        self.assertEqual(get_query_shape('SELECT 1 FROM "t2" WHERE x = %s'),
+                         'SELECT ? FROM "t2" WHERE x = %s')
+
+
+class QueryBudgetTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        for number in range(10):
+            restaurant = Restaurant.objects.create(
+                name='Restaurant {}'.format(number)
+            )
+            person = Person.objects.create(firstname='Test',
+                                           surname=str(number))
+            Employee.objects.create(restaurant=restaurant, person=person,
+                                    position=Positions.COOK)
+
+    def test_assert_query_budget(self):
+        with assert_query_budget(budget=1):
+            Restaurant.objects.count()
+        with self.assertRaisesMessage(QueryBudgetExceeded,
+                                      '2 queries made, budget is 1'):
+            with assert_query_budget(budget=1):
+                Restaurant.objects.count()
+                Restaurant.objects.count()
+        with self.assertRaisesMessage(QueryBudgetExceeded,
+                                      'query repeated 10 times'):
+            with assert_query_budget():
+                for restaurant in Restaurant.objects.all():
+                    list(restaurant.employees.all())
+
+    def test_endpoints_are_within_budgets(self):
+        for name in ('restaurant-list', 'employee-list', 'person-list',
+                     'address-list', 'restaurant-get-random-restaurant'):
+            with self.subTest(name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_n_plus_one_raises(self):
+        queryset = Restaurant.objects.select_related('address').order_by(
+            'name'
+        )
+        with mock.patch.object(RestaurantViewSet, 'use_projection', False), \
+                mock.patch.object(RestaurantViewSet, 'queryset', queryset):
+            with self.assertRaisesMessage(QueryBudgetExceeded,
+                                          'RestaurantViewSet list'):
+                self.client.get(reverse('restaurant-list'))
+
+    def test_budget_raises(self):
+        budgets = dict(RestaurantViewSet.query_budgets, list=1)
+        with mock.patch.object(RestaurantViewSet, 'query_budgets', budgets):
+            with self.assertRaisesMessage(QueryBudgetExceeded,
+                                          'budget is 1'):
+                self.client.get(reverse('restaurant-list'))
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_budget_is_logged(self):
+        budgets = dict(RestaurantViewSet.query_budgets, list=1)
+        with mock.patch.object(RestaurantViewSet, 'query_budgets', budgets):
+            with self.assertLogs('restaurant.restaurant_api.middleware',
+                                 'WARNING') as logs:
+                response = self.client.get(reverse('restaurant-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('RestaurantViewSet list', logs.output[0])
@@ -2,7 +2,9 @@ from copy import deepcopy
 from datetime import date
 
 from django.test import TestCase
+from django.utils import translation
 
+from restaurant.restaurant_api.geo import get_geo_cell
 from restaurant.restaurant_api.models import (Address, Employee, Person,
                                               Positions, Restaurant)
 
@@ -126,6 +128,63 @@ class AddressModelTestCase(TestCase):
             street=self.create_dict['street'],
         )
         self.assertEqual(updated_address.house, house)
+        self.assertTrue(updated_address.full_address_text.endswith(
+            '{} {}'.format(house, self.create_dict['zip_code'])
+        ))
+
+    def test_full_address_is_stored(self):
+        address = Address.objects.get(street=self.create_dict['street'])
+        expected = ' '.join(
+            ('Russia', self.create_dict['province'],
+             self.create_dict['city'], self.create_dict['street'],
+             self.create_dict['house'], self.create_dict['zip_code'])
+        )
+        self.assertEqual(address.full_address_text, expected)
+        self.assertEqual(address.full_address_translations['en'], expected)
+        self.assertTrue(
+            address.full_address_translations['ru'].startswith('Россия ')
+        )
+        with translation.override('ru'):
+            self.assertEqual(address.full_address,
+                             address.full_address_translations['ru'])
+        self.assertEqual(
+            Address.objects.filter(full_address_text=expected).count(), 1
+        )
+
+    def test_full_address_save_update_fields(self):
+        address = Address.objects.get(street=self.create_dict['street'])
+        address.city = 'Moscow'
+        address.save(update_fields=['city'])
+        address.refresh_from_db()
+        self.assertIn('Moscow', address.full_address_text)
+
+    def test_full_address_bulk_writes(self):
+        addresses = Address.objects.bulk_create([
+            Address(**dict(self.create_dict, street='Bulk'))
+        ])
+        self.assertIn('Bulk', addresses[0].full_address_text)
+        address = Address.objects.get(street='Bulk')
+        self.assertIn('Bulk', address.full_address_text)
+        address.street = 'Bulk updated'
+        Address.objects.bulk_update([address], ['street'])
+        address.refresh_from_db()
+        self.assertIn('Bulk updated', address.full_address_text)
+
+    def test_geo_cell_follows_coordinates(self):
+        address = Address.objects.get(street=self.create_dict['street'])
+        self.assertIsNone(address.geo_cell)
+        address.latitude, address.longitude = 55.79, 49.12
+        address.save(update_fields=['latitude', 'longitude'])
+        address.refresh_from_db()
+        self.assertEqual(address.geo_cell, get_geo_cell(55.79, 49.12))
+        Address.objects.filter(pk=address.pk).update(latitude=55.75,
+                                                     longitude=37.62)
+        address.refresh_from_db()
+        self.assertEqual(address.geo_cell, get_geo_cell(55.75, 37.62))
+        address.longitude = None
+        Address.objects.bulk_update([address], ['longitude'])
+        address.refresh_from_db()
+        self.assertIsNone(address.geo_cell)
 
 
 class RestaurantModelTestCase(TestCase):
@@ -0,0 +1,124 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from restaurant.restaurant_api.models import Address, Person
+
+
+class KeysetPaginationTestCase(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.person_url = reverse('person-list')
+        cls.address_url = reverse('address-list')
+        User.objects.create_user(username='TestCase', password='Password')
+        # Repeated surnames and names make the ordering not unique.
+        Person.objects.bulk_create([
+            Person(firstname='Test{}'.format(number % 3),
+                   surname='Test{}'.format(number % 4))
+            for number in range(25)
+        ])
+        Address.objects.bulk_create([
+            Address(country=country, province='Test', city='Test',
+                    street='Test', house=str(number))
+            for number, country in enumerate(('RU', 'US', 'RU', 'DE') * 3)
+        ])
+        cls.persons = [
+            person.pk for person in Person.objects.order_by(
+                'surname', 'firstname', 'id'
+            )
+        ]
+
+    def setUp(self):
+        self.client.login(username='TestCase', password='Password')
+
+    def get_all_pages(self, url, page_size):
+        pks = []
+        pages = 0
+        url = '{}?page_size={}'.format(url, page_size)
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pks.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return pks, pages
+
+    def test_first_page(self):
+        response = self.client.get(self.person_url, {'page_size': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['id'] for item in response.data['results']],
+            self.persons[:10],
+        )
+        self.assertIsNone(response.data['previous'])
+        self.assertIsNotNone(response.data['next'])
+
+    def test_walk_forward_through_pages(self):
+        pks, pages = self.get_all_pages(self.person_url, 10)
+        self.assertEqual(pks, self.persons)
+        self.assertEqual(pages, 3)
+
+    def test_walk_backward_through_pages(self):
+        url = '{}?page_size=10'.format(self.person_url)
+        while url:
+            response = self.client.get(url)
+            last = response
+            url = response.data['next']
+        pks = []
+        url = last.data['previous']
+        while url:
+            response = self.client.get(url)
+            pks[:0] = [item['id'] for item in response.data['results']]
+            url = response.data['previous']
+        self.assertEqual(pks, self.persons[:20])
+
+    def test_walk_through_addresses(self):
+        pks, _ = self.get_all_pages(self.address_url, 5)
+        self.assertEqual(
+            pks,
+            list(Address.objects.order_by(
+                'country', 'id'
+            ).values_list('id', flat=True)),
+        )
+
+    @override_settings(API_MAX_PAGE_SIZE=5)
+    def test_max_page_size(self):
+        response = self.client.get(self.person_url, {'page_size': 100})
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.person_url, {'cursor': 'invalid'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_crafted_cursor(self):
+        for position in (['Test0', 'Test0', 'x'], ['Test0', 'Test0', [1]],
+                         [{'a': 1}, 'Test0', 1], ['Test0', None, 1],
+                         ['Test0', 'Test0', float('inf')], 'Test0', []):
+            with self.subTest(position=position):
+                cursor = urlsafe_b64encode(
+                    json.dumps({'p': position}).encode()
+                ).decode()
+                response = self.client.get(self.person_url,
+                                           {'cursor': cursor})
+                self.assertEqual(response.status_code,
+                                 status.HTTP_404_NOT_FOUND)
+
+    def test_page_query_does_not_grow(self):
+        response = self.client.get(self.person_url, {'page_size': 5})
+        url = response.data['next']
+        for _ in range(3):
+            response = self.client.get(url)
+            url = response.data['next']
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(url)
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('LIMIT 6', sql)
+        self.assertNotIn('OFFSET', sql)
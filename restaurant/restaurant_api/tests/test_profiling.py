@@ -0,0 +1,182 @@
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.profiling import (ProfileLimiter, StackSampler,
+                                                 delete_old_profiles,
+                                                 format_call_tree,
+                                                 format_folded)
+
+from .test_views import UserTestCase
+
+
+def busy_function(seconds):
+    finish = time.perf_counter() + seconds
+    while time.perf_counter() < finish:
+        pass
+
+
+class StackSamplerTestCase(SimpleTestCase):
+
+    def test_sample_thread(self):
+        with StackSampler(threading.get_ident(), interval=0.001) as sampler:
+            busy_function(0.1)
+        self.assertGreater(sum(sampler.stacks.values()), 10)
+        self.assertTrue(any(
+            stack[-1].endswith('test_profiling.py:busy_function')
+            for stack in sampler.stacks
+        ), sampler.stacks)
+        self.assertGreaterEqual(sampler.duration, 0.1)
+
+    def test_sample_all_threads(self):
+        with StackSampler(interval=0.001) as sampler:
+            busy_function(0.05)
+        self.assertIn(threading.current_thread().name,
+                      {stack[0] for stack in sampler.stacks})
+
+    def test_max_duration(self):
+        with StackSampler(threading.get_ident(), interval=0.001,
+                          max_duration=0.02) as sampler:
+            busy_function(0.1)
+        self.assertLess(sum(sampler.stacks.values()), 30)
+
+
+class ProfileFormatTestCase(SimpleTestCase):
+    stacks = Counter({
+        ('main', 'view', 'query'): 6,
+        ('main', 'view'): 2,
+        ('main', 'render'): 2,
+    })
+
+    def test_format_folded(self):
+        self.assertEqual(format_folded(self.stacks),
+                         'main;render 2\nmain;view 2\nmain;view;query 6\n')
+
+    def test_format_call_tree(self):
+        self.assertEqual(
+            format_call_tree(self.stacks, 0.005, min_share=0.3).splitlines(),
+            ['  total    own       ms  function',
+             '100.0%   0.0%     50.0  main',
+             ' 80.0%  20.0%     40.0    view',
+             ' 60.0%  60.0%     30.0      query'],
+        )
+
+    def test_limiter(self):
+        now = [0]
+        limiter = ProfileLimiter(2, period=60, clock=lambda: now[0])
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+        now[0] = 61
+        self.assertTrue(limiter.acquire())
+
+    def test_delete_old_profiles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('a', 'b', 'c'):
+                for suffix in ('.txt', '.folded'):
+                    (Path(directory) / (name + suffix)).write_text('')
+                time.sleep(0.01)
+            delete_old_profiles(directory, 1)
+            self.assertEqual(
+                sorted(path.name for path in Path(directory).iterdir()),
+                ['c.folded', 'c.txt'],
+            )
+
+
+class ProfilingTestMixin:
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings = override_settings(PROFILING_DIR=self.directory,
+                                     PROFILING_INTERVAL=0.001)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        User.objects.filter(username=self.username).update(is_staff=True)
+
+    def get_profiles(self):
+        return sorted(path.name for path in self.directory.iterdir())
+
+
+class ProfilingMiddlewareTestCase(ProfilingTestMixin, UserTestCase):
+
+    def test_profile_with_header(self):
+        response = self.client.get(reverse('restaurant-list'),
+                                   HTTP_X_PROFILE='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        name = response['X-Profile-Id']
+        self.assertEqual(self.get_profiles(),
+                         [name + '.folded', name + '.txt'])
+        self.assertIn('-GET-restaurants-', name)
+        call_tree = (self.directory / (name + '.txt')).read_text()
+        self.assertTrue(call_tree.startswith('GET /restaurants/ 200\n'))
+
+    def test_profile_with_parameter(self):
+        response = self.client.get(reverse('person-list'), {'profile': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('X-Profile-Id', response)
+
+    def test_not_asked(self):
+        response = self.client.get(reverse('person-list'))
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(self.get_profiles(), [])
+
+    def test_not_staff(self):
+        User.objects.filter(username=self.username).update(is_staff=False)
+        response = self.client.get(reverse('person-list'),
+                                   HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(self.get_profiles(), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=0)
+    def test_sample_rate(self):
+        response = self.client.get(reverse('person-list'),
+                                   HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', response)
+
+    @override_settings(PROFILING_MAX_PER_MINUTE=1)
+    def test_max_per_minute(self):
+        responses = [
+            self.client.get(reverse('person-list'), HTTP_X_PROFILE='1')
+            for _ in range(2)
+        ]
+        self.assertIn('X-Profile-Id', responses[0])
+        self.assertNotIn('X-Profile-Id', responses[1])
+
+
+@override_settings(ASYNC_VIEWS_THREAD_SENSITIVE=True)
+class AsyncProfilingMiddlewareTestCase(ProfilingTestMixin, UserTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.async_client.login(username=self.username,
+                                password=self.password)
+
+    async def test_profile_async_view(self):
+        response = await self.async_client.get(
+            reverse('async-person-list') + '?profile=1'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        name = response['X-Profile-Id']
+        self.assertEqual(self.get_profiles(),
+                         [name + '.folded', name + '.txt'])
+
+    async def test_not_staff_async_view(self):
+        await sync_to_async(
+            User.objects.filter(username=self.username).update
+        )(is_staff=False)
+        response = await self.async_client.get(
+            reverse('async-person-list') + '?profile=1'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('X-Profile-Id', response)
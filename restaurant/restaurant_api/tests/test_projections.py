@@ -0,0 +1,134 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import translation
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+from restaurant.restaurant_api.projections import (
+    EmployeeFullInfoProjection, RestaurantFullInfoProjection)
+from restaurant.restaurant_api.serializers import (
+    EmployeeFullInfoSerializer, RestaurantFullInfoSerializer)
+from restaurant.restaurant_api.views import EmployeeViewSet, RestaurantViewSet
+
+from .test_views import UserTestCase
+
+
+def create_dataset():
+    address = Address.objects.create(
+        country='RU', province='Tatarstan rep.', city='Kazan',
+        street='Pushkina', house='10', zip_code='42000',
+    )
+    restaurants = [
+        Restaurant.objects.create(name='Russian wolf', address=address,
+                                  phone='+199945645670', cuisine='Russian',
+                                  rating=100),
+        Restaurant.objects.create(name='Empty'),
+    ]
+    persons = [
+        Person.objects.create(firstname=firstname, surname=surname)
+        for firstname, surname in (('B', 'Ivanov'), ('A', 'Petrov'),
+                                   ('A', 'Ivanov'))
+    ]
+    for person, position in zip(persons, Positions.values):
+        Employee.objects.create(restaurant=restaurants[0], person=person,
+                                position=position)
+
+
+class ProjectionTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        create_dataset()
+
+    def assertSameJson(self, serializer_class, queryset, projection):
+        expected = JSONRenderer().render(
+            serializer_class(queryset, many=True).data
+        )
+        rows = projection.get_queryset(queryset)
+        self.assertTrue(all(isinstance(row, dict) for row in rows))
+        self.assertEqual(
+            JSONRenderer().render(serializer_class(rows, many=True).data),
+            expected,
+        )
+
+    def test_employees(self):
+        self.assertSameJson(
+            EmployeeFullInfoSerializer, EmployeeViewSet.queryset.all(),
+            EmployeeFullInfoProjection(),
+        )
+
+    def test_restaurants(self):
+        self.assertSameJson(
+            RestaurantFullInfoSerializer, RestaurantViewSet.queryset.all(),
+            RestaurantFullInfoProjection(),
+        )
+
+    def test_restaurants_not_stored_language(self):
+        with translation.override('de'):
+            self.assertSameJson(
+                RestaurantFullInfoSerializer,
+                RestaurantViewSet.queryset.all(),
+                RestaurantFullInfoProjection(),
+            )
+
+    def test_restaurant_employees_order(self):
+        rows = RestaurantFullInfoProjection().get_queryset(
+            Restaurant.objects.filter(name='Russian wolf')
+        )
+        data = RestaurantFullInfoSerializer(rows, many=True).data
+        self.assertEqual(data[0]['employees'],
+                         ['Ivanov A', 'Ivanov B', 'Petrov A'])
+
+
+class ProjectionViewTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        create_dataset()
+
+    def test_list_is_same_as_serializer(self):
+        cases = (
+            ('restaurant-list', RestaurantFullInfoSerializer,
+             RestaurantViewSet.queryset.all()),
+            ('employee-list', EmployeeFullInfoSerializer,
+             EmployeeViewSet.queryset.all()),
+        )
+        for name, serializer_class, queryset in cases:
+            with self.subTest(name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    json.loads(response.content)['results'],
+                    json.loads(JSONRenderer().render(
+                        serializer_class(queryset, many=True).data
+                    )),
+                )
+
+    def test_stream_is_same_as_list(self):
+        for name in ('restaurant-list', 'employee-list'):
+            with self.subTest(name):
+                url = reverse(name)
+                results = json.loads(self.client.get(url).content)['results']
+                response = self.client.get(url, {'stream': ''})
+                self.assertEqual(
+                    json.loads(b''.join(response.streaming_content)),
+                    results,
+                )
+
+
+class BenchProjectionsCommandTestCase(TestCase):
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('bench_projections', seed=3, repeat=1, stdout=out)
+        self.assertIn('restaurants: 3 rows', out.getvalue())
+        self.assertIn('employees: 30 rows', out.getvalue())
+        self.assertFalse(Restaurant.objects.exists())
@@ -0,0 +1,327 @@
+import json
+import os
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.utils.urls import remove_query_param
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+
+from .test_views import UserTestCase
+
+# Plans recorded from the seeded dataset, the baseline of plan regressions.
+# Set UPDATE_QUERY_PLANS=1 to record plans of new cases or improved plans.
+SNAPSHOT_PATH = Path(__file__).resolve().parent / 'query_plans.json'
+UPDATE_SNAPSHOT = os.environ.get('UPDATE_QUERY_PLANS') == '1'
+
+# Tables so big that reading them whole is a regression even in plans
+# recorded for the first time.
+LARGE_TABLES = ('restaurant_api_employee',)
+SORT_NODES = ('Sort', 'Incremental Sort')
+# Tables that filtered lists should read by indexes, whatever their size.
+FILTERED_TABLES = {
+    'restaurant-list-filtered': ('restaurant_api_restaurant',),
+    'restaurant-list-by-country': ('restaurant_api_address',),
+    'employee-list-filtered': ('restaurant_api_employee',),
+    'employee-list-by-restaurant': ('restaurant_api_employee',),
+    'employee-list-by-person': ('restaurant_api_employee',),
+    'person-list-filtered': ('restaurant_api_person',),
+    'person-list-by-birth-date': ('restaurant_api_person',),
+}
+
+PERSONS_COUNT = 20000
+RESTAURANTS_COUNT = 2000
+EMPLOYEES_PER_RESTAURANT = 10
+BATCH_SIZE = 5000
+
+
+def seed_dataset():
+    """Create dataset large enough for the planner to prefer indexes."""
+    countries = ('RU', 'US', 'DE', 'FR', 'IT', 'ES', 'GB', 'CN')
+    Address.objects.bulk_create((
+        Address(
+            country=countries[number % len(countries)],
+            province='Province {}'.format(number % 50),
+            city='City {}'.format(number % 300),
+            street='Street {}'.format(number),
+            house=str(number % 200),
+        ) for number in range(RESTAURANTS_COUNT)
+    ), batch_size=BATCH_SIZE)
+    Person.objects.bulk_create((
+        Person(
+            firstname='Firstname {}'.format(number % 700),
+            surname='Surname {}'.format(number % 3000),
+            date_of_birth=date(1960, 1, 1) + timedelta(days=number % 15000),
+        ) for number in range(PERSONS_COUNT)
+    ), batch_size=BATCH_SIZE)
+    addresses = list(Address.objects.values_list('id', flat=True))
+    Restaurant.objects.bulk_create((
+        Restaurant(
+            name='Restaurant {}'.format(number),
+            address_id=address_id,
+            cuisine='Cuisine {}'.format(number % 20),
+            rating=number % 101,
+        ) for number, address_id in enumerate(addresses)
+    ), batch_size=BATCH_SIZE)
+    persons = list(Person.objects.values_list('id', flat=True))
+    restaurants = list(Restaurant.objects.values_list('id', flat=True))
+    Employee.objects.bulk_create((
+        Employee(
+            restaurant_id=restaurant_id,
+            person_id=persons[
+                (number * EMPLOYEES_PER_RESTAURANT + offset) % len(persons)
+            ],
+            position=Positions.values[offset % len(Positions.values)],
+        )
+        for number, restaurant_id in enumerate(restaurants)
+        for offset in range(EMPLOYEES_PER_RESTAURANT)
+    ), batch_size=BATCH_SIZE)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def summarize_plan(node):
+    """Get flat list of plan nodes like 'Index Scan on table using index'."""
+    summary = [node['Node Type']]
+    if 'Relation Name' in node:
+        summary[0] += ' on ' + node['Relation Name']
+    if 'Index Name' in node:
+        summary[0] += ' using ' + node['Index Name']
+    for child in node.get('Plans', ()):
+        summary.extend(summarize_plan(child))
+    return summary
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return summarize_plan(plan[0]['Plan'])
+
+
+def get_seq_scans(plan):
+    return {
+        node.split(' on ')[1] for node in plan if node.startswith('Seq Scan')
+    }
+
+
+def get_sorts_count(plan):
+    return sum(node.split(' on ')[0] in SORT_NODES for node in plan)
+
+
+class EndpointQueriesMixin:
+    """Cases of requests made to every endpoint of the API."""
+
+    def get_cases(self):
+        restaurant = Restaurant.objects.order_by('pk').first()
+        person = Person.objects.order_by('pk').first()
+        address = Address.objects.order_by('pk').first()
+        employee = Employee.objects.order_by('pk').first()
+        return {
+            'person-list': reverse('person-list'),
+            'person-list-deep': self.get_deep_page(reverse('person-list')),
+            'person-detail': reverse('person-detail',
+                                     kwargs={'pk': person.pk}),
+            'address-list': reverse('address-list'),
+            'address-list-deep': self.get_deep_page(reverse('address-list')),
+            'address-detail': reverse('address-detail',
+                                      kwargs={'pk': address.pk}),
+            'restaurant-list': reverse('restaurant-list'),
+            'restaurant-list-deep': self.get_deep_page(
+                reverse('restaurant-list')
+            ),
+            'restaurant-detail': reverse('restaurant-detail',
+                                         kwargs={'name': restaurant.name}),
+            'restaurant-get-random-restaurant': reverse(
+                'restaurant-get-random-restaurant'
+            ),
+            'restaurant-search': '{}?{}'.format(
+                reverse('restaurant-search'), urlencode({'q': restaurant.name})
+            ),
+            'employee-list': reverse('employee-list'),
+            'employee-list-deep': self.get_deep_page(
+                reverse('employee-list')
+            ),
+            'employee-detail': reverse('employee-detail',
+                                       kwargs={'pk': employee.pk}),
+            'restaurant-list-filtered': self.get_filtered(
+                'restaurant-list', cuisine=restaurant.cuisine,
+                rating_min=50, rating_max=60,
+            ),
+            'restaurant-list-by-country': self.get_filtered(
+                'restaurant-list', country=address.country.code,
+            ),
+            'employee-list-filtered': self.get_filtered(
+                'employee-list', position=Positions.COOK,
+            ),
+            'employee-list-by-restaurant': self.get_filtered(
+                'employee-list', restaurant=employee.restaurant_id,
+                position=employee.position,
+            ),
+            'employee-list-by-person': self.get_filtered(
+                'employee-list', person=employee.person_id,
+            ),
+            'person-list-filtered': self.get_filtered(
+                'person-list', surname=person.surname[:-1],
+            ),
+            'person-list-by-birth-date': self.get_filtered(
+                'person-list', date_of_birth_min='1970-01-01',
+                date_of_birth_max='1970-01-31',
+            ),
+        }
+
+    def get_filtered(self, name, **params):
+        return '{}?{}'.format(reverse(name), urlencode(params))
+
+    def get_deep_page(self, url):
+        response = self.client.get(url, {'page_size': 1000})
+        if response.data['next'] is None:
+            return url
+        # Page of the default size far from the start of the list.
+        return remove_query_param(response.data['next'], 'page_size')
+
+    def capture_queries(self, url):
+        # Authentication is done before capturing, response is not cached.
+        self.client.get(url)
+        caches[settings.API_RESPONSE_CACHE].clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            query['sql'] for query in context.captured_queries
+            if 'restaurant_api_' in query['sql']
+        ]
+
+
+class EndpointQueriesCountTestCase(EndpointQueriesMixin, UserTestCase):
+
+    # Lists and details read versions of rows for validators first.
+    expected_queries = {
+        'person-list': 2,
+        'person-list-deep': 2,
+        'person-detail': 2,
+        'address-list': 2,
+        'address-list-deep': 2,
+        'address-detail': 2,
+        'restaurant-list': 4,
+        'restaurant-list-deep': 4,
+        'restaurant-detail': 4,
+        'restaurant-get-random-restaurant': 4,
+        'restaurant-search': 4,
+        'employee-list': 2,
+        'employee-list-deep': 2,
+        'employee-detail': 2,
+        'restaurant-list-filtered': 4,
+        'restaurant-list-by-country': 4,
+        'employee-list-filtered': 2,
+        'employee-list-by-restaurant': 2,
+        'employee-list-by-person': 2,
+        'person-list-filtered': 2,
+        'person-list-by-birth-date': 2,
+    }
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        address = Address.objects.create(
+            country='RU', province='Test', city='Test', street='Test',
+            house='1',
+        )
+        restaurant = Restaurant.objects.create(
+            name='Russian wolf', address=address, cuisine='Russian',
+            rating=55,
+        )
+        for number in range(3):
+            person = Person.objects.create(
+                firstname='Test{}'.format(number), surname='Test',
+            )
+            Employee.objects.create(restaurant=restaurant, person=person,
+                                    position=Positions.COOK)
+
+    def test_endpoints_queries_count(self):
+        for name, url in self.get_cases().items():
+            with self.subTest(name):
+                self.assertEqual(len(self.capture_queries(url)),
+                                 self.expected_queries[name])
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql',
+                     'Query plans are recorded for PostgreSQL only.')
+class EndpointQueryPlansTestCase(EndpointQueriesMixin, UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        seed_dataset()
+        if SNAPSHOT_PATH.exists():
+            cls.snapshot = json.loads(SNAPSHOT_PATH.read_text())
+        else:
+            cls.snapshot = {}
+        cls.recorded = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE_SNAPSHOT and cls.recorded:
+            snapshot = dict(cls.snapshot, **cls.recorded)
+            SNAPSHOT_PATH.write_text(
+                json.dumps(snapshot, indent=2, sort_keys=True) + '\n'
+            )
+        super().tearDownClass()
+
+    def test_endpoints_query_plans(self):
+        for name, url in self.get_cases().items():
+            with self.subTest(name):
+                plans = [explain(sql) for sql in self.capture_queries(url)]
+                self.check_plans(plans, FILTERED_TABLES.get(name, ()))
+                if UPDATE_SNAPSHOT:
+                    self.recorded[name] = plans
+                    continue
+                self.assertIn(
+                    name, self.snapshot,
+                    'No recorded plans of {} in {}, run with '
+                    'UPDATE_QUERY_PLANS=1 to record them.'.format(
+                        name, SNAPSHOT_PATH.name
+                    ),
+                )
+                self.compare_plans(plans, self.snapshot[name])
+
+    def check_plans(self, plans, filtered_tables=()):
+        for plan in plans:
+            scanned = get_seq_scans(plan).intersection(
+                LARGE_TABLES + tuple(filtered_tables)
+            )
+            self.assertFalse(
+                scanned,
+                'Sequential scan of {} in plan {}'.format(scanned, plan),
+            )
+
+    def compare_plans(self, plans, recorded_plans):
+        self.assertLessEqual(
+            len(plans), len(recorded_plans),
+            'Queries count grew from {} to {}'.format(len(recorded_plans),
+                                                      len(plans)),
+        )
+        for plan, recorded_plan in zip(plans, recorded_plans):
+            scanned = get_seq_scans(plan) - get_seq_scans(recorded_plan)
+            self.assertFalse(
+                scanned,
+                'New sequential scan of {} in plan {}, recorded plan is '
+                '{}'.format(scanned, plan, recorded_plan),
+            )
+            self.assertLessEqual(
+                get_sorts_count(plan), get_sorts_count(recorded_plan),
+                'New sort node in plan {}, recorded plan is {}'.format(
+                    plan, recorded_plan
+                ),
+            )
@@ -0,0 +1,142 @@
+import json
+from datetime import date
+from decimal import Decimal
+from io import BytesIO, StringIO
+
+import msgpack
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+from restaurant.restaurant_api.renderers import (MessagePackParser,
+                                                 MessagePackRenderer,
+                                                 ORJSONParser, ORJSONRenderer)
+from restaurant.restaurant_api.serializers import RestaurantFullInfoSerializer
+
+from .test_views import UserTestCase
+
+
+class RendererTestCase(SimpleTestCase):
+    data = {
+        'name': 'Волк',
+        'rating': 90,
+        'employees': ['Ivanov Ivan'],
+        'date': date(2021, 5, 1),
+        'price': Decimal('1.50'),
+        'position': gettext_lazy('Cook'),
+        'address': None,
+    }
+
+    def test_json_renderer_is_compatible(self):
+        self.assertEqual(ORJSONRenderer().render(self.data),
+                         JSONRenderer().render(self.data))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_json_escapes_like_default_renderer(self):
+        data = {'name': 'Line\u2028Paragraph\u2029'}
+        self.assertEqual(ORJSONRenderer().render(data),
+                         JSONRenderer().render(data))
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=2'),
+            JSONRenderer().render(data, 'application/json; indent=2'),
+        )
+
+    def test_json_rejects_non_finite_numbers(self):
+        for value in (float('nan'), float('inf'), -float('inf'),
+                      Decimal('NaN')):
+            data = {'address': None, 'distances': [1.5, value]}
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(data)
+                with self.assertRaises(ValueError):
+                    ORJSONRenderer().render(data)
+
+    def test_json_indent(self):
+        content = ORJSONRenderer().render([1], 'application/json; indent=4')
+        self.assertEqual(content, b'[\n  1\n]')
+
+    def test_json_parser(self):
+        content = JSONRenderer().render(self.data)
+        self.assertEqual(ORJSONParser().parse(BytesIO(content)),
+                         json.loads(content))
+        with self.assertRaisesMessage(ParseError, 'JSON parse error'):
+            ORJSONParser().parse(BytesIO(b'{"name": '))
+
+    def test_msgpack(self):
+        content = MessagePackRenderer().render(self.data)
+        self.assertEqual(MessagePackParser().parse(BytesIO(content)),
+                         json.loads(JSONRenderer().render(self.data)))
+        with self.assertRaisesMessage(ParseError, 'MessagePack parse error'):
+            MessagePackParser().parse(BytesIO(b'\xc1'))
+
+
+class RestaurantRenderTestCase(TestCase):
+
+    def test_full_info_is_compatible(self):
+        address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Казань',
+            street='Pushkina', house='10',
+        )
+        restaurant = Restaurant.objects.create(
+            name='Russian wolf', address=address, cuisine='Russian',
+            rating=90, phone='+79999999999',
+        )
+        Restaurant.objects.create(name='No address')
+        person = Person.objects.create(firstname='Ivan', surname='Ivanov')
+        Employee.objects.create(restaurant=restaurant, person=person,
+                                position=Positions.COOK)
+        data = RestaurantFullInfoSerializer(
+            Restaurant.objects.order_by('name'), many=True
+        ).data
+        self.assertEqual(ORJSONRenderer().render(data),
+                         JSONRenderer().render(data))
+
+    def test_bench_renderers_command(self):
+        out = StringIO()
+        call_command('bench_renderers', seed=3, repeat=1, stdout=out)
+        self.assertIn('restaurants json: 3 rows', out.getvalue())
+        self.assertIn('employees msgpack: 30 rows', out.getvalue())
+        self.assertFalse(Restaurant.objects.exists())
+
+
+class ContentNegotiationTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.person = Person.objects.create(firstname='Ivan',
+                                           surname='Ivanov')
+
+    def test_msgpack_response(self):
+        response = self.client.get(reverse('person-list'),
+                                   HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        data = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(data['results'][0]['surname'], 'Ivanov')
+
+        response = self.client.get(reverse('person-list'), {
+            'format': 'msgpack',
+        })
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+
+    def test_json_response(self):
+        response = self.client.get(reverse('person-list'))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(response.content)['results'][0]['id'],
+                         self.person.pk)
+
+    def test_msgpack_request(self):
+        response = self.client.post(
+            reverse('person-list'),
+            data=msgpack.packb({'firstname': 'Petr', 'surname': 'Petrov'}),
+            content_type='application/msgpack',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['surname'], 'Petrov')
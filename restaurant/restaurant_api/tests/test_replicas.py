@@ -0,0 +1,84 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api import replicas
+from restaurant.restaurant_api.cache import response_cache
+from restaurant.restaurant_api.models import Person
+from restaurant.restaurant_api.replicas import (STICKY_COOKIE, ReplicaRouter,
+                                                get_replica, read_database)
+
+from .test_views import UserTestCase
+
+
+class ReplicaRouterTestCase(SimpleTestCase):
+
+    def test_db_for_read(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Person))
+        token = read_database.set('replica')
+        try:
+            self.assertEqual(router.db_for_read(Person), 'replica')
+            self.assertIsNone(router.db_for_write(Person))
+        finally:
+            read_database.reset(token)
+
+    @override_settings(DATABASE_REPLICAS=['replica'])
+    def test_allow_migrate(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'restaurant_api'))
+        self.assertFalse(router.allow_migrate('replica', 'restaurant_api'))
+
+    @override_settings(DATABASE_REPLICAS=['first', 'second'],
+                       REPLICA_MAX_LAG=5)
+    def test_lagging_replicas_are_skipped(self):
+        lags = {'first': 10, 'second': 1}
+        with mock.patch.object(replicas, 'get_replica_lag', lags.get):
+            self.assertEqual(get_replica(), 'second')
+            lags['second'] = None
+            self.assertIsNone(get_replica())
+
+
+# Tests have only the default database, use it as a replica.
+@override_settings(DATABASE_REPLICAS=['default'])
+class ReplicaReadTestCase(UserTestCase):
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(replicas, 'get_replica',
+                                    wraps=replicas.get_replica)
+        self.get_replica = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reads_from_replica(self):
+        response = self.client.get(reverse('restaurant-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.get_replica.assert_called_once_with()
+        self.assertIsNone(read_database.get())
+
+    def test_writes_are_sticky(self):
+        response = self.client.post(
+            reverse('person-list'), {'firstname': 'Test', 'surname': 'Test'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+        self.client.get(reverse('person-list'))
+        self.get_replica.assert_not_called()
+
+        # Clients without cookies are recognized by user.
+        self.client.cookies.pop(STICKY_COOKIE)
+        self.client.get(reverse('person-list'))
+        self.get_replica.assert_not_called()
+
+    def test_failed_writes_are_not_sticky(self):
+        response = self.client.post(reverse('person-list'), {})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_replica_responses_are_cached_briefly(self):
+        with mock.patch.object(response_cache, 'set') as cache_set:
+            with override_settings(REPLICA_MAX_LAG=3):
+                self.client.get(reverse('restaurant-list'))
+        self.assertEqual(cache_set.call_args[0][2], 3)
@@ -0,0 +1,56 @@
+import random
+from collections import Counter
+
+from django.test import TestCase
+
+from restaurant.restaurant_api.models import Restaurant
+from restaurant.restaurant_api.sampling import get_random_object
+
+
+class GetRandomObjectTestCase(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Restaurant.objects.bulk_create([
+            Restaurant(name='Russian wolf{}'.format(number), rating=number)
+            for number in range(10)
+        ])
+        # Leave gaps in primary keys like deleted restaurants do.
+        Restaurant.objects.filter(rating__in=(2, 3, 4, 7)).delete()
+
+    def test_get_random_object_from_empty_queryset(self):
+        self.assertIsNone(get_random_object(Restaurant.objects.none()))
+
+    def test_get_random_object_returns_existing_object(self):
+        restaurant = get_random_object(Restaurant.objects.all())
+        self.assertTrue(
+            Restaurant.objects.filter(pk=restaurant.pk).exists()
+        )
+
+    def assert_uniform(self, **kwargs):
+        rng = random.Random(0)
+        counter = Counter(
+            get_random_object(Restaurant.objects.all(), rng=rng,
+                              **kwargs).name
+            for _ in range(600)
+        )
+        self.assertCountEqual(
+            counter,
+            Restaurant.objects.values_list('name', flat=True),
+        )
+        for picks in counter.values():
+            self.assertGreater(picks, 60)
+            self.assertLess(picks, 140)
+
+    def test_get_random_object_is_uniform(self):
+        self.assert_uniform()
+
+    def test_get_random_object_with_sparse_keys_is_uniform(self):
+        # Keys after the gap of deleted restaurants are not favoured.
+        self.assert_uniform(probes=1, rounds=0)
+
+    def test_get_random_object_query_count(self):
+        with self.assertNumQueries(3):
+            get_random_object(Restaurant.objects.all(), probes=64,
+                              rng=random.Random(0))
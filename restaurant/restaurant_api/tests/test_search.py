@@ -0,0 +1,114 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+from restaurant.restaurant_api.search import search_restaurants
+from restaurant.restaurant_api.serializers import RestaurantFullInfoSerializer
+
+from .test_views import UserTestCase
+
+
+class RestaurantSearchTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.url = reverse('restaurant-search')
+        kazan = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        moscow = Address.objects.create(
+            country='RU', province='Moscow', city='Moscow', street='Arbat',
+            house='1',
+        )
+        cls.wolf = Restaurant.objects.create(
+            name='Russian wolf', cuisine='Russian', address=kazan,
+        )
+        cls.bear = Restaurant.objects.create(
+            name='Brown bear', cuisine='Russian', address=moscow,
+        )
+        cls.kazan = Restaurant.objects.create(name='Kazan', cuisine='Tatar')
+        cls.pizza = Restaurant.objects.create(name='Pizza', cuisine='Italian',
+                                              address=moscow)
+        person = Person.objects.create(firstname='Test', surname='Test')
+        cls.cook = Employee.objects.create(restaurant=cls.wolf,
+                                           person=person,
+                                           position=Positions.COOK)
+
+    def search(self, text, **params):
+        response = self.client.get(self.url, dict(params, q=text))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def get_names(self, response):
+        return [row['name'] for row in response.data['results']]
+
+    def test_search_by_name_cuisine_and_address(self):
+        self.assertEqual(self.get_names(self.search('russian')),
+                         ['Russian wolf', 'Brown bear'])
+        self.assertEqual(self.get_names(self.search('Kazan')),
+                         ['Kazan', 'Russian wolf'])
+        self.assertEqual(self.get_names(self.search('arbat')),
+                         ['Brown bear', 'Pizza'])
+        self.assertEqual(self.get_names(self.search('Italian Moscow')),
+                         ['Pizza'])
+        self.assertEqual(self.get_names(self.search('sushi')), [])
+
+    def test_format(self):
+        response = self.search('wolf')
+        self.assertEqual(
+            response.data['results'],
+            RestaurantFullInfoSerializer([self.wolf], many=True).data,
+        )
+
+    def test_pagination(self):
+        first = self.search('russian', page_size=1)
+        self.assertEqual(self.get_names(first), ['Russian wolf'])
+        response = self.client.get(first.data['next'])
+        self.assertEqual(self.get_names(response), ['Brown bear'])
+        self.assertIsNone(response.data['next'])
+
+    def test_required_query(self):
+        for params in ({}, {'q': ' '}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code,
+                                 status.HTTP_400_BAD_REQUEST)
+                self.assertIn('q', response.data)
+
+    def test_results_follow_changes(self):
+        self.search('russian')
+        self.bear.cuisine = 'Siberian'
+        self.bear.save()
+        self.assertEqual(self.get_names(self.search('russian')),
+                         ['Russian wolf'])
+
+    def test_search_vector_not_loaded(self):
+        urls = [
+            reverse('restaurant-list'),
+            reverse('restaurant-detail', kwargs={'name': self.wolf.name}),
+            reverse('restaurant-get-random-restaurant'),
+            reverse('employee-list'),
+            reverse('employee-detail', kwargs={'pk': self.cook.pk}),
+        ]
+        with CaptureQueriesContext(connection) as context:
+            for url in urls:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for query in context.captured_queries:
+            self.assertNotIn('search_vector', query['sql'])
+
+    @skipUnless(connection.vendor == 'postgresql',
+                'Search vector is maintained on PostgreSQL only.')
+    def test_address_changes_update_search_vector(self):
+        Address.objects.filter(pk=self.wolf.address_id).update(city='Kursk')
+        self.assertEqual(
+            list(search_restaurants(Restaurant.objects.all(), 'Kursk')),
+            [self.wolf],
+        )
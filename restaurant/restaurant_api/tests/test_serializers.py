@@ -69,7 +69,7 @@ class AddressSerializerTestCase(TestCase):
         self.assertCountEqual(
             self.serializer.data,
             ['id', 'country', 'province', 'city', 'street', 'house',
-             'zip_code']
+             'zip_code', 'latitude', 'longitude']
         )
 
     def test_address_serializer_field_content(self):
@@ -0,0 +1,209 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant,
+                                              StaffCount)
+from restaurant.restaurant_api.signals import bulk_changed
+from restaurant.restaurant_api.staffing import (get_restaurants_staffing,
+                                                get_staffed_restaurants,
+                                                get_staffing_stats)
+
+from .test_views import UserTestCase
+
+
+def get_counts():
+    return {
+        (restaurant, position): count
+        for restaurant, position, count in StaffCount.objects.filter(
+            count__gt=0
+        ).values_list('restaurant__name', 'position', 'count')
+    }
+
+
+class StaffingTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        kazan = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        moscow = Address.objects.create(
+            country='RU', province='Moscow', city='Moscow', street='Arbat',
+            house='1',
+        )
+        cls.wolf = Restaurant.objects.create(name='Wolf', address=kazan)
+        cls.bear = Restaurant.objects.create(name='Bear', address=moscow)
+        cls.fox = Restaurant.objects.create(name='Fox')
+        cls.persons = [
+            Person.objects.create(firstname=str(number), surname='Test')
+            for number in range(4)
+        ]
+        cls.cook = Employee.objects.create(
+            restaurant=cls.wolf, person=cls.persons[0],
+            position=Positions.COOK,
+        )
+        Employee.objects.create(restaurant=cls.wolf, person=cls.persons[1],
+                                position=Positions.COOK)
+        Employee.objects.create(restaurant=cls.bear, person=cls.persons[0],
+                                position=Positions.DIRECTOR)
+        Employee.objects.create(restaurant=cls.fox, person=cls.persons[2],
+                                position=Positions.WAITER)
+
+    def test_counts_follow_writes(self):
+        self.assertEqual(get_counts(), {
+            ('Wolf', Positions.COOK): 2,
+            ('Bear', Positions.DIRECTOR): 1,
+            ('Fox', Positions.WAITER): 1,
+        })
+
+        self.cook.position = Positions.MANAGER
+        self.cook.save()
+        self.cook.restaurant = self.bear
+        self.cook.person = self.persons[3]
+        self.cook.save()
+        self.assertEqual(get_counts(), {
+            ('Wolf', Positions.COOK): 1,
+            ('Bear', Positions.DIRECTOR): 1,
+            ('Bear', Positions.MANAGER): 1,
+            ('Fox', Positions.WAITER): 1,
+        })
+
+        self.cook.delete()
+        self.fox.delete()
+        self.assertEqual(get_counts(), {
+            ('Wolf', Positions.COOK): 1,
+            ('Bear', Positions.DIRECTOR): 1,
+        })
+
+    def test_counts_follow_relation(self):
+        self.fox.employees.add(self.persons[3], through_defaults={
+            'position': Positions.COOK,
+        })
+        self.assertEqual(get_counts()['Fox', Positions.COOK], 1)
+        self.persons[0].restaurant_set.clear()
+        self.assertEqual(get_counts(), {
+            ('Wolf', Positions.COOK): 1,
+            ('Fox', Positions.WAITER): 1,
+            ('Fox', Positions.COOK): 1,
+        })
+
+    def test_rebuild_after_bulk_changes(self):
+        Employee.objects.filter(restaurant=self.wolf).update(
+            position=Positions.WAITER
+        )
+        bulk_changed.send(sender=Employee)
+        self.assertEqual(get_counts()['Wolf', Positions.WAITER], 2)
+        self.assertNotIn(('Wolf', Positions.COOK), get_counts())
+
+    def test_rebuild_command(self):
+        StaffCount.objects.all().delete()
+        out = StringIO()
+        call_command('rebuild_staff_counts', stdout=out)
+        self.assertIn('Rebuilt 3 staff counts', out.getvalue())
+        self.assertEqual(get_counts()['Wolf', Positions.COOK], 2)
+
+    def test_stats(self):
+        with self.assertNumQueries(1):
+            stats = get_staffing_stats()
+        positions = {'Director': 1, 'Manager': 0, 'Cook': 2, 'Waiter': 1}
+        self.assertEqual(stats['positions'], positions)
+        self.assertEqual(stats['total'], 4)
+        self.assertNotIn('restaurants', stats)
+        self.assertEqual(stats['countries'], [{
+            'country': 'RU',
+            'positions': dict(positions, Waiter=0),
+            'total': 3,
+        }])
+        self.assertEqual(
+            [(item['city'], item['total']) for item in stats['cities']],
+            [('Kazan', 2), ('Moscow', 1)],
+        )
+
+    def test_restaurants_staffing(self):
+        Restaurant.objects.create(name='Empty')
+        with self.assertNumQueries(2):
+            stats = get_restaurants_staffing(get_staffed_restaurants())
+        self.assertEqual(
+            [(item['name'], item['city'], item['total'])
+             for item in stats],
+            [('Bear', 'Moscow', 1), ('Fox', None, 1), ('Wolf', 'Kazan', 2)],
+        )
+        self.assertEqual(stats[2]['positions'],
+                         {'Director': 0, 'Manager': 0, 'Cook': 2,
+                          'Waiter': 0})
+
+
+class StaffingViewTestCase(UserTestCase):
+
+    def test_stats(self):
+        response = self.client.get(reverse('employee-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 0)
+        self.assertEqual(response.data['cities'], [])
+
+    def test_restaurant_stats(self):
+        for name in ('Wolf', 'Bear'):
+            Employee.objects.create(
+                restaurant=Restaurant.objects.create(name=name),
+                person=Person.objects.create(firstname=name, surname='Test'),
+                position=Positions.COOK,
+            )
+        response = self.client.get(reverse('employee-restaurant-stats'),
+                                   {'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item['name'], item['total'])
+             for item in response.data['results']],
+            [('Bear', 1)],
+        )
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [item['name'] for item in response.data['results']], ['Wolf']
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_bulk_requests_recount_changed_restaurants(self):
+        wolf = Restaurant.objects.create(name='Wolf')
+        bear = Restaurant.objects.create(name='Bear')
+        fox = Restaurant.objects.create(name='Fox')
+        persons = [Person.objects.create(firstname=str(number),
+                                         surname='Test')
+                   for number in range(3)]
+        response = self.client.post(
+            reverse('employee-bulk'), content_type='application/json',
+            data=json.dumps([
+                {'restaurant': wolf.id, 'person': person.id,
+                 'position': Positions.COOK} for person in persons[:2]
+            ] + [{'restaurant': fox.id, 'person': persons[2].id,
+                  'position': Positions.WAITER}]),
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(get_counts(), {('Wolf', Positions.COOK): 2,
+                                        ('Fox', Positions.WAITER): 1})
+        # Counters of other restaurants are not recounted.
+        StaffCount.objects.filter(restaurant=fox).update(count=5)
+
+        employee = Employee.objects.get(person=persons[0])
+        response = self.client.patch(
+            reverse('employee-bulk'), content_type='application/json',
+            data=json.dumps([{'id': employee.id, 'restaurant': bear.id}]),
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(get_counts(), {('Wolf', Positions.COOK): 1,
+                                        ('Bear', Positions.COOK): 1,
+                                        ('Fox', Positions.WAITER): 5})
+
+        response = self.client.delete(
+            reverse('person-bulk'), content_type='application/json',
+            data=json.dumps([persons[1].id]),
+        )
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(get_counts(), {('Bear', Positions.COOK): 1,
+                                        ('Fox', Positions.WAITER): 5})
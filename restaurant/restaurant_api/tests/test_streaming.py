@@ -0,0 +1,70 @@
+import json
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework import status
+
+from restaurant.restaurant_api.models import (Address, Employee, Person,
+                                              Positions, Restaurant)
+from restaurant.restaurant_api.serializers import (
+    EmployeeFullInfoSerializer, RestaurantFullInfoSerializer)
+from restaurant.restaurant_api.views import EmployeeViewSet, RestaurantViewSet
+
+from .test_views import UserTestCase
+
+
+class StreamingListViewTestCase(UserTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        address = Address.objects.create(
+            country='RU', province='Tatarstan rep.', city='Kazan',
+            street='Pushkina', house='10',
+        )
+        persons = [
+            Person.objects.create(firstname='Test{}'.format(number),
+                                  surname='Test')
+            for number in range(4)
+        ]
+        for number in range(7):
+            restaurant = Restaurant.objects.create(
+                name='Russian wolf{}'.format(number), address=address,
+                rating=number,
+            )
+            for person in persons[:number % 4]:
+                Employee.objects.create(restaurant=restaurant, person=person,
+                                        position=Positions.WAITER)
+
+    def get_stream(self, url):
+        response = self.client.get(url, {'stream': ''})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return json.loads(b''.join(response.streaming_content))
+
+    @mock.patch.object(RestaurantViewSet, 'stream_chunk_size', 3)
+    def test_stream_restaurants(self):
+        data = self.get_stream(reverse('restaurant-list'))
+        serializer = RestaurantFullInfoSerializer(
+            Restaurant.objects.order_by('name'), many=True
+        )
+        self.assertEqual(data, serializer.data)
+
+    @mock.patch.object(EmployeeViewSet, 'stream_chunk_size', 4)
+    def test_stream_employees(self):
+        data = self.get_stream(reverse('employee-list'))
+        serializer = EmployeeFullInfoSerializer(
+            Employee.objects.order_by('id'), many=True
+        )
+        self.assertEqual(data, serializer.data)
+
+    @mock.patch.object(RestaurantViewSet, 'stream_chunk_size', 3)
+    def test_stream_reads_restaurants_by_chunks(self):
+        # Session and user, then restaurants with prefetched employees for
+        # each of three chunks.
+        with self.assertNumQueries(2 + 3 * 2):
+            self.get_stream(reverse('restaurant-list'))
+
+    def test_stream_empty_list(self):
+        Employee.objects.all().delete()
+        self.assertEqual(self.get_stream(reverse('employee-list')), [])
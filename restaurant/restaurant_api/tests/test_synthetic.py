@@ -0,0 +1,109 @@
+import random
+from collections import Counter
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from restaurant.restaurant_api.models import (Address, Employee, Leaderboard,
+                                              Person, Positions, Restaurant,
+                                              StaffCount)
+from restaurant.restaurant_api.synthetic import (DatasetGenerator,
+                                                 get_staff_sizes)
+
+
+class StaffSizesTestCase(SimpleTestCase):
+
+    def test_sizes_add_up(self):
+        sizes = get_staff_sizes(1000, 30, 60, random.Random(1))
+        self.assertEqual(sum(sizes), 1000)
+        self.assertEqual(len(sizes), 30)
+        self.assertLessEqual(max(sizes), 60)
+        self.assertGreater(max(sizes), min(sizes))
+
+    def test_every_size_is_positive(self):
+        sizes = get_staff_sizes(12, 10, 60, random.Random(1))
+        self.assertEqual(sum(sizes), 12)
+        self.assertEqual(min(sizes), 1)
+
+    def test_sizes_are_capped(self):
+        self.assertEqual(get_staff_sizes(100, 3, 5, random.Random(1)),
+                         [5, 5, 5])
+
+
+class GenerateDatasetTestCase(TestCase):
+
+    def generate(self, seed=1):
+        return DatasetGenerator(seed, batch_size=7).generate(
+            persons=40, addresses=8, restaurants=10, employees=150,
+        )
+
+    def get_rows(self):
+        return (
+            list(Person.objects.order_by('pk').values_list(
+                'firstname', 'surname', 'date_of_birth', 'phone',
+            )),
+            list(Address.objects.order_by('pk').values_list(
+                'country', 'city', 'latitude', 'full_address_text',
+            )),
+            list(Restaurant.objects.order_by('pk').values_list(
+                'name', 'cuisine', 'rating', 'address_id',
+            )),
+            list(Employee.objects.order_by('pk').values_list(
+                'restaurant_id', 'person_id', 'position',
+            )),
+        )
+
+    def test_generate(self):
+        counts = self.generate()
+        self.assertEqual(counts, {'persons': 40, 'addresses': 8,
+                                  'restaurants': 10, 'employees': 150})
+        self.assertEqual(Employee.objects.count(), 150)
+        self.assertFalse(Address.objects.filter(full_address_text='')
+                         .exists())
+        self.assertFalse(Restaurant.objects.filter(address=None).exists())
+        self.assertTrue(all(
+            rating is None or 0 <= rating <= 100
+            for rating in Restaurant.objects.values_list('rating', flat=True)
+        ))
+        positions = Counter(Employee.objects.values_list('position',
+                                                         flat=True))
+        self.assertEqual(positions[Positions.DIRECTOR], 10)
+        self.assertGreater(positions[Positions.WAITER],
+                           positions[Positions.MANAGER])
+        self.assertEqual(
+            StaffCount.objects.filter(position=Positions.DIRECTOR).count(),
+            10,
+        )
+        self.assertTrue(Leaderboard.objects.exists())
+
+    def test_same_seed_gives_same_rows(self):
+        self.generate()
+        rows = self.get_rows()
+        Restaurant.objects.all().delete()
+        Address.objects.all().delete()
+        Person.objects.all().delete()
+        self.generate()
+        self.assertEqual(self.get_rows(), rows)
+
+    def test_generate_again(self):
+        self.generate()
+        self.generate(seed=2)
+        self.assertEqual(Restaurant.objects.count(), 20)
+        self.assertEqual(Employee.objects.count(), 300)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('generate_dataset', persons=5, addresses=2,
+                     restaurants=2, employees=6, seed=3, stdout=out)
+        self.assertIn('Generated 5 persons, 2 addresses, 2 restaurants, '
+                      '6 employees', out.getvalue())
+
+        with self.assertRaisesMessage(CommandError, 'need persons'):
+            call_command('generate_dataset', restaurants=1, addresses=1,
+                         employees=1, stdout=out)
+        with self.assertRaisesMessage(CommandError, 'needs a director'):
+            call_command('generate_dataset', persons=5, addresses=1,
+                         restaurants=3, employees=2, stdout=out)
+        with self.assertRaisesMessage(CommandError, 'at least one'):
+            call_command('generate_dataset', stdout=out)
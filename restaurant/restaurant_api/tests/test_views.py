@@ -4,7 +4,9 @@ from datetime import date
 
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from django.http import HttpResponseForbidden
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -49,6 +51,7 @@ class CheckLoginUserTestCase(APITestCase):
         self.assertFalse(login)
 
 
+@override_settings(QUERY_BUDGET_RAISE=True)
 class UserTestCase(APITestCase):
 
     @classmethod
@@ -63,6 +66,8 @@ class UserTestCase(APITestCase):
         )
 
     def setUp(self):
+        # Rolled back rows do not invalidate cached responses.
+        caches[settings.API_RESPONSE_CACHE].clear()
         login = self.client.login(
             username=self.username, password=self.password)
         if not login:
@@ -155,7 +160,7 @@ class PersonGetAllViewTestCase(UserTestCase):
         persons = Person.objects.all()
         serializer = PersonSerializer(persons, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
 
 class PersonGetViewTestCase(UserTestCase):
@@ -360,7 +365,7 @@ class AddressGetAllViewTestCase(UserTestCase):
         addresses = Address.objects.all()
         serializer = AddressSerializer(addresses, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
 
 class AddressGetViewTestCase(UserTestCase):
@@ -548,7 +553,7 @@ class RestaurantGetAllViewTestCase(UserTestCase):
         restaurants = Restaurant.objects.all()
         serializer = RestaurantFullInfoSerializer(restaurants, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
 
 class RestaurantGetViewTestCase(UserTestCase):
@@ -774,7 +779,7 @@ class EmployeeGetAllViewTestCase(UserTestCase):
         employees = Employee.objects.all()
         serializer = EmployeeFullInfoSerializer(employees, many=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, serializer.data)
+        self.assertEqual(response.data['results'], serializer.data)
 
 
 class EmployeeGetViewTestCase(UserTestCase):
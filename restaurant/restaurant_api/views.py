@@ -1,19 +1,49 @@
 from abc import abstractmethod
+from collections.abc import Mapping
+from hmac import compare_digest
 
-from rest_framework import permissions, viewsets
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Prefetch
+from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
-from .models import Address, Employee, Person, Restaurant
-from .serializers import (AddressSerializer, EmployeeFullInfoSerializer,
-                          EmployeeSerializer, PersonSerializer,
+from restaurant.db_pool.base import get_pool_stats
+
+from .cache import CachedResponseMixin, response_cache
+from .conditional import ConditionalMixin
+from .fieldsets import SparseFieldsMixin
+from .geo import get_nearby
+from .leaderboards import get_leaderboard, get_leaderboard_keys
+from .metrics import SerializerMetricsMixin, api_metrics
+from .models import PERSON_NAME_ORDERING, Address, Employee, Person, Restaurant
+from .projections import ProjectionListMixin, RestaurantFullInfoProjection
+from .renderers import PlainTextRenderer
+from .replicas import ReplicaReadMixin
+from .sampling import get_random_object
+from .search import search_restaurants
+from .serializers import (AddressSerializer, EmployeeFilterSerializer,
+                          EmployeeFullInfoSerializer, EmployeeSerializer,
+                          NearbyQuerySerializer, PersonFilterSerializer,
+                          PersonSerializer, RestaurantFilterSerializer,
                           RestaurantFullInfoSerializer, RestaurantSerializer)
+from .signals import bulk_changed, muted_model_signals
+from .staffing import (get_restaurants_staffing, get_staffed_restaurants,
+                       get_staffing_stats)
+from .streaming import StreamingListMixin
 
 
 class SeparateListViewSet(viewsets.ModelViewSet):
     """
     API endpoint for entities that should have separate list serializer.
     """
+    list_actions = ('list',)
 
     @property
     @abstractmethod
@@ -22,59 +52,312 @@ class SeparateListViewSet(viewsets.ModelViewSet):
 
     def get_serializer_class(self, *args, **kwargs):
         """Get class of serializer by action."""
-        if self.action == 'list':
+        if self.action in self.list_actions:
             return self.serializer_list_class
         else:
             return self.serializer_class
 
 
-class PersonViewSet(viewsets.ModelViewSet):
+def merge_bulk_scopes(*scopes):
+    """Get union of sets of bulk_changed arguments of scopes."""
+    merged = {}
+    for scope in scopes:
+        for name, values in scope.items():
+            merged[name] = merged.get(name, set()) | values
+    return merged
+
+
+class BulkModelMixin:
+    """
+    Create, update or delete batches of objects in one request.
+
+    Batch is a list of objects to create or update, objects to update have
+    their ids, or a list of ids to delete. The whole batch is validated
+    before writing and written in one transaction, errors are returned
+    per item in order of the batch. Caches and leaderboards are updated
+    once for the batch by bulk_changed, limited by get_bulk_scope.
+    """
+    bulk_not_found_message = 'Not found.'
+
+    @action(detail=False, methods=['post', 'put', 'patch', 'delete'])
+    def bulk(self, request, *args, **kwargs):
+        """Create, update or delete batch of objects."""
+        self.check_bulk_size(request.data)
+        if request.method == 'POST':
+            return self.bulk_create(request)
+        if request.method == 'DELETE':
+            return self.bulk_destroy(request)
+        return self.bulk_update(request, partial=request.method == 'PATCH')
+
+    def check_bulk_size(self, data):
+        if not isinstance(data, list):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Expected a list of items but got type "{}".'.format(
+                    type(data).__name__
+                )
+            ]})
+        if len(data) > settings.API_MAX_BULK_SIZE:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                'Ensure this list has no more than {} items.'.format(
+                    settings.API_MAX_BULK_SIZE
+                )
+            ]})
+
+    def bulk_create(self, request):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        self.send_bulk_changed(self.get_bulk_scope(serializer.instance))
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, request, partial=False):
+        pks = [
+            self.get_bulk_pk(item.get('id'))
+            if isinstance(item, Mapping) else None
+            for item in request.data
+        ]
+        objects = self.get_queryset().in_bulk(
+            [pk for pk in pks if pk is not None]
+        )
+        serializer = self.get_serializer(
+            [objects.get(pk) for pk in pks], data=request.data, many=True,
+            partial=partial,
+        )
+        serializer.is_valid(raise_exception=True)
+        # Rows are affected by both old and new values of objects.
+        scope = self.get_bulk_scope(serializer.instance)
+        with transaction.atomic():
+            serializer.save()
+        self.send_bulk_changed(merge_bulk_scopes(
+            scope, self.get_bulk_scope(serializer.instance)
+        ))
+        return Response(serializer.data)
+
+    def bulk_destroy(self, request):
+        pks = [self.get_bulk_pk(item) for item in request.data]
+        queryset = self.get_queryset().filter(
+            pk__in=[pk for pk in pks if pk is not None]
+        )
+        objects = queryset.in_bulk()
+        errors = [
+            {} if pk in objects else {'id': [self.bulk_not_found_message]}
+            for pk in pks
+        ]
+        if any(errors):
+            raise ValidationError(errors)
+        scope = self.get_bulk_scope(list(objects.values()), delete=True)
+        # Rows are deleted without signals of every row, and of rows deleted
+        # with them, bulk_changed updates what depends on them.
+        with transaction.atomic(), muted_model_signals():
+            _, counts = queryset.delete()
+        self.send_bulk_changed(scope, deleted=[
+            apps.get_model(label) for label, count in counts.items() if count
+        ])
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def get_bulk_scope(self, objs, delete=False):
+        """
+        Get arguments of bulk_changed that limit what is rebuilt after objs
+        are written, or deleted with delete, bulk_changed rebuilds
+        everything without them.
+        """
+        return {}
+
+    def send_bulk_changed(self, scope, deleted=()):
+        bulk_changed.send(sender=self.get_queryset().model,
+                          deleted=tuple(deleted), **scope)
+
+    def get_bulk_pk(self, value):
+        """Get primary key from the value of batch item or None."""
+        if value is None or isinstance(value, bool):
+            return None
+        try:
+            return self.get_queryset().model._meta.pk.to_python(value)
+        except (TypeError, DjangoValidationError):
+            return None
+
+
+class PersonViewSet(ReplicaReadMixin, SparseFieldsMixin,
+                    SerializerMetricsMixin, BulkModelMixin, ConditionalMixin,
+                    viewsets.ModelViewSet):
     """
     API endpoint that allows persons to be viewed or edited.
     """
     queryset = Person.objects.all().order_by('surname', 'firstname')
     serializer_class = PersonSerializer
+    filter_serializer_class = PersonFilterSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'list': 4, 'retrieve': 4, 'bulk': None}
+
+    def get_bulk_scope(self, objs, delete=False):
+        if not delete:
+            return {}
+        # Employees of persons are deleted with them.
+        return {'restaurant_ids': set(Employee.objects.filter(
+            person_id__in=[obj.pk for obj in objs]
+        ).values_list('restaurant_id', flat=True).distinct())}
 
 
-class AddressViewSet(viewsets.ModelViewSet):
+class AddressViewSet(ReplicaReadMixin, SparseFieldsMixin,
+                     SerializerMetricsMixin, BulkModelMixin, ConditionalMixin,
+                     viewsets.ModelViewSet):
     """
     API endpoint that allows addresses to be viewed or edited.
     """
     queryset = Address.objects.all().order_by('country')
     serializer_class = AddressSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budgets = {'list': 4, 'retrieve': 4, 'bulk': None}
+
+    def get_bulk_scope(self, objs, delete=False):
+        # Restaurants move between leaderboards of countries with their
+        # addresses and are deleted with them.
+        return {'board_keys': get_leaderboard_keys(Restaurant.objects.filter(
+            address_id__in=[obj.pk for obj in objs]
+        ))}
+
+
+def get_employees_prefetch():
+    """Get prefetch of employees of restaurants in the order of names."""
+    return Prefetch('employees', queryset=Person.objects.order_by(
+        *PERSON_NAME_ORDERING
+    ))
 
 
-class RestaurantViewSet(SeparateListViewSet):
+class RestaurantViewSet(ReplicaReadMixin, SparseFieldsMixin,
+                        SerializerMetricsMixin, CachedResponseMixin,
+                        ConditionalMixin, ProjectionListMixin,
+                        StreamingListMixin, SeparateListViewSet):
     """
     API endpoint that allows restaurants to be viewed or edited.
     """
-    queryset = Restaurant.objects.all().select_related(
+    # Search vectors are only matched in queries, never shown.
+    queryset = Restaurant.objects.defer('search_vector').select_related(
         'address'
     ).prefetch_related(
-        'employees'
+        get_employees_prefetch()
     ).order_by('name')
     serializer_class = RestaurantSerializer
     serializer_list_class = RestaurantFullInfoSerializer
+    filter_serializer_class = RestaurantFilterSerializer
     lookup_field = 'name'
     permission_classes = [permissions.IsAuthenticated]
+    list_version_fields = ('updated_at', 'address__updated_at')
+    query_budgets = {'list': 6, 'retrieve': 6, 'get_random_restaurant': 6,
+                     'search': 6, 'nearby': 4, 'leaderboard': 3}
+    replica_actions = ('list', 'retrieve', 'get_random_restaurant',
+                       'search', 'nearby', 'leaderboard')
+    list_actions = ('list', 'search')
+    search_query_param = 'q'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'search':
+            queryset = search_restaurants(queryset, self.get_search_text())
+        return queryset
+
+    def get_fields_serializer_class(self):
+        if self.action in ('get_random_restaurant', 'nearby'):
+            return self.serializer_list_class
+        return super().get_fields_serializer_class()
+
+    def get_search_text(self):
+        text = self.request.query_params.get(self.search_query_param, '')
+        if not text.strip():
+            raise ValidationError({
+                self.search_query_param: 'This query parameter is required.'
+            })
+        return text
+
+    def get_versions(self, objs):
+        """Add versions of employees of restaurants to their versions."""
+        versions = super().get_versions(objs)
+        if not self.includes_field('employees'):
+            return versions
+        employees = {
+            row['restaurant_id']: (
+                row['count'], row['updated_at'], row['person_updated_at']
+            )
+            for row in Employee.objects.filter(
+                restaurant_id__in=[version[0] for version in versions]
+            ).values('restaurant_id').annotate(
+                count=Count('id'), updated_at=Max('updated_at'),
+                person_updated_at=Max('person__updated_at'),
+            ).order_by()
+        }
+        return [version + employees.get(version[0], ())
+                for version in versions]
 
     @action(detail=False)
     def get_random_restaurant(self, request, **kwargs):
         """Get random restaurant info."""
-        restaurant = Restaurant.objects.order_by(
-            '?'
-        ).select_related(
-            'address'
-        ).prefetch_related(
-            'employees'
-        ).first()
-        serializer = RestaurantFullInfoSerializer(restaurant)
+        restaurant = get_random_object(self.get_trimmed_queryset(
+            Restaurant.objects.defer('search_vector').select_related(
+                'address'
+            ).prefetch_related(
+                get_employees_prefetch()
+            )
+        ))
+        serializer = self.measure_serializer(self.trim_serializer(
+            RestaurantFullInfoSerializer(restaurant)
+        ))
         return Response(serializer.data)
 
+    @action(detail=False)
+    def search(self, request, *args, **kwargs):
+        """
+        Get page of restaurants matching the text of the q parameter by
+        name, cuisine, city, province or street, the most relevant first.
+        """
+        return self.list(request, *args, **kwargs)
+
+    @action(detail=False)
+    def nearby(self, request, *args, **kwargs):
+        """
+        Get up to limit restaurants within radius meters from the lat, lon
+        point, the nearest first, with distances in meters.
+        """
+        query = NearbyQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        point = query.validated_data
+        projection = RestaurantFullInfoProjection(
+            self.get_requested_fields()
+        )
+        rows = list(projection.get_queryset(get_nearby(
+            self.get_queryset(), point['lat'], point['lon'], point['radius'],
+            prefix='address__',
+        ))[:point['limit']])
+        with self.serializing():
+            results = projection.represent(rows)
+            for result, row in zip(results, rows):
+                result['distance'] = round(row['distance'], 1)
+        return Response(results)
+
+    @action(detail=False)
+    def leaderboard(self, request, *args, **kwargs):
+        """
+        Get top rated restaurants of the cuisine, of the country (code) or of
+        the cuisine in the country.
+        """
+        cuisine = request.query_params.get('cuisine', '')
+        country = request.query_params.get('country', '').upper()
+        if not cuisine and not country:
+            raise ValidationError(
+                'Set cuisine, country or both query parameters.'
+            )
+        return Response({
+            'cuisine': cuisine,
+            'country': country,
+            'results': get_leaderboard(cuisine, country),
+        })
+
 
-class EmployeeViewSet(SeparateListViewSet):
+class EmployeeViewSet(ReplicaReadMixin, SparseFieldsMixin,
+                      SerializerMetricsMixin, BulkModelMixin,
+                      CachedResponseMixin, ConditionalMixin,
+                      ProjectionListMixin, StreamingListMixin,
+                      SeparateListViewSet):
     """
     API endpoint that allows employees to be viewed or edited.
     """
@@ -82,7 +365,82 @@ class EmployeeViewSet(SeparateListViewSet):
         'id'
     ).select_related(
         'person', 'restaurant'
-    )
+    ).defer('restaurant__search_vector')
     serializer_class = EmployeeSerializer
     serializer_list_class = EmployeeFullInfoSerializer
+    filter_serializer_class = EmployeeFilterSerializer
     permission_classes = [permissions.IsAuthenticated]
+    list_version_fields = ('updated_at', 'person__updated_at',
+                           'restaurant__updated_at')
+    query_budgets = {'list': 4, 'retrieve': 4, 'bulk': None, 'stats': 3,
+                     'restaurant_stats': 4}
+    replica_actions = ('list', 'retrieve', 'stats', 'restaurant_stats')
+
+    def get_bulk_scope(self, objs, delete=False):
+        return {'restaurant_ids': {obj.restaurant_id for obj in objs}}
+
+    @action(detail=False)
+    def stats(self, request, *args, **kwargs):
+        """
+        Get number of employees by position per country and city and in
+        total.
+        """
+        return Response(get_staffing_stats())
+
+    @action(detail=False, url_path='stats/restaurants')
+    def restaurant_stats(self, request, *args, **kwargs):
+        """
+        Get page of restaurants with employees, ordered by name, with number
+        of employees by position.
+        """
+        page = self.paginate_queryset(get_staffed_restaurants())
+        return self.get_paginated_response(get_restaurants_staffing(page))
+
+
+class CacheStatsView(APIView):
+    """
+    Hits and misses of the response cache in this process by namespace.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(response_cache.stats())
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    Size, saturation and wait time of database connection pools in this
+    process by database alias.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(get_pool_stats())
+
+
+class MetricsPermission(permissions.BasePermission):
+    """
+    Allow staff users and scrapers with the METRICS_TOKEN bearer token.
+    """
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+        if token and compare_digest(
+            request.headers.get('Authorization', ''),
+            'Bearer {}'.format(token),
+        ):
+            return True
+        return bool(request.user and request.user.is_staff)
+
+
+class MetricsView(APIView):
+    """
+    Latency, queries, serializer time, response size and errors of
+    requests in this process by view and action, response cache and
+    database pools in the text format of Prometheus.
+    """
+    permission_classes = [MetricsPermission]
+    renderer_classes = [PlainTextRenderer]
+
+    def get(self, request, *args, **kwargs):
+        return Response(api_metrics.render())
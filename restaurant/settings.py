@@ -45,11 +45,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'restaurant.restaurant_api.middleware.MetricsMiddleware',
+    'restaurant.restaurant_api.middleware.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'restaurant.restaurant_api.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -80,15 +83,50 @@ WSGI_APPLICATION = 'restaurant.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'restaurant.db_pool',
         'NAME': 'postgres',
         'USER': 'postgres',
         'PASSWORD': 'postgres',
         'HOST': 'db',
         'PORT': 5432,
+        # Pool of every worker process: connections opened on start and
+        # kept open, maximum, seconds to wait for a free connection,
+        # seconds idle connections above MIN_SIZE are kept and seconds of
+        # idleness after which a connection is checked before checkout.
+        'POOL': {
+            'MIN_SIZE': 2,
+            'MAX_SIZE': 20,
+            'TIMEOUT': 10,
+            'MAX_IDLE': 600,
+            'CHECK_AFTER': 1,
+        },
+    }
+}
+
+# Aliases of read replicas of the default database in DATABASES. Safe
+# reads of viewsets go to a replica lagging at most REPLICA_MAX_LAG seconds
+# (checked every REPLICA_LAG_CHECK_INTERVAL seconds), clients read the
+# primary for REPLICA_STICKY_SECONDS after their writes.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['restaurant.restaurant_api.replicas.ReplicaRouter']
+REPLICA_MAX_LAG = 5
+REPLICA_LAG_CHECK_INTERVAL = 5
+REPLICA_STICKY_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Cache alias and timeout of cached list and retrieve responses
+API_RESPONSE_CACHE = 'default'
+API_RESPONSE_CACHE_TIMEOUT = 60 * 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -118,6 +156,12 @@ AUTH_PASSWORD_VALIDATORS = [
 
 LANGUAGE_CODE = 'en-us'
 
+# Languages full addresses are stored in.
+LANGUAGES = [
+    ('en', 'English'),
+    ('ru', 'Russian'),
+]
+
 TIME_ZONE = 'UTC'
 
 USE_I18N = True
@@ -140,3 +184,61 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 PHONENUMBER_DEFAULT_REGION = 'US'
 
 LOGIN_REDIRECT_URL = '/restaurants/'
+
+
+# Rest framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': (
+        'restaurant.restaurant_api.pagination.KeysetPagination'
+    ),
+    'PAGE_SIZE': 100,
+    'DEFAULT_RENDERER_CLASSES': [
+        'restaurant.restaurant_api.renderers.ORJSONRenderer',
+        'restaurant.restaurant_api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'restaurant.restaurant_api.renderers.ORJSONParser',
+        'restaurant.restaurant_api.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_FILTER_BACKENDS': [
+        'restaurant.restaurant_api.filters.QueryParamsFilterBackend',
+    ],
+}
+
+# Largest page size a client can request with the page_size parameter
+API_MAX_PAGE_SIZE = 1000
+
+# Largest number of objects in one batch of bulk endpoints
+API_MAX_BULK_SIZE = 10000
+
+# Raise instead of logging when a request exceeds the query budget of its
+# view action or repeats a query more than QUERY_BUDGET_MAX_REPEATED times.
+QUERY_BUDGET_RAISE = False
+QUERY_BUDGET_MAX_REPEATED = 5
+
+# Profile requests of staff users with X-Profile header or profile=1
+# parameter: PROFILING_SAMPLE_RATE share of them and at most
+# PROFILING_MAX_PER_MINUTE per process. Stacks are sampled every
+# PROFILING_INTERVAL seconds for at most PROFILING_MAX_SECONDS, the latest
+# PROFILING_KEEP profiles are kept in PROFILING_DIR.
+PROFILING_HEADER = 'X-Profile'
+PROFILING_QUERY_PARAM = 'profile'
+PROFILING_SAMPLE_RATE = 1.0
+PROFILING_MAX_PER_MINUTE = 6
+PROFILING_INTERVAL = 0.005
+PROFILING_MAX_SECONDS = 30
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_KEEP = 200
+
+# Bearer token of Prometheus to scrape /metrics/ (staff users can read it
+# without the token).
+METRICS_TOKEN = None
+
+# Run offloaded views under /async/ in the thread of the event loop's caller
+# instead of the executor. Tests set it to see rows of their transactions.
+ASYNC_VIEWS_THREAD_SENSITIVE = False
@@ -3,6 +3,7 @@ from django.urls import include, path
 from rest_framework import routers
 
 from restaurant.restaurant_api import views
+from restaurant.restaurant_api.async_views import get_async_urlpatterns
 
 router = routers.DefaultRouter()
 router.register(r'persons', views.PersonViewSet)
@@ -12,6 +13,11 @@ router.register(r'employees', views.EmployeeViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/', include(get_async_urlpatterns(router.registry))),
+    path('cache-stats/', views.CacheStatsView.as_view(), name='cache-stats'),
+    path('db-pool-stats/', views.DatabasePoolStatsView.as_view(),
+         name='db-pool-stats'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
     path('api-auth/', include('rest_framework.urls',
                               namespace='rest_framework')),
     path('admin/', admin.site.urls),